@@ -2,6 +2,7 @@ import pygame
 import sys
 import random
 import math
+import time
 import numpy as np
 from typing import List, Tuple
 
@@ -9,6 +10,7 @@ from typing import List, Tuple
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
 PADDING = 50 # Espaçamento das bordas
+FPS = 10 # Quadros por segundo da visualização (o AG não espera pela tela)
 SCALE_FACTOR = (min(SCREEN_WIDTH, SCREEN_HEIGHT) - 2 * PADDING) / 100.0
 
 # Cores
@@ -49,8 +51,9 @@ def crossover(parent1: Path, parent2: Path) -> Path:
     # Copia o segmento do pai 1
     child[start:end] = parent1[start:end]
     
-    # Preenche o restante com os genes do pai 2
-    parent2_genes = [gene for gene in parent2 if gene not in child]
+    # Preenche o restante com os genes do pai 2 (o set torna cada teste O(1))
+    copied = set(parent1[start:end])
+    parent2_genes = [gene for gene in parent2 if gene not in copied]
     
     current_pos = end
     for gene in parent2_genes:
@@ -77,6 +80,29 @@ def mutate(path: Path) -> Path:
         path[idx1], path[idx2] = path[idx2], path[idx1]
     return path
 
+def select_parent_pairs(selection_probs: np.ndarray, n_pairs: int) -> np.ndarray:
+    """
+    Sorteia `n_pairs` pares de pais (distintos em cada par) pela roleta.
+
+    A soma acumulada das probabilidades é montada uma vez por geração e todos
+    os pares saem de uma única busca binária vetorizada; só os pares com o
+    mesmo pai duas vezes têm o segundo pai sorteado de novo (como em
+    `np.random.choice(..., replace=False)`).
+    """
+    cumulative = np.cumsum(selection_probs)
+    last = len(cumulative) - 1
+
+    def draw(shape):
+        points = np.random.random(shape) * cumulative[-1]
+        return np.minimum(np.searchsorted(cumulative, points, side='right'), last)
+
+    pairs = draw((n_pairs, 2))
+    repeated = np.flatnonzero(pairs[:, 0] == pairs[:, 1])
+    while len(repeated):
+        pairs[repeated, 1] = draw(len(repeated))
+        repeated = repeated[pairs[repeated, 0] == pairs[repeated, 1]]
+    return pairs
+
 # --- Funções de Desenho do Pygame ---
 
 def draw_info(screen, font, generation, best_distance):
@@ -117,6 +143,7 @@ def main():
     
     best_route_so_far = None
     best_distance_so_far = float('inf')
+    last_frame = float('-inf')
 
     # Loop das gerações
     for generation in range(NUM_GENERATIONS):
@@ -145,11 +172,9 @@ def main():
         selection_probs = 1 / np.array(fitness_scores)
         selection_probs /= np.sum(selection_probs) # Normaliza
 
-        # Gera o resto da nova população
-        while len(new_population) < POPULATION_SIZE:
-            # Seleciona dois pais
-            indices = np.random.choice(len(population), 2, p=selection_probs, replace=False)
-            parent1, parent2 = population[indices[0]], population[indices[1]]
+        # Gera o resto da nova população (todos os pais sorteados de uma vez)
+        for index1, index2 in select_parent_pairs(selection_probs, POPULATION_SIZE - len(new_population)):
+            parent1, parent2 = population[index1], population[index2]
             
             # Crossover
             child = crossover(parent1, parent2)
@@ -161,14 +186,15 @@ def main():
 
         population = new_population
 
-        # 4. Desenho
-        screen.fill(BLACK)
-        draw_info(screen, font, generation + 1, best_distance_so_far)
-        draw_route(screen, best_route_so_far, cities)
-        pygame.display.flip()
-        
-        # Controla a velocidade da visualização
-        clock.tick(10) 
+        # 4. Desenho: só redesenha quando passa o intervalo de um quadro,
+        # assim a evolução roda na velocidade máxima
+        now = time.perf_counter()
+        if now - last_frame >= 1.0 / FPS:
+            last_frame = now
+            screen.fill(BLACK)
+            draw_info(screen, font, generation + 1, best_distance_so_far)
+            draw_route(screen, best_route_so_far, cities)
+            pygame.display.flip()
 
     print(f"Finalizado! Melhor distância encontrada: {best_distance_so_far:.2f}")
 
@@ -183,6 +209,7 @@ def main():
         draw_info(screen, font, f"Finalizado na Geração {NUM_GENERATIONS}", best_distance_so_far)
         draw_route(screen, best_route_so_far, cities)
         pygame.display.flip()
+        clock.tick(FPS)
 
 
 if __name__ == '__main__':
@@ -58,10 +58,11 @@ def order_crossover(parent1, parent2):
     child = [-1] * size
     sublist1 = parent1[start:end+1]
     child[start:end+1] = sublist1
+    in_sublist1 = set(sublist1)  # Teste de pertinência em O(1)
     
     current_index = 0
     for gene in parent2:
-        if gene not in sublist1:
+        if gene not in in_sublist1:
             while child[current_index] != -1:
                 current_index = (current_index + 1) % size
             child[current_index] = gene
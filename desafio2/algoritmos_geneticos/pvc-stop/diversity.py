@@ -0,0 +1,123 @@
+# diversity.py
+
+import math
+import numpy as np
+
+from ga_logic import population_tour_keys
+
+STOP_RULES = ("stagnation", "diversity", "stagnation_and_diversity", "stagnation_or_diversity")
+DIVERSITY_ACTIONS = ("none", "inject", "restart")
+
+class EdgeFrequency:
+    """
+    Matriz (N, N) com quantas rotas da população usam cada aresta (não direcionada).
+
+    `update` reconta a matriz inteira a cada geração: o AG reconstrói toda a
+    próxima população, então não há linhas inalteradas a aproveitar, e a
+    recontagem custa O(P·N). Dela saem as métricas de diversidade em O(N²),
+    independentemente do tamanho da população.
+
+    Args:
+        population (np.ndarray): Matriz (P, N) de rotas.
+    """
+
+    def __init__(self, population):
+        population = np.asarray(population)
+        self.pop_size, self.n_cities = population.shape
+        self.counts = np.zeros((self.n_cities, self.n_cities), dtype=np.int32)
+        self.update(population)
+
+    def update(self, population):
+        """Reconta as arestas de `population` (mesmo formato da população inicial)."""
+        tours = np.asarray(population, dtype=np.intp)
+        a = tours.ravel()
+        b = np.roll(tours, -1, axis=1).ravel()
+        self.counts.fill(0)
+        np.add.at(self.counts, (a, b), 1)
+        np.add.at(self.counts, (b, a), 1)
+
+    def edge_entropy(self):
+        """
+        Entropia normalizada (0 a 1) da distribuição das arestas na população.
+
+        Vale 0 quando todas as rotas usam as mesmas N arestas e 1 quando as
+        P·N arestas da população são todas diferentes.
+        """
+        frequencies = self.counts[np.triu_indices(self.n_cities, k=1)]
+        frequencies = frequencies[frequencies > 0] / (self.pop_size * self.n_cities)
+        entropy = -np.sum(frequencies * np.log(frequencies))
+        minimum = math.log(self.n_cities)
+        maximum = math.log(min(self.pop_size * self.n_cities, self.n_cities * (self.n_cities - 1) // 2))
+        if maximum <= minimum:
+            return 0.0
+        return float(np.clip((entropy - minimum) / (maximum - minimum), 0.0, 1.0))
+
+    def mean_pairwise_distance(self):
+        """
+        Distância de arestas média entre pares de rotas, normalizada por N (0 a 1).
+
+        Duas rotas que compartilham `s` arestas estão a distância N - s. Como
+        uma aresta usada por `f` rotas é comum a f·(f-1)/2 pares, a média sai
+        da matriz de frequências sem comparar as rotas duas a duas.
+        """
+        if self.pop_size < 2:
+            return 0.0
+        counts = self.counts[np.triu_indices(self.n_cities, k=1)].astype(np.float64)
+        shared_pairs = np.sum(counts * (counts - 1) / 2)
+        n_pairs = self.pop_size * (self.pop_size - 1) / 2
+        return float(1.0 - shared_pairs / n_pairs / self.n_cities)
+
+def unique_share(population):
+    """Fração de rotas distintas na população (rotações e inversões contam como iguais)."""
+    return len(set(population_tour_keys(population))) / len(population)
+
+def diversity_metrics(edge_frequency, population):
+    """Retorna as métricas de diversidade da geração como dicionário."""
+    return {
+        "edge_entropy": edge_frequency.edge_entropy(),
+        "pairwise_distance": edge_frequency.mean_pairwise_distance(),
+        "unique_share": unique_share(population),
+    }
+
+def is_stagnant(best_distance_history, window):
+    """Verifica se a melhor distância não mudou nas últimas `window` gerações."""
+    if not window or len(best_distance_history) <= window:
+        return False
+    return abs(best_distance_history[-1] - best_distance_history[-1 - window]) < 1e-6
+
+def is_collapsed(metrics, min_edge_entropy=None, min_unique_share=None):
+    """Verifica se alguma métrica de diversidade caiu abaixo do seu limite."""
+    if min_edge_entropy is not None and metrics["edge_entropy"] < min_edge_entropy:
+        return True
+    if min_unique_share is not None and metrics["unique_share"] < min_unique_share:
+        return True
+    return False
+
+def stop_reason(rule, best_distance_history, metrics, window, min_edge_entropy=None, min_unique_share=None):
+    """
+    Aplica a regra de parada `rule` (uma de `STOP_RULES`).
+
+    - "stagnation": a melhor distância não mudou em `window` gerações;
+    - "diversity": a população colapsou (entropia ou rotas únicas abaixo do limite);
+    - "stagnation_and_diversity": as duas condições ao mesmo tempo;
+    - "stagnation_or_diversity": qualquer uma delas.
+
+    Returns:
+        str | None: Motivo da parada ou None para continuar.
+    """
+    stagnant = is_stagnant(best_distance_history, window)
+    collapsed = is_collapsed(metrics, min_edge_entropy, min_unique_share)
+    if rule == "stagnation":
+        stop = stagnant
+    elif rule == "diversity":
+        stop = collapsed
+    elif rule == "stagnation_and_diversity":
+        stop = stagnant and collapsed
+    elif rule == "stagnation_or_diversity":
+        stop = stagnant or collapsed
+    else:
+        raise ValueError(f"Regra de parada desconhecida: {rule!r}")
+    if not stop:
+        return None
+    reasons = [name for name, active in (("estagnação", stagnant), ("colapso da diversidade", collapsed)) if active]
+    return " e ".join(reasons)
@@ -1,8 +1,13 @@
 # ga_logic.py
 
 import random
+from collections import OrderedDict
+
 import numpy as np
 
+# Tipo inteiro usado para armazenar as rotas na matriz da população.
+POPULATION_DTYPE = np.int32
+
 def create_initial_population(n_cities, pop_size):
     """Cria a população inicial de rotas aleatórias."""
     population = []
@@ -12,45 +17,269 @@ def create_initial_population(n_cities, pop_size):
         population.append(individual)
     return population
 
+def create_population_array(n_cities, pop_size):
+    """
+    Cria a população inicial como uma matriz (pop_size, n_cities) pré-alocada.
+
+    Cada linha é uma permutação aleatória das cidades. Os operadores
+    `*_into`/`*_inplace` escrevem diretamente nas linhas desta matriz.
+    """
+    return np.argsort(np.random.random((pop_size, n_cities)), axis=1).astype(POPULATION_DTYPE)
+
 def calculate_distance(city1, city2):
     """Calcula a distância euclidiana entre duas cidades."""
     return np.sqrt((city1[0] - city2[0])**2 + (city1[1] - city2[1])**2)
 
-def calculate_total_distance(path, cities):
+def build_distance_matrix(cities):
+    """Pré-calcula a matriz (N, N) de distâncias euclidianas entre todas as cidades."""
+    coords = np.asarray(cities, dtype=np.float64)
+    diff = coords[:, np.newaxis, :] - coords[np.newaxis, :, :]
+    return np.sqrt((diff ** 2).sum(axis=-1))
+
+# Cache da última matriz calculada. As cidades são criadas uma única vez por
+# simulação e a mesma lista é repassada a cada chamada, então basta comparar
+# a identidade do objeto para reaproveitar a matriz.
+_distance_matrix_cache = {"cities": None, "matrix": None}
+
+def get_distance_matrix(cities):
+    """Retorna a matriz de distâncias de `cities`, calculando-a só na primeira chamada."""
+    if _distance_matrix_cache["cities"] is not cities:
+        _distance_matrix_cache["matrix"] = build_distance_matrix(cities)
+        _distance_matrix_cache["cities"] = cities
+    return _distance_matrix_cache["matrix"]
+
+class FitnessCache:
+    """
+    Cache LRU com tamanho limitado para o comprimento das rotas.
+
+    As entradas são indexadas pela chave canônica da rota (`tour_key`), então
+    rotações e inversões da mesma rota compartilham a mesma entrada. Use um
+    cache por instância do problema (conjunto de cidades).
+    """
+
+    def __init__(self, maxsize=100_000):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._distances = OrderedDict()
+
+    def __len__(self):
+        return len(self._distances)
+
+    def get(self, key):
+        """Retorna a distância armazenada para `key` ou None, contabilizando acerto/falha."""
+        distance = self._distances.get(key)
+        if distance is None:
+            self.misses += 1
+            return None
+        self._distances.move_to_end(key)
+        self.hits += 1
+        return distance
+
+    def put(self, key, distance):
+        """Armazena a distância de `key`, descartando a entrada menos usada se necessário."""
+        self._distances[key] = distance
+        self._distances.move_to_end(key)
+        if len(self._distances) > self.maxsize:
+            self._distances.popitem(last=False)
+
+    def clear(self):
+        """Esvazia o cache e zera os contadores."""
+        self._distances.clear()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hit_rate(self):
+        """Fração das consultas atendidas pelo cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+def calculate_population_distances(population, cities, cache=None):
+    """
+    Calcula o comprimento de todas as rotas da população de uma só vez.
+
+    A população é tratada como uma matriz de índices (P, N); cada aresta é
+    buscada na matriz de distâncias e as linhas são somadas.
+
+    Args:
+        population: Sequência de P rotas com N cidades cada (ou array (P, N)).
+        cities: Lista de coordenadas das cidades.
+        cache (FitnessCache, opcional): Se informado, só as rotas ausentes do
+            cache são avaliadas e o resultado delas é armazenado.
+
+    Returns:
+        np.ndarray: Array (P,) com a distância total de cada rota.
+    """
+    distance_matrix = get_distance_matrix(cities)
+    paths = np.asarray(population, dtype=np.intp)
+    if paths.ndim == 1:
+        paths = paths[np.newaxis, :]
+    if cache is None:
+        return distance_matrix[paths, np.roll(paths, -1, axis=1)].sum(axis=1)
+
+    keys = population_tour_keys(paths)
+    distances = np.empty(len(paths))
+    missing = []
+    for i, key in enumerate(keys):
+        distance = cache.get(key)
+        if distance is None:
+            missing.append(i)
+        else:
+            distances[i] = distance
+    if missing:
+        missing_paths = paths[missing]
+        missing_distances = distance_matrix[missing_paths, np.roll(missing_paths, -1, axis=1)].sum(axis=1)
+        distances[missing] = missing_distances
+        for i, distance in zip(missing, missing_distances):
+            cache.put(keys[i], float(distance))
+    return distances
+
+def calculate_population_fitness(population, cities, cache=None):
+    """Calcula a aptidão (inverso da distância) de todas as rotas da população."""
+    return 1 / (calculate_population_distances(population, cities, cache) + 1e-10)
+
+def calculate_total_distance(path, cities, cache=None):
     """Calcula o comprimento total de uma rota."""
-    distance = 0
-    for i in range(len(path)):
-        city1_index = path[i]
-        city2_index = path[(i + 1) % len(path)]
-        distance += calculate_distance(cities[city1_index], cities[city2_index])
-    return distance
-
-def calculate_fitness(path, cities):
+    return float(calculate_population_distances(path, cities, cache)[0])
+
+def calculate_fitness(path, cities, cache=None):
     """Calcula a aptidão de uma rota (inverso da distância total)."""
-    distance = calculate_total_distance(path, cities)
+    distance = calculate_total_distance(path, cities, cache)
     return 1 / (distance + 1e-10)
 
 def order_crossover(parent1, parent2):
-    """Realiza o crossover de ordem."""
+    """
+    Realiza o crossover de ordem.
+
+    Os genes do segmento copiado do pai 1 são marcados numa máscara de
+    visitados, então cada gene do pai 2 é testado em O(1) e o filho sai em O(N).
+    """
     size = len(parent1)
     start, end = sorted(random.sample(range(size), 2))
-    
-    child = [-1] * size
-    child[start:end+1] = parent1[start:end+1]
-    
-    current_index = 0
+
+    child = list(parent1)
+    visited = [False] * size
+    for gene in parent1[start:end+1]:
+        visited[gene] = True
+
+    # Posições fora do segmento, da esquerda para a direita, na ordem do pai 2
+    positions = iter(list(range(start)) + list(range(end + 1, size)))
     for gene in parent2:
-        if gene not in child:
-            while child[current_index] != -1:
-                current_index = (current_index + 1) % size
-            child[current_index] = gene
-            
+        if not visited[gene]:
+            child[next(positions)] = gene
+
     return child
 
+def order_crossover_into(parent1, parent2, out):
+    """
+    Realiza o crossover de ordem escrevendo o filho em `out`.
+
+    Equivalente a `order_crossover`, mas opera sobre arrays NumPy e preenche
+    uma linha já alocada da próxima população, sem criar listas intermediárias.
+    A máscara de visitados substitui o `np.isin` (que ordena os arrays).
+    `out` não pode compartilhar memória com os pais.
+    """
+    size = len(parent1)
+    start, end = sorted(random.sample(range(size), 2))
+
+    segment = parent1[start:end+1]
+    out[start:end+1] = segment
+
+    visited = np.zeros(size, dtype=bool)
+    visited[segment] = True
+    remaining = parent2[~visited[parent2]]
+    out[:start] = remaining[:start]
+    out[end+1:] = remaining[start:]
+    return out
+
 def swap_mutation(individual, mutation_prob):
     """Aplica mutação por troca de genes."""
     mutated_individual = list(individual)
     if random.random() < mutation_prob:
         idx1, idx2 = random.sample(range(len(mutated_individual)), 2)
         mutated_individual[idx1], mutated_individual[idx2] = mutated_individual[idx2], mutated_individual[idx1]
-    return tuple(mutated_individual)
\ No newline at end of file
+    return tuple(mutated_individual)
+
+def swap_mutation_inplace(individual, mutation_prob):
+    """Aplica a mutação por troca diretamente no array. Retorna True se houve mutação."""
+    if random.random() < mutation_prob:
+        idx1, idx2 = random.sample(range(len(individual)), 2)
+        individual[idx1], individual[idx2] = individual[idx2], individual[idx1]
+        return True
+    return False
+
+# --- Detecção de rotas duplicadas ---
+
+DUPLICATE_POLICIES = ("reject", "mutate", "allow")
+
+def canonical_tour(path):
+    """
+    Retorna a forma canônica de uma rota, invariante a rotação e sentido.
+
+    A rota é girada para começar na cidade 0 e, entre os dois sentidos
+    possíveis, é escolhido aquele cujo segundo elemento é o menor.
+    """
+    path = np.asarray(path, dtype=POPULATION_DTYPE)
+    start = int(np.flatnonzero(path == 0)[0])
+    canonical = np.roll(path, -start)
+    if len(canonical) > 2 and canonical[1] > canonical[-1]:
+        canonical[1:] = canonical[:0:-1].copy()
+    return canonical
+
+def tour_key(path):
+    """Chave hashable (bytes) da forma canônica da rota, usada em sets e caches."""
+    return canonical_tour(path).tobytes()
+
+def population_tour_keys(population):
+    """Calcula as chaves canônicas de todas as linhas de uma matriz (P, N) de rotas."""
+    paths = np.asarray(population, dtype=POPULATION_DTYPE)
+    n_individuals, n_cities = paths.shape
+    starts = np.argmax(paths == 0, axis=1)
+    columns = (starts[:, np.newaxis] + np.arange(n_cities)) % n_cities
+    canonical = paths[np.arange(n_individuals)[:, np.newaxis], columns]
+    if n_cities > 2:
+        flip = canonical[:, 1] > canonical[:, -1]
+        canonical[flip, 1:] = canonical[flip, :0:-1]
+    return [row.tobytes() for row in canonical]
+
+def register_child(child, seen_tours, policy="reject", max_copies=1, mutate=None, max_mutations=10):
+    """
+    Decide se um filho entra na próxima geração, conforme a política de duplicatas.
+
+    As rotas já aceitas na geração ficam em `seen_tours` (chave canônica ->
+    número de cópias), o que torna a verificação O(1) em vez de uma busca
+    linear na população.
+
+    Args:
+        child: Rota candidata (array). Pode ser alterada in-place na política "mutate".
+        seen_tours (dict): Rotas já aceitas nesta geração; é atualizado se o filho entrar.
+        policy (str): "reject" descarta duplicatas, "mutate" aplica `mutate(child)`
+            até obter uma rota inédita (no máximo `max_mutations` vezes) e
+            "allow" aceita até `max_copies` cópias de cada rota.
+        max_copies (int): Limite de cópias da mesma rota na política "allow".
+        mutate: Função que altera `child` in-place (obrigatória em "mutate").
+        max_mutations (int): Tentativas de mutação antes de descartar o filho.
+
+    Returns:
+        bool: True se o filho foi aceito.
+    """
+    if policy not in DUPLICATE_POLICIES:
+        raise ValueError(f"Política de duplicatas desconhecida: {policy!r}")
+
+    key = tour_key(child)
+    if policy == "mutate" and key in seen_tours:
+        for _ in range(max_mutations):
+            mutate(child)
+            key = tour_key(child)
+            if key not in seen_tours:
+                break
+        else:
+            return False
+
+    copies = seen_tours.get(key, 0)
+    limit = max_copies if policy == "allow" else 1
+    if copies >= limit:
+        return False
+    seen_tours[key] = copies + 1
+    return True
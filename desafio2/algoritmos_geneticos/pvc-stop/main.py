@@ -1,15 +1,15 @@
 # main.py
 
-import itertools
-import pygame
+import argparse
 import sys
-import matplotlib.pyplot as plt
 import random
+import time
 import numpy as np
 
 # Importar as funções dos módulos
-from ga_logic import create_initial_population, calculate_fitness, calculate_total_distance, order_crossover, swap_mutation
-from visualization import setup_pygame_display, draw_all_elements, update_performance_plots_at_end
+from ga_logic import (FitnessCache, create_population_array, calculate_population_distances, order_crossover_into,
+                      swap_mutation_inplace, register_child, tour_key)
+from diversity import STOP_RULES, DIVERSITY_ACTIONS, EdgeFrequency, diversity_metrics, stop_reason, is_collapsed
 
 # --- Parâmetros ---
 WIDTH, HEIGHT = 800, 600
@@ -20,83 +20,196 @@ MUTATION_PROBABILITY = 0.1
 CROSSOVER_PROBABILITY = 0.8
 CONVERGENCE_GENERATIONS = 20
 TSP_DISPLAY_OFFSET = 50
+DUPLICATE_POLICY = "reject"  # "reject", "mutate" ou "allow"
+MAX_DUPLICATE_COPIES = 3  # Limite de cópias por rota na política "allow"
+FITNESS_CACHE_SIZE = 50_000  # Máximo de rotas guardadas no cache de avaliação
+FPS = 30  # Taxa de atualização da tela; o AG roda na velocidade máxima
+STOP_RULE = "stagnation"  # Uma de STOP_RULES: estagnação, diversidade ou a combinação das duas
+MIN_EDGE_ENTROPY = 0.15  # Abaixo disso a população é considerada colapsada (regras de diversidade)
+MIN_UNIQUE_SHARE = 0.5  # Fração mínima de rotas distintas antes de considerar a população colapsada
+DIVERSITY_ACTION = "none"  # "none", "inject" (troca os piores por rotas aleatórias) ou "restart"
+INJECTION_EDGE_ENTROPY = 0.2  # Entropia que dispara a injeção de diversidade ou o reinício
+INJECTION_FRACTION = 0.3  # Fração da população substituída na injeção
 
-def run_simulation():
-    # Inicialização
-    screen, clock = setup_pygame_display(WIDTH, HEIGHT)
-    cities_locations = [(random.randint(TSP_DISPLAY_OFFSET, WIDTH - TSP_DISPLAY_OFFSET),
-                         random.randint(TSP_DISPLAY_OFFSET, HEIGHT - TSP_DISPLAY_OFFSET))
-                        for _ in range(N_CITIES)]
-    
-    population = create_initial_population(N_CITIES, POPULATION_SIZE)
-    
-    # Listas para armazenar dados de performance
-    best_fitness_history = []
-    best_distance_history = []
-    avg_distance_history = []
+def evolve(cities_locations, n_generations, history, fitness_cache, stop_rule=STOP_RULE,
+           diversity_action=DIVERSITY_ACTION):
+    """
+    Executa o AG e produz, a cada geração, `(generation, sorted_population)`.
+
+    Não depende de pygame nem de matplotlib: quem consome o gerador decide se
+    desenha, registra ou apenas itera. Os históricos de performance e de
+    diversidade são acumulados em `history`, e o gerador termina ao atingir
+    `n_generations` ou quando a regra de parada `stop_rule` é satisfeita
+    (o motivo fica em `history["stop_reason"]`, para quem chamou exibir).
+
+    A diversidade vem de uma matriz de frequência de arestas recontada a cada
+    geração. Com `diversity_action` = "inject" ou "restart", uma entropia
+    abaixo de INJECTION_EDGE_ENTROPY troca parte (ou todo o resto) da próxima
+    geração por rotas aleatórias, preservando o melhor indivíduo.
+    """
+    # População em matriz (P, N) com buffer duplo para a próxima geração
+    population = create_population_array(len(cities_locations), POPULATION_SIZE)
+    next_population = np.empty_like(population)
+    edge_frequency = EdgeFrequency(population)
     
+    best_distance_history = history["best_distance"]
     generation = 0
     
-    # Loop Principal da Simulação
-    running_simulation = True
-    while running_simulation:
-        # Verificação de eventos
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running_simulation = False
-            if event.type == pygame.KEYDOWN and (event.key == pygame.K_q or event.key == pygame.K_ESCAPE):
-                running_simulation = False
-
-        if generation >= N_GENERATIONS:
-            running_simulation = False
-            continue
-        
+    while generation < n_generations:
         generation += 1
 
         # Avaliação da população e verificação de convergência
-        population_fitness = [calculate_fitness(ind, cities_locations) for ind in population]
-        population_distances = [calculate_total_distance(ind, cities_locations) for ind in population]
+        population_distances = calculate_population_distances(population, cities_locations, fitness_cache)
+        population_fitness = 1 / (population_distances + 1e-10)
         
-        sorted_population = sorted(population, key=lambda ind: calculate_fitness(ind, cities_locations), reverse=True)
+        sorted_indices = np.argsort(-population_fitness, kind='stable')
+        sorted_population = population[sorted_indices[:5]]
         best_individual = sorted_population[0]
         
-        best_fitness = calculate_fitness(best_individual, cities_locations)
-        best_distance = calculate_total_distance(best_individual, cities_locations)
-        avg_distance = np.mean(population_distances)
-        
-        best_fitness_history.append(best_fitness)
-        best_distance_history.append(best_distance)
-        avg_distance_history.append(avg_distance)
+        history["best_fitness"].append(population_fitness[sorted_indices[0]])
+        best_distance_history.append(population_distances[sorted_indices[0]])
+        history["avg_distance"].append(np.mean(population_distances))
+        metrics = diversity_metrics(edge_frequency, population)
+        for name, value in metrics.items():
+            history[name].append(value)
 
-        if generation > CONVERGENCE_GENERATIONS:
-            if abs(best_distance_history[generation - 1] - best_distance_history[generation - 1 - CONVERGENCE_GENERATIONS]) < 1e-6:
-                print(f"Convergência detectada na Geração {generation}. Parando a simulação.")
-                running_simulation = False
-                    
-        # Atualiza apenas a visualização do Pygame
-        draw_all_elements(screen, best_individual, sorted_population, cities_locations, generation, N_GENERATIONS)
+        yield generation, sorted_population
+
+        reason = stop_reason(stop_rule, best_distance_history, metrics, CONVERGENCE_GENERATIONS,
+                             MIN_EDGE_ENTROPY, MIN_UNIQUE_SHARE)
+        if reason is not None:
+            history["stop_reason"] = reason
+            return
         
         # Próxima Geração
-        next_population = [list(best_individual)]
-        while len(next_population) < POPULATION_SIZE:
-            parent1 = random.choice(sorted_population[:POPULATION_SIZE//5])
-            parent2 = random.choice(sorted_population[:POPULATION_SIZE//5])
+        elite_indices = sorted_indices[:POPULATION_SIZE//5]
+        next_population[0] = best_individual
+        seen_tours = {tour_key(best_individual): 1}
+        n_filled = 1
+        while n_filled < POPULATION_SIZE:
+            parent1 = population[random.choice(elite_indices)]
+            parent2 = population[random.choice(elite_indices)]
             
+            child = next_population[n_filled]
             if random.random() < CROSSOVER_PROBABILITY:
-                child = order_crossover(list(parent1), list(parent2))
+                order_crossover_into(parent1, parent2, child)
             else:
-                child = list(random.choice([list(parent1), list(parent2)]))
+                child[:] = parent1 if random.random() < 0.5 else parent2
             
-            child = swap_mutation(tuple(child), MUTATION_PROBABILITY)
+            swap_mutation_inplace(child, MUTATION_PROBABILITY)
             
-            if list(child) not in next_population:
-                next_population.append(list(child))
-        
-        population = [tuple(ind) for ind in next_population]
-        clock.tick(60)
+            # A linha só é "aceita" se passar pela política de duplicatas
+            if register_child(child, seen_tours, DUPLICATE_POLICY, MAX_DUPLICATE_COPIES,
+                              mutate=lambda ind: swap_mutation_inplace(ind, 1.0)):
+                n_filled += 1
+
+        if diversity_action != "none" and is_collapsed(metrics, INJECTION_EDGE_ENTROPY):
+            inject_diversity(next_population, diversity_action)
+            history["injections"].append(generation)
+
+        population, next_population = next_population, population
+        edge_frequency.update(population)
+
+def inject_diversity(population, action):
+    """
+    Substitui parte da população por rotas aleatórias, mantendo a primeira linha (o melhor).
+
+    "inject" troca as últimas INJECTION_FRACTION linhas; "restart" troca todas menos a primeira.
+    """
+    n_individuals, n_cities = population.shape
+    if action == "restart":
+        n_replaced = n_individuals - 1
+    else:
+        n_replaced = min(n_individuals - 1, max(1, int(n_individuals * INJECTION_FRACTION)))
+    population[n_individuals - n_replaced:] = create_population_array(n_cities, n_replaced)
+
+def create_cities(n_cities):
+    """Sorteia as coordenadas das cidades dentro da área visível da janela."""
+    return [(random.randint(TSP_DISPLAY_OFFSET, WIDTH - TSP_DISPLAY_OFFSET),
+             random.randint(TSP_DISPLAY_OFFSET, HEIGHT - TSP_DISPLAY_OFFSET))
+            for _ in range(n_cities)]
+
+def new_history():
+    return {"best_fitness": [], "best_distance": [], "avg_distance": [],
+            "edge_entropy": [], "pairwise_distance": [], "unique_share": [], "injections": [],
+            "stop_reason": None}
+
+def print_summary(history, generation, fitness_cache, elapsed):
+    """Exibe o resultado final da execução no terminal."""
+    if history["stop_reason"] is not None:
+        print(f"Convergência detectada na Geração {generation} ({history['stop_reason']}). Parando a simulação.")
+    if not generation:
+        print("Nenhuma geração executada.")
+        return
+    print(f"Melhor distância: {history['best_distance'][-1]:.2f} após {generation} gerações "
+          f"({elapsed:.2f}s, {generation / max(elapsed, 1e-9):.1f} gerações/s)")
+    print(f"Cache de avaliação: {fitness_cache.hits} acertos, {fitness_cache.misses} falhas "
+          f"({fitness_cache.hit_rate:.1%})")
+    print(f"Diversidade final: entropia de arestas {history['edge_entropy'][-1]:.3f}, "
+          f"distância média entre pares {history['pairwise_distance'][-1]:.3f}, "
+          f"rotas únicas {history['unique_share'][-1]:.1%} ({len(history['injections'])} injeções)")
+
+def run_headless(cities_locations, n_generations, log_every=0, stop_rule=STOP_RULE,
+                 diversity_action=DIVERSITY_ACTION):
+    """Executa o AG em lote, sem pygame nem matplotlib."""
+    history = new_history()
+    fitness_cache = FitnessCache(FITNESS_CACHE_SIZE)
+    start = time.perf_counter()
+    generation = 0
+    for generation, _ in evolve(cities_locations, n_generations, history, fitness_cache, stop_rule,
+                                diversity_action):
+        if log_every and generation % log_every == 0:
+            print(f"Geração {generation}: melhor distância {history['best_distance'][-1]:.2f}, "
+                  f"entropia {history['edge_entropy'][-1]:.3f}, rotas únicas {history['unique_share'][-1]:.0%}")
+    print_summary(history, generation, fitness_cache, time.perf_counter() - start)
+
+def run_simulation(cities_locations, n_generations, fps=FPS, stop_rule=STOP_RULE, diversity_action=DIVERSITY_ACTION):
+    """
+    Executa o AG com visualização.
+
+    O AG avança na velocidade máxima; a tela só é redesenhada, com a melhor
+    rota da geração corrente, quando passa o intervalo de um quadro (1/fps s).
+    """
+    import pygame
+    from visualization import setup_pygame_display, draw_all_elements, update_performance_plots_at_end
+
+    # Inicialização
+    screen, clock = setup_pygame_display(WIDTH, HEIGHT)
+    history = new_history()
+    fitness_cache = FitnessCache(FITNESS_CACHE_SIZE)
+    frame_interval = 1.0 / fps
+    last_frame = float('-inf')
+    start = time.perf_counter()
+    generation = 0
+    
+    # Loop Principal da Simulação
+    for generation, sorted_population in evolve(cities_locations, n_generations, history, fitness_cache, stop_rule,
+                                                diversity_action):
+        now = time.perf_counter()
+        if now - last_frame < frame_interval and generation < n_generations:
+            continue
+        last_frame = now
+
+        # Verificação de eventos
+        running_simulation = True
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running_simulation = False
+            if event.type == pygame.KEYDOWN and (event.key == pygame.K_q or event.key == pygame.K_ESCAPE):
+                running_simulation = False
+        if not running_simulation:
+            break
+
+        # Atualiza apenas a visualização do Pygame
+        draw_all_elements(screen, sorted_population[0], sorted_population, cities_locations, generation, n_generations)
+
+    # Garante que a última geração calculada apareça na tela
+    if generation:
+        draw_all_elements(screen, sorted_population[0], sorted_population, cities_locations, generation, n_generations)
+    print_summary(history, generation, fitness_cache, time.perf_counter() - start)
 
     # **NOVO:** Chamada para a função que plota todos os gráficos de uma vez
-    update_performance_plots_at_end(best_fitness_history, best_distance_history, avg_distance_history)
+    update_performance_plots_at_end(history["best_fitness"], history["best_distance"], history["avg_distance"])
 
     # Loop de espera para manter a janela aberta após a simulação
     running_display = True
@@ -108,10 +221,43 @@ def run_simulation():
                 running_display = False
         
         pygame.display.flip()
+        clock.tick(fps)
         
     # Finalização
     pygame.quit()
     sys.exit()
 
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="PCV com algoritmo genético e parada por convergência.")
+    parser.add_argument("--headless", action="store_true",
+                        help="executa em lote, sem pygame nem matplotlib")
+    parser.add_argument("--fps", type=float, default=FPS,
+                        help="quadros por segundo da visualização (padrão: %(default)s)")
+    parser.add_argument("--generations", type=int, default=N_GENERATIONS,
+                        help="número máximo de gerações (padrão: %(default)s)")
+    parser.add_argument("--cities", type=int, default=N_CITIES,
+                        help="número de cidades (padrão: %(default)s)")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="semente dos geradores aleatórios")
+    parser.add_argument("--stop-rule", choices=STOP_RULES, default=STOP_RULE,
+                        help="regra de parada: estagnação, colapso da diversidade ou combinação "
+                             "(padrão: %(default)s)")
+    parser.add_argument("--diversity-action", choices=DIVERSITY_ACTIONS, default=DIVERSITY_ACTION,
+                        help="reação à perda de diversidade (padrão: %(default)s)")
+    parser.add_argument("--log-every", type=int, default=0,
+                        help="no modo headless, imprime o progresso a cada N gerações")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.seed is not None:
+        random.seed(args.seed)
+        np.random.seed(args.seed)
+    cities_locations = create_cities(args.cities)
+    if args.headless:
+        run_headless(cities_locations, args.generations, args.log_every, args.stop_rule, args.diversity_action)
+    else:
+        run_simulation(cities_locations, args.generations, args.fps, args.stop_rule, args.diversity_action)
+
 if __name__ == '__main__':
-    run_simulation()
\ No newline at end of file
+    main()
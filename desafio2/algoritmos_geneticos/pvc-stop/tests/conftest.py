@@ -0,0 +1,7 @@
+# conftest.py
+
+import os
+import sys
+
+# Os módulos do projeto ficam soltos no diretório pvc-stop, sem pacote instalável
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,66 @@
+# test_diversity.py
+
+import numpy as np
+import pytest
+
+from diversity import EdgeFrequency, unique_share, is_stagnant, stop_reason
+
+
+def random_population(pop_size, n_cities, seed):
+    rng = np.random.default_rng(seed)
+    return np.array([rng.permutation(n_cities) for _ in range(pop_size)], dtype=np.int32)
+
+
+def edge_sets(population):
+    return [{frozenset(edge) for edge in zip(tour.tolist(), np.roll(tour, -1).tolist())} for tour in population]
+
+
+def test_edge_counts_match_edge_sets():
+    population = random_population(30, 12, 0)
+    frequency = EdgeFrequency(population)
+    for next_seed in (1, 2):
+        expected = np.zeros((12, 12), dtype=np.int32)
+        for edges in edge_sets(population):
+            for a, b in edges:
+                expected[a, b] += 1
+                expected[b, a] += 1
+        np.testing.assert_array_equal(frequency.counts, expected)
+        # A próxima geração substitui a população inteira
+        population = random_population(30, 12, next_seed)
+        frequency.update(population)
+
+
+def test_mean_pairwise_distance_matches_brute_force():
+    population = random_population(15, 10, 2)
+    population[3] = population[7]
+    edges = edge_sets(population)
+    distances = [10 - len(edges[i] & edges[j]) for i in range(15) for j in range(i + 1, 15)]
+    assert EdgeFrequency(population).mean_pairwise_distance() == pytest.approx(np.mean(distances) / 10)
+
+
+def test_collapsed_population_has_zero_diversity():
+    population = np.tile(np.arange(8, dtype=np.int32), (20, 1))
+    # Rotações e inversões são a mesma rota
+    population[1] = np.roll(population[1], 3)
+    population[2] = population[2][::-1]
+    frequency = EdgeFrequency(population)
+    assert frequency.edge_entropy() == 0.0
+    assert frequency.mean_pairwise_distance() == pytest.approx(0.0)
+    assert unique_share(population) == 1 / 20
+
+
+def test_stop_rules_combine_stagnation_and_collapse():
+    flat = [10.0] * 6
+    improving = [15.0, 14.0, 13.0, 12.0, 11.0, 10.0]
+    collapsed = {"edge_entropy": 0.05, "unique_share": 0.5}
+    diverse = {"edge_entropy": 0.8, "unique_share": 1.0}
+    assert is_stagnant(flat, 5) and not is_stagnant(improving, 5) and not is_stagnant(flat[:5], 5)
+    thresholds = {"window": 5, "min_edge_entropy": 0.1}
+    assert stop_reason("stagnation", flat, diverse, **thresholds) == "estagnação"
+    assert stop_reason("diversity", improving, collapsed, **thresholds) == "colapso da diversidade"
+    assert stop_reason("stagnation_and_diversity", flat, diverse, **thresholds) is None
+    assert stop_reason("stagnation_and_diversity", flat, collapsed, **thresholds) == "estagnação e colapso da diversidade"
+    assert stop_reason("stagnation_or_diversity", improving, collapsed, **thresholds) == "colapso da diversidade"
+    assert stop_reason("stagnation_or_diversity", improving, diverse, **thresholds) is None
+    with pytest.raises(ValueError):
+        stop_reason("never", flat, diverse, **thresholds)
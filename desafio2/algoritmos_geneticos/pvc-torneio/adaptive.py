@@ -0,0 +1,86 @@
+# adaptive.py
+
+import numpy as np
+
+ADAPTATION_SCHEMES = ("probability_matching", "adaptive_pursuit")
+
+# Piso da qualidade: operadores que só recebem recompensa zero não chegam a 0
+# (com todas as qualidades nulas, o probability matching dividiria 0 por 0)
+QUALITY_FLOOR = 1e-12
+
+class AdaptiveOperatorSelector:
+    """
+    Escolhe operadores com probabilidades ajustadas pelo sucesso recente de cada um.
+
+    A cada geração, as recompensas recebidas por cada operador (melhoria do
+    filho em relação ao melhor pai) são resumidas pela média e entram numa
+    média móvel exponencial `quality`. As probabilidades são então
+    recalculadas por um de dois esquemas:
+
+    - "probability_matching": proporcionais à qualidade, com piso `p_min`;
+    - "adaptive_pursuit": a do melhor operador é puxada para
+      p_max = 1 - (K - 1)·p_min e as demais para p_min, com taxa `beta`,
+      o que reage mais rápido quando um operador passa a dominar.
+
+    O piso `p_min` garante que nenhum operador deixe de ser testado.
+
+    Args:
+        operators (sequence): Nomes dos K operadores.
+        scheme (str): Um de `ADAPTATION_SCHEMES`.
+        p_min (float): Probabilidade mínima de cada operador.
+        alpha (float): Taxa de aprendizado da qualidade.
+        beta (float): Taxa de aprendizado das probabilidades (adaptive pursuit).
+    """
+
+    def __init__(self, operators, scheme="adaptive_pursuit", p_min=None, alpha=0.3, beta=0.3):
+        if scheme not in ADAPTATION_SCHEMES:
+            raise ValueError(f"Esquema de adaptação desconhecido: {scheme!r}")
+        self.operators = tuple(operators)
+        n_operators = len(self.operators)
+        self.scheme = scheme
+        self.p_min = p_min if p_min is not None else 0.1 / n_operators
+        if self.p_min * n_operators > 1:
+            raise ValueError(f"p_min={self.p_min} é grande demais para {n_operators} operadores")
+        self.alpha = alpha
+        self.beta = beta
+        self.probabilities = np.full(n_operators, 1.0 / n_operators)
+        self.quality = np.full(n_operators, 1e-6)
+
+    def select(self, n_samples):
+        """Sorteia `n_samples` operadores; retorna os índices em `operators`."""
+        return np.random.choice(len(self.operators), size=n_samples, p=self.probabilities)
+
+    def update(self, operator_indices, rewards):
+        """
+        Atualiza qualidades e probabilidades com as recompensas de uma geração.
+
+        Args:
+            operator_indices (np.ndarray): Operador usado em cada filho.
+            rewards (np.ndarray): Recompensa (>= 0) de cada filho.
+        """
+        n_operators = len(self.operators)
+        uses = np.bincount(operator_indices, minlength=n_operators)
+        totals = np.bincount(operator_indices, weights=rewards, minlength=n_operators)
+        used = uses > 0
+        self.quality[used] += self.alpha * (totals[used] / uses[used] - self.quality[used])
+        np.maximum(self.quality, QUALITY_FLOOR, out=self.quality)
+
+        if self.scheme == "probability_matching":
+            self.probabilities = self.p_min + (1 - n_operators * self.p_min) * self.quality / self.quality.sum()
+        else:
+            p_max = 1 - (n_operators - 1) * self.p_min
+            targets = np.full(n_operators, self.p_min)
+            targets[np.argmax(self.quality)] = p_max
+            self.probabilities += self.beta * (targets - self.probabilities)
+        self.probabilities /= self.probabilities.sum()
+
+    def as_dict(self):
+        """Probabilidades atuais como {operador: probabilidade}."""
+        return dict(zip(self.operators, self.probabilities.tolist()))
+
+    def get_state(self):
+        return {"probabilities": self.probabilities.tolist(), "quality": self.quality.tolist()}
+
+    def set_state(self, state):
+        self.probabilities = np.array(state["probabilities"])
+        self.quality = np.array(state["quality"])
@@ -0,0 +1,195 @@
+# benchmark.py
+
+import argparse
+import csv
+import random
+import time
+import numpy as np
+
+from steady_state import create_genetic_algorithm
+from tsplib import bundled_instances, load_instance
+from config import (MUTATION_PROBABILITY, CROSSOVER_PROBABILITY, TOURNAMENT_SIZE, DUPLICATE_POLICY,
+                    MAX_DUPLICATE_COPIES, FITNESS_CACHE_SIZE)
+
+# --- Parâmetros do Benchmark ---
+BENCHMARK_INSTANCES = ("att48", "berlin52", "eil51", "eil76", "kroA100")
+BENCHMARK_POPULATION = 200
+BENCHMARK_GENERATIONS = 500
+BENCHMARK_SEEDS = 5
+TARGET_GAP = 0.05  # Gap (5% acima do ótimo) usado no tempo até o alvo
+
+BASE_PARAMS = {
+    "population_size": BENCHMARK_POPULATION,
+    "mutation_probability": MUTATION_PROBABILITY,
+    "crossover_probability": CROSSOVER_PROBABILITY,
+    "tournament_size": TOURNAMENT_SIZE,
+    "duplicate_policy": DUPLICATE_POLICY,
+    "max_duplicate_copies": MAX_DUPLICATE_COPIES,
+    "fitness_cache_size": FITNESS_CACHE_SIZE,
+}
+
+# Configurações comparadas: nome -> parâmetros repassados a `create_genetic_algorithm`
+CONFIGURATIONS = {
+    "ga": {},
+    "ga-pmx": {"crossover": "pmx"},
+    "ga-erx": {"crossover": "erx"},
+    "ga-eax": {"crossover": "eax"},
+    "ga-neighbor": {"mutation": "neighbor"},
+    "ga-steady-state": {"replacement": "worst"},
+    "ga-adaptive": {"adaptive": "adaptive_pursuit", "adaptive_crossovers": ["ox", "erx", "eax"]},
+    "memetic-elite": {"local_search": "elite"},
+    "memetic-offspring": {"local_search": "offspring"},
+}
+
+CSV_FIELDS = ("config", "instance", "seed", "optimum", "best_distance", "gap", "generations",
+              "elapsed", "time_to_target", "evaluations", "evaluations_per_second")
+
+def run_trial(instance, ga_params, n_generations, seed, target_gap=TARGET_GAP):
+    """
+    Executa o AG uma vez numa instância TSPLIB e mede a qualidade e a velocidade.
+
+    O tempo até o alvo é o tempo (a partir da criação do AG) até a melhor rota
+    ficar a no máximo `target_gap` do ótimo; None se o alvo não for atingido.
+    As avaliações são as de `ga.evaluations`: só as rotas avaliadas por
+    completo; filhos avaliados por delta e acertos do cache não contam.
+
+    Returns:
+        dict: Uma linha do resultado, com as chaves de `CSV_FIELDS` (menos "config").
+    """
+    random.seed(seed)
+    np.random.seed(seed)
+    target = instance.optimum * (1 + target_gap) if instance.optimum else None
+    time_to_target = None
+
+    start = time.perf_counter()
+    ga = create_genetic_algorithm(instance.coords, distance_matrix=instance.distance_matrix, **ga_params)
+
+    def check_target(ga):
+        nonlocal time_to_target
+        if time_to_target is None and target is not None and ga.best_distance <= target:
+            time_to_target = time.perf_counter() - start
+
+    check_target(ga)
+    ga.run(n_generations, on_generation=check_target)
+    elapsed = time.perf_counter() - start
+
+    evaluations = ga.evaluations
+    return {
+        "instance": instance.name,
+        "seed": seed,
+        "optimum": instance.optimum,
+        "best_distance": float(ga.best_distance),
+        "gap": instance.gap(float(ga.best_distance)),
+        "generations": ga.generation,
+        "elapsed": elapsed,
+        "time_to_target": time_to_target,
+        "evaluations": evaluations,
+        "evaluations_per_second": evaluations / max(elapsed, 1e-9),
+    }
+
+def run_benchmark(instance_names=BENCHMARK_INSTANCES, configurations=CONFIGURATIONS,
+                  n_generations=BENCHMARK_GENERATIONS, seeds=range(BENCHMARK_SEEDS),
+                  target_gap=TARGET_GAP, on_trial=None):
+    """
+    Executa todas as combinações configuração × instância × semente.
+
+    Args:
+        instance_names: Instâncias incluídas em `instances/` (ex.: "att48").
+        configurations (dict): Nome -> parâmetros de `create_genetic_algorithm` (somados a `BASE_PARAMS`).
+        n_generations (int): Gerações de cada execução.
+        seeds: Sementes; cada uma gera uma execução por configuração e instância.
+        target_gap (float): Gap do critério de tempo até o alvo.
+        on_trial (callable, opcional): Chamado como `on_trial(row)` após cada execução.
+
+    Returns:
+        list[dict]: Uma linha por execução.
+    """
+    instances = [load_instance(name) for name in instance_names]
+    rows = []
+    for config_name, params in configurations.items():
+        ga_params = {**BASE_PARAMS, **params}
+        for instance in instances:
+            for seed in seeds:
+                row = {"config": config_name, **run_trial(instance, ga_params, n_generations, seed, target_gap)}
+                rows.append(row)
+                if on_trial is not None:
+                    on_trial(row)
+    return rows
+
+def summarize(rows):
+    """
+    Agrupa as execuções por (configuração, instância).
+
+    Cada grupo resume o gap melhor e médio, o tempo até o alvo e as avaliações/s.
+    """
+    groups = {}
+    for row in rows:
+        groups.setdefault((row["config"], row["instance"]), []).append(row)
+
+    summary = []
+    for (config_name, instance_name), group in groups.items():
+        gaps = [row["gap"] for row in group if row["gap"] is not None]
+        hits = [row["time_to_target"] for row in group if row["time_to_target"] is not None]
+        summary.append({
+            "config": config_name,
+            "instance": instance_name,
+            "runs": len(group),
+            "best_gap": min(gaps) if gaps else None,
+            "mean_gap": float(np.mean(gaps)) if gaps else None,
+            "hit_rate": len(hits) / len(group),
+            "median_time_to_target": float(np.median(hits)) if hits else None,
+            "evaluations_per_second": float(np.mean([row["evaluations_per_second"] for row in group])),
+        })
+    return summary
+
+def print_summary_table(summary, target_gap=TARGET_GAP):
+    """Exibe o resumo do benchmark como tabela no terminal."""
+    def fmt(value, spec, suffix=""):
+        return format(value, spec) + suffix if value is not None else "-"
+
+    print(f"{'Configuração':<18} | {'Instância':<10} | {'Melhor gap':>10} | {'Gap médio':>10} | "
+          f"{'Alvo ' + format(target_gap, '.0%'):>9} | {'Tempo alvo':>10} | {'Aval./s':>10}")
+    for line in summary:
+        print(f"{line['config']:<18} | {line['instance']:<10} | {fmt(line['best_gap'], '.2%'):>10} | "
+              f"{fmt(line['mean_gap'], '.2%'):>10} | {line['hit_rate']:>9.0%} | "
+              f"{fmt(line['median_time_to_target'], '.2f', 's'):>10} | {line['evaluations_per_second']:>10.0f}")
+
+def write_csv(rows, path):
+    """Grava uma linha por execução no arquivo CSV `path`."""
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark do AG nas instâncias TSPLIB (gap até o ótimo).")
+    parser.add_argument("--instances", nargs="+", choices=bundled_instances(), default=list(BENCHMARK_INSTANCES),
+                        help="instâncias avaliadas (padrão: todas)")
+    parser.add_argument("--configs", nargs="+", choices=list(CONFIGURATIONS), default=list(CONFIGURATIONS),
+                        help="configurações do AG comparadas (padrão: todas)")
+    parser.add_argument("--generations", type=int, default=BENCHMARK_GENERATIONS,
+                        help="gerações de cada execução (padrão: %(default)s)")
+    parser.add_argument("--seeds", type=int, default=BENCHMARK_SEEDS,
+                        help="execuções (sementes 0..N-1) por configuração e instância (padrão: %(default)s)")
+    parser.add_argument("--target-gap", type=float, default=TARGET_GAP,
+                        help="gap do critério de tempo até o alvo (padrão: %(default)s)")
+    parser.add_argument("--csv", default=None, help="grava o resultado de cada execução neste arquivo CSV")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    configurations = {name: CONFIGURATIONS[name] for name in args.configs}
+
+    def log_trial(row):
+        gap = f"{row['gap']:.2%}" if row["gap"] is not None else "-"
+        print(f"{row['config']} / {row['instance']} / semente {row['seed']}: "
+              f"{row['best_distance']:.0f} (gap {gap}, {row['elapsed']:.2f}s)")
+
+    rows = run_benchmark(args.instances, configurations, args.generations, range(args.seeds),
+                         args.target_gap, on_trial=log_trial)
+    print_summary_table(summarize(rows), args.target_gap)
+    if args.csv:
+        write_csv(rows, args.csv)
+
+if __name__ == '__main__':
+    main()
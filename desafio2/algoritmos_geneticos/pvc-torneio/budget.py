@@ -0,0 +1,138 @@
+# budget.py
+
+import signal
+import threading
+import time
+from contextlib import contextmanager
+
+# Motivos de parada registrados em `GeneticAlgorithm.stop_reason`
+STOP_REASONS = ("generations", "convergence", "time_limit", "evaluations", "target", "callback", "interrupted")
+
+class Budget:
+    """
+    Limites de uma execução do AG; o primeiro a ser atingido encerra a execução.
+
+    Todos são opcionais (None = sem limite). O limite de tempo é de parede,
+    contado a partir de `start()`, e é conservador: a execução também para
+    quando a geração seguinte, estimada pela duração da última, passaria do
+    limite, então uma execução com `time_limit=30` termina antes dos 30 s.
+
+    Args:
+        max_generations (int): Número máximo de gerações (contando a inicial).
+        time_limit (float): Segundos de execução.
+        max_evaluations (int): Avaliações completas de rotas (`GeneticAlgorithm.evaluations`);
+            uma geração avalia no máximo P rotas, então o limite nunca é ultrapassado.
+        target_distance (float): Para assim que a melhor rota for menor ou igual a este comprimento.
+        convergence_generations (int): Janela do critério de parada por estagnação.
+    """
+
+    def __init__(self, max_generations=None, time_limit=None, max_evaluations=None, target_distance=None,
+                 convergence_generations=None):
+        self.max_generations = max_generations
+        self.time_limit = time_limit
+        self.max_evaluations = max_evaluations
+        self.target_distance = target_distance
+        self.convergence_generations = convergence_generations
+        self.start()
+
+    def start(self):
+        """Reinicia o relógio do limite de tempo."""
+        self.start_time = time.perf_counter()
+        self._last_check = self.start_time
+        self._last_generation_time = 0.0
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.start_time
+
+    def exhausted(self, ga):
+        """
+        Verifica os limites depois de uma geração de `ga`.
+
+        Returns:
+            str | None: Um de `STOP_REASONS` ou None para continuar.
+        """
+        now = time.perf_counter()
+        self._last_generation_time, self._last_check = now - self._last_check, now
+        if self.target_distance is not None and ga.best_distance <= self.target_distance:
+            return "target"
+        if self.max_generations is not None and ga.generation >= self.max_generations:
+            return "generations"
+        if self.max_evaluations is not None and ga.evaluations + ga.population_size > self.max_evaluations:
+            # A próxima geração passaria do limite de avaliações
+            return "evaluations"
+        if self.time_limit is not None and now - self.start_time + self._last_generation_time > self.time_limit:
+            return "time_limit"
+        if ga.has_converged(self.convergence_generations):
+            return "convergence"
+        return None
+
+class AnytimeReporter:
+    """
+    Registra a melhor rota até o momento em intervalos fixos de tempo de parede.
+
+    Cada registro (segundos desde o início, geração, avaliações e melhor
+    distância) vai para `history` e, se houver, para `callback(record)`.
+
+    Args:
+        interval (float): Segundos entre registros.
+        callback (callable, opcional): Chamado com cada registro (dict).
+    """
+
+    def __init__(self, interval, callback=None):
+        self.interval = interval
+        self.callback = callback
+        self.history = []
+        self.start_time = time.perf_counter()
+        self._next_report = self.start_time + interval
+
+    def record(self, ga):
+        """Registra o estado atual de `ga` (sempre, independentemente do intervalo)."""
+        record = {
+            "elapsed": time.perf_counter() - self.start_time,
+            "generation": ga.generation,
+            "evaluations": ga.evaluations,
+            "best_distance": float(ga.best_distance),
+        }
+        self.history.append(record)
+        if self.callback is not None:
+            self.callback(record)
+        return record
+
+    def maybe_record(self, ga):
+        """Registra `ga` se já passou o intervalo desde o último registro."""
+        now = time.perf_counter()
+        if now >= self._next_report:
+            # Sem acumular atrasos: o próximo registro fica um intervalo à frente de agora
+            self._next_report = now + self.interval
+            self.record(ga)
+
+@contextmanager
+def deferred_interrupt(enabled=True):
+    """
+    Adia o Ctrl+C para o fim da geração em curso.
+
+    Dentro do bloco, o primeiro SIGINT só marca `state["interrupted"]`; o
+    laço do AG termina a geração, para e devolve a melhor rota, com a
+    população num estado consistente (pode ser salva em checkpoint). O
+    tratador original é restaurado em seguida, então um segundo Ctrl+C
+    interrompe na hora. Fora da thread principal não há o que instalar e o
+    bloco roda sem mudanças.
+
+    Yields:
+        dict: {"interrupted": bool}.
+    """
+    state = {"interrupted": False}
+    if not enabled or threading.current_thread() is not threading.main_thread():
+        yield state
+        return
+
+    def handle_interrupt(signum, frame):
+        state["interrupted"] = True
+        signal.signal(signal.SIGINT, previous_handler)
+
+    previous_handler = signal.signal(signal.SIGINT, handle_interrupt)
+    try:
+        yield state
+    finally:
+        signal.signal(signal.SIGINT, previous_handler)
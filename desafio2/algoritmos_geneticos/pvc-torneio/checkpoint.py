@@ -0,0 +1,137 @@
+# checkpoint.py
+
+import json
+import os
+import random
+import numpy as np
+
+from ga_logic import POPULATION_DTYPE
+
+CHECKPOINT_VERSION = 1
+
+# Parâmetros do AG guardados no checkpoint para recriar a mesma configuração
+GA_PARAMS = ("population_size", "mutation_probability", "crossover_probability", "tournament_size",
+             "selection", "selection_pressure", "tournament_replacement",
+             "crossover", "mutation", "adaptive", "adaptive_crossovers",
+             "duplicate_policy", "max_duplicate_copies",
+             "local_search", "local_search_budget", "matrix_free",
+             "replacement", "offspring_per_step")
+
+def save_checkpoint(path, ga, metadata=None):
+    """
+    Salva o estado completo de uma execução em um arquivo `.npz` compactado.
+
+    O arquivo guarda a população, as distâncias, o contador de gerações, os
+    históricos, as cidades, o estado dos geradores `random` e `np.random` e
+    o conteúdo do cache de avaliação, o suficiente para que a execução
+    retomada seja idêntica à que não foi interrompida. A escrita é feita num
+    arquivo temporário renomeado no final, então uma interrupção durante o
+    salvamento não corrompe o checkpoint anterior.
+
+    Args:
+        path (str): Caminho do arquivo `.npz`.
+        ga (GeneticAlgorithm): AG a salvar.
+        metadata (dict, opcional): Informações extras serializáveis em JSON
+            (ex.: argumentos de linha de comando).
+    """
+    version, python_state, gauss_next = random.getstate()
+    _, numpy_keys, numpy_pos, numpy_has_gauss, numpy_gauss = np.random.get_state()
+
+    cache_items = ga.fitness_cache.items()
+    n_cities = ga.population.shape[1]
+    cache_keys = np.array([np.frombuffer(key, dtype=POPULATION_DTYPE) for key, _ in cache_items],
+                          dtype=POPULATION_DTYPE).reshape(len(cache_items), n_cities)
+    cache_distances = np.array([distance for _, distance in cache_items], dtype=np.float64)
+
+    cities = ga.cities_locations
+    state = {
+        "version": np.array(CHECKPOINT_VERSION),
+        "generation": np.array(ga.generation),
+        "evaluations": np.array(ga.evaluations),
+        "population": ga.population,
+        "population_distances": ga.population_distances,
+        "best_fitness_history": np.array(ga.best_fitness_history, dtype=np.float64),
+        "best_distance_history": np.array(ga.best_distance_history, dtype=np.float64),
+        "avg_distance_history": np.array(ga.avg_distance_history, dtype=np.float64),
+        "cities": np.array(cities if cities is not None else np.empty((0, 2)), dtype=np.float64),
+        "python_rng_state": np.array(python_state, dtype=np.uint64),
+        "python_rng_extra": np.array(json.dumps([version, gauss_next])),
+        "numpy_rng_keys": numpy_keys,
+        "numpy_rng_extra": np.array([numpy_pos, numpy_has_gauss, numpy_gauss], dtype=np.float64),
+        "cache_keys": cache_keys,
+        "cache_distances": cache_distances,
+        "cache_counters": np.array([ga.fitness_cache.hits, ga.fitness_cache.misses]),
+        "params": np.array(json.dumps({name: getattr(ga, name, None) for name in GA_PARAMS})),
+        "metadata": np.array(json.dumps(metadata or {})),
+    }
+    if ga.crossover_selector is not None:
+        state["adaptive_state"] = np.array(json.dumps({"crossover": ga.crossover_selector.get_state(),
+                                                       "mutation": ga.mutation_selector.get_state(),
+                                                       "history": ga.operator_history}))
+    temporary_path = f"{path}.tmp.npz"
+    np.savez_compressed(temporary_path, **state)
+    os.replace(temporary_path, path)
+
+def load_checkpoint(path):
+    """
+    Lê um checkpoint salvo por `save_checkpoint`.
+
+    Returns:
+        dict: Arrays do arquivo, com "params" e "metadata" já convertidos de
+        JSON e "cities" como lista de tuplas (ou None, se não havia cidades).
+    """
+    with np.load(path) as data:
+        checkpoint = {key: data[key] for key in data.files}
+    if int(checkpoint["version"]) != CHECKPOINT_VERSION:
+        raise ValueError(f"Versão de checkpoint não suportada: {int(checkpoint['version'])}")
+    checkpoint["params"] = json.loads(str(checkpoint["params"]))
+    checkpoint["metadata"] = json.loads(str(checkpoint["metadata"]))
+    cities = checkpoint["cities"]
+    checkpoint["cities"] = [tuple(city) for city in cities.tolist()] if len(cities) else None
+    return checkpoint
+
+def restore_checkpoint(ga, checkpoint):
+    """
+    Restaura em `ga` o estado salvo e o estado dos geradores aleatórios.
+
+    `ga` deve ter sido criado com as mesmas cidades e parâmetros da execução
+    salva (veja `checkpoint["params"]`); a partir daí, `ga.step()` continua
+    exatamente de onde a execução parou.
+
+    Returns:
+        GeneticAlgorithm: O próprio `ga`.
+    """
+    population = checkpoint["population"]
+    if population.shape != ga.population.shape:
+        raise ValueError(f"População do checkpoint {population.shape} difere da do AG {ga.population.shape}")
+    ga.population[...] = population
+    ga.generation = int(checkpoint["generation"])
+    ga.population_distances = checkpoint["population_distances"].astype(np.float64)
+    ga.population_fitness = 1 / (ga.population_distances + 1e-10)
+    ga.sorted_indices = np.argsort(-ga.population_fitness, kind='stable')
+    ga.best_fitness_history = checkpoint["best_fitness_history"].tolist()
+    ga.best_distance_history = checkpoint["best_distance_history"].tolist()
+    ga.avg_distance_history = checkpoint["avg_distance_history"].tolist()
+    if "evaluations" in checkpoint:
+        ga.evaluations = int(checkpoint["evaluations"])
+    # Com elitismo, a melhor rota já encontrada é a melhor da população salva
+    ga.incumbent = ga.population[ga.sorted_indices[0]].copy()
+    ga.incumbent_distance = float(ga.population_distances[ga.sorted_indices[0]])
+
+    if "adaptive_state" in checkpoint and ga.crossover_selector is not None:
+        adaptive_state = json.loads(str(checkpoint["adaptive_state"]))
+        ga.crossover_selector.set_state(adaptive_state["crossover"])
+        ga.mutation_selector.set_state(adaptive_state["mutation"])
+        ga.operator_history = adaptive_state["history"]
+
+    cache = ga.fitness_cache
+    cache.clear()
+    for key, distance in zip(checkpoint["cache_keys"], checkpoint["cache_distances"].tolist()):
+        cache.put(key.tobytes(), distance)
+    cache.hits, cache.misses = (int(value) for value in checkpoint["cache_counters"])
+
+    version, gauss_next = json.loads(str(checkpoint["python_rng_extra"]))
+    random.setstate((version, tuple(int(value) for value in checkpoint["python_rng_state"]), gauss_next))
+    pos, has_gauss, gauss = checkpoint["numpy_rng_extra"].tolist()
+    np.random.set_state(("MT19937", checkpoint["numpy_rng_keys"], int(pos), int(has_gauss), gauss))
+    return ga
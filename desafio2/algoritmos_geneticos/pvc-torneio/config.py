@@ -0,0 +1,24 @@
+# config.py
+
+import random
+
+# --- Parâmetros compartilhados ---
+# Padrões do AG usados pela interface (main.py) e pelos outros pontos de entrada
+# (ilhas, benchmark, AG estacionário), que assim não dependem da CLI
+WIDTH, HEIGHT = 1200, 1000
+TSP_DISPLAY_OFFSET = 60
+N_CITIES = 80
+POPULATION_SIZE = 1000
+N_GENERATIONS = 800
+MUTATION_PROBABILITY = 0.1
+CROSSOVER_PROBABILITY = 0.95
+TOURNAMENT_SIZE = 10
+DUPLICATE_POLICY = "reject"  # "reject", "mutate" ou "allow"
+MAX_DUPLICATE_COPIES = 3  # Limite de cópias por rota na política "allow"
+FITNESS_CACHE_SIZE = 50_000  # Máximo de rotas guardadas no cache de avaliação
+
+def create_cities(n_cities):
+    """Sorteia as coordenadas das cidades dentro da área visível da janela."""
+    return [(random.randint(TSP_DISPLAY_OFFSET, WIDTH - TSP_DISPLAY_OFFSET),
+             random.randint(TSP_DISPLAY_OFFSET, HEIGHT - TSP_DISPLAY_OFFSET))
+            for _ in range(n_cities)]
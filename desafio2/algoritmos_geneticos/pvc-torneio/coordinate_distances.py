@@ -0,0 +1,138 @@
+# coordinate_distances.py
+
+import math
+import numpy as np
+
+from spatial_index import knn_neighbor_lists
+
+# Métricas calculadas a partir das coordenadas: euclidiana real ou as da TSPLIB
+DISTANCE_METRICS = ("euclidean", "EUC_2D", "CEIL_2D", "ATT")
+
+# Rotas avaliadas por bloco em `tour_lengths`, para limitar a memória temporária
+TOUR_CHUNK_SIZE = 32
+
+def _apply_metric(squared, metric):
+    """Converte distâncias euclidianas ao quadrado na métrica `metric` (escalar ou array)."""
+    if metric == "ATT":
+        r = np.sqrt(squared / 10.0)
+        t = np.floor(r + 0.5)
+        return np.where(t < r, t + 1, t)
+    r = np.sqrt(squared)
+    if metric == "EUC_2D":
+        return np.floor(r + 0.5)
+    if metric == "CEIL_2D":
+        return np.ceil(r)
+    return r
+
+class _DistanceRow:
+    """Linha `i` de uma `CoordinateDistances`, para o acesso `distances[i][j]`."""
+
+    __slots__ = ("distances", "i")
+
+    def __init__(self, distances, i):
+        self.distances = distances
+        self.i = i
+
+    def __getitem__(self, j):
+        return self.distances.distance(self.i, j)
+
+class CoordinateDistances:
+    """
+    Matriz de distâncias "virtual": cada aresta é calculada das coordenadas quando pedida.
+
+    Substitui a matriz (N, N) nas instâncias grandes: para 50 mil cidades a
+    matriz densa em float64 ocupa 20 GB, enquanto aqui ficam só as
+    coordenadas em float32 contíguo (8 bytes por cidade) e, em cache, as
+    distâncias até os k vizinhos mais próximos (`nearest_neighbors`). A
+    memória é O(N·k).
+
+    Aceita os mesmos acessos que o AG faz à matriz:
+
+    - `d[a, b]` com índices escalares (deltas de mutação) retorna um float;
+    - `d[rows, cols]` com arrays calcula todas as arestas de forma vetorizada
+      (ex.: `score_paths`);
+    - `d[a][b]` (listas de listas no 2-opt e no EAX).
+
+    As coordenadas são guardadas em float32 (exatas para inteiros de até
+    7 dígitos, como nas instâncias TSPLIB), mas as contas são feitas em
+    float64, igualmente nos acessos escalares e vetorizados: o delta de uma
+    mutação bate com a reavaliação completa da rota.
+
+    Args:
+        coords: Coordenadas (N, 2) das cidades.
+        metric (str): Uma de `DISTANCE_METRICS`.
+    """
+
+    def __init__(self, coords, metric="euclidean"):
+        if metric not in DISTANCE_METRICS:
+            raise ValueError(f"Métrica desconhecida: {metric!r}")
+        self.coords = np.ascontiguousarray(coords, dtype=np.float32)
+        self.metric = metric
+        # Cópias em listas Python para o acesso escalar, bem mais rápido que indexar arrays
+        self._xs = self.coords[:, 0].tolist()
+        self._ys = self.coords[:, 1].tolist()
+        self.neighbor_lists = None
+        self.neighbor_distances = None
+
+    def __len__(self):
+        return len(self.coords)
+
+    @property
+    def shape(self):
+        return (len(self.coords), len(self.coords))
+
+    @property
+    def nbytes(self):
+        """Memória ocupada pelas coordenadas e pelo cache de vizinhos."""
+        cached = sum(array.nbytes for array in (self.neighbor_lists, self.neighbor_distances) if array is not None)
+        return self.coords.nbytes + cached
+
+    def distance(self, a, b):
+        """Distância entre as cidades `a` e `b` (escalares)."""
+        dx = self._xs[a] - self._xs[b]
+        dy = self._ys[a] - self._ys[b]
+        squared = dx * dx + dy * dy
+        if self.metric == "euclidean":
+            return math.sqrt(squared)
+        return float(_apply_metric(squared, self.metric))
+
+    def edge_lengths(self, rows, cols):
+        """Distâncias entre `rows` e `cols` (arrays de índices com formatos compatíveis)."""
+        diff = np.subtract(self.coords[rows], self.coords[cols], dtype=np.float64)
+        return _apply_metric((diff ** 2).sum(axis=-1), self.metric)
+
+    def __getitem__(self, key):
+        if not isinstance(key, tuple):
+            return _DistanceRow(self, key)
+        rows, cols = key
+        if np.ndim(rows) == 0 and np.ndim(cols) == 0:
+            return self.distance(rows, cols)
+        return self.edge_lengths(rows, cols)
+
+    def tour_lengths(self, paths):
+        """
+        Comprimento de cada rota de uma matriz (P, N), em blocos de `TOUR_CHUNK_SIZE` rotas.
+
+        Tem a mesma assinatura de um `evaluator` do AG.
+        """
+        paths = np.asarray(paths)
+        lengths = np.empty(len(paths))
+        for start in range(0, len(paths), TOUR_CHUNK_SIZE):
+            chunk = paths[start:start + TOUR_CHUNK_SIZE]
+            lengths[start:start + len(chunk)] = self.edge_lengths(chunk, np.roll(chunk, -1, axis=1)).sum(axis=1)
+        return lengths
+
+    def nearest_neighbors(self, k):
+        """
+        Listas (N, k) dos vizinhos mais próximos, guardadas com as respectivas distâncias.
+
+        As listas vêm da árvore k-d de `spatial_index` (as métricas da TSPLIB
+        são arredondamentos da euclidiana, então a ordem se mantém) e só são
+        recalculadas se `k` mudar; `neighbor_distances` guarda as distâncias
+        (N, k) para os laços de candidatos, sem recalculá-las.
+        """
+        if self.neighbor_lists is None or self.neighbor_lists.shape[1] != min(k, len(self) - 1):
+            self.neighbor_lists = knn_neighbor_lists(self.coords, k)
+            rows = np.arange(len(self))[:, np.newaxis]
+            self.neighbor_distances = self.edge_lengths(rows, self.neighbor_lists)
+        return self.neighbor_lists
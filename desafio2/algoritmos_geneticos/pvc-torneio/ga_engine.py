@@ -0,0 +1,471 @@
+# ga_engine.py
+
+import random
+import time
+import numpy as np
+
+from ga_logic import (POPULATION_DTYPE, FitnessCache, create_population_array, calculate_population_distances,
+                      CROSSOVER_OPERATORS, crossover_into, order_crossover_batch, SELECTION_METHODS,
+                      DEFAULT_SELECTION_PRESSURE, select_parent_indices, reverse_mutation_delta, swap_mutation_delta,
+                      neighbor_reverse_mutation_delta, register_child, tour_key, get_distance_matrix, score_paths)
+from local_search import LOCAL_SEARCH_MODES, TwoOptLocalSearch, build_neighbor_lists
+from adaptive import AdaptiveOperatorSelector
+from spatial_index import knn_neighbor_lists
+from coordinate_distances import CoordinateDistances
+from profiling import null_clock
+from budget import Budget, deferred_interrupt
+
+# Operadores de mutação ("none" = sem mutação); todos entram na seleção adaptativa
+MUTATION_OPERATORS = ("swap", "reverse", "neighbor", "none")
+
+
+class GeneticAlgorithm:
+    """
+    Laço do algoritmo genético para o PCV, sem nenhuma dependência de pygame/matplotlib.
+
+    A população fica em uma matriz (P, N) com buffer duplo. Cada chamada de
+    `step()` gera a próxima geração e a avalia; o estado atual (população,
+    distâncias, ordenação e históricos) fica disponível nos atributos para
+    quem quiser desenhar, registrar ou salvar a execução. `incumbent` guarda
+    a melhor rota já encontrada e `run()` executa até esgotar um `Budget`.
+    `evaluations` conta só as rotas avaliadas por completo (fora do cache).
+
+    Args:
+        cities_locations: Coordenadas das cidades (só para desenhar, se houver `distance_matrix`).
+        population_size (int): Tamanho da população (P).
+        selection (str): Um de `SELECTION_METHODS` (veja `select_parent_indices`).
+        crossover (str): Um de `CROSSOVER_OPERATORS`.
+        mutation (str): Um de `MUTATION_OPERATORS`, aplicada com `mutation_probability`.
+        adaptive (str, opcional): Um de `adaptive.ADAPTATION_SCHEMES`; substitui as taxas
+            fixas pela escolha adaptativa entre `adaptive_crossovers` e as mutações.
+        local_search (str, opcional): "elite" ou "offspring" para o AG memético (2-opt).
+        distance_matrix (opcional): Matriz (N, N) explícita (ex.: TSPLIB) ou `CoordinateDistances`.
+        matrix_free (bool): Calcula as arestas a partir das coordenadas, sem matriz (N, N).
+        evaluator (callable, opcional): Avaliação em lote (ex.: `SharedMemoryEvaluator`).
+        fitness_cache (FitnessCache, opcional): Cache de avaliação já existente, usado no
+            lugar de um novo com `fitness_cache_size`.
+        phase_timer (PhaseTimer, opcional): Mede o tempo de cada fase da geração.
+    """
+
+    def __init__(self, cities_locations, population_size=1000, mutation_probability=0.1,
+                 crossover_probability=0.95, tournament_size=10, duplicate_policy="reject",
+                 max_duplicate_copies=3, fitness_cache_size=50_000, initial_population=None,
+                 evaluator=None, local_search=None, local_search_budget=10, local_search_neighbors=10,
+                 distance_matrix=None, selection_pressure=None, tournament_replacement=True,
+                 selection="tournament", crossover="ox", adaptive=None, adaptive_crossovers=None,
+                 mutation="reverse", neighbor_lists=None, matrix_free=False, phase_timer=None,
+                 initial_distances=None, fitness_cache=None):
+        self.cities_locations = cities_locations
+        self.population_size = population_size
+        self.mutation_probability = mutation_probability
+        self.crossover_probability = crossover_probability
+        self.tournament_size = tournament_size
+        self.tournament_replacement = tournament_replacement
+        if selection not in SELECTION_METHODS:
+            raise ValueError(f"Método de seleção desconhecido: {selection!r}")
+        self.selection = selection
+        if selection_pressure is None:
+            selection_pressure = DEFAULT_SELECTION_PRESSURE[selection]
+        self.selection_pressure = selection_pressure
+        self.duplicate_policy = duplicate_policy
+        self.max_duplicate_copies = max_duplicate_copies
+        if distance_matrix is None and matrix_free:
+            distance_matrix = CoordinateDistances(cities_locations)
+        if isinstance(distance_matrix, CoordinateDistances):
+            self.distance_matrix = distance_matrix
+            if evaluator is None:
+                evaluator = distance_matrix.tour_lengths
+        elif distance_matrix is None:
+            self.distance_matrix = get_distance_matrix(cities_locations)
+        else:
+            self.distance_matrix = np.asarray(distance_matrix, dtype=np.float64)
+            if evaluator is None:
+                evaluator = lambda paths: score_paths(paths, self.distance_matrix)
+        self.matrix_free = isinstance(self.distance_matrix, CoordinateDistances)
+        self.evaluator = evaluator
+        if crossover not in CROSSOVER_OPERATORS:
+            raise ValueError(f"Operador de crossover desconhecido: {crossover!r}")
+        self.crossover = crossover
+        if mutation not in MUTATION_OPERATORS:
+            raise ValueError(f"Operador de mutação desconhecido: {mutation!r}")
+        self.mutation = mutation
+        self.adaptive = adaptive
+        self.adaptive_crossovers = adaptive_crossovers
+        self.crossover_selector = self.mutation_selector = None
+        self.operator_history = []
+        if adaptive is not None:
+            adaptive_crossovers = list(adaptive_crossovers or [crossover])
+            unknown = set(adaptive_crossovers) - set(CROSSOVER_OPERATORS)
+            if unknown:
+                raise ValueError(f"Operadores de crossover desconhecidos: {sorted(unknown)}")
+            self.crossover_selector = AdaptiveOperatorSelector(adaptive_crossovers + ["clone"], adaptive)
+            self.mutation_selector = AdaptiveOperatorSelector(MUTATION_OPERATORS, adaptive)
+        if local_search is not None and local_search not in LOCAL_SEARCH_MODES:
+            raise ValueError(f"Modo de busca local desconhecido: {local_search!r}")
+        self.local_search = local_search
+        self.local_search_budget = local_search_budget
+
+        # O EAX, a mutação "neighbor" e o 2-opt usam as listas dos k vizinhos mais
+        # próximos como movimentos candidatos; sem matriz explícita, elas vêm da
+        # árvore k-d de `spatial_index`, sem varrer a matriz (N, N)
+        self.neighbor_lists = neighbor_distances = None
+        uses_neighbors = ("eax" in self._crossover_pool() or local_search is not None
+                          or "neighbor" in (MUTATION_OPERATORS if adaptive is not None else (mutation,)))
+        if neighbor_lists is not None:
+            self.neighbor_lists = np.asarray(neighbor_lists)
+        elif uses_neighbors and self.matrix_free:
+            self.neighbor_lists = self.distance_matrix.nearest_neighbors(local_search_neighbors)
+            neighbor_distances = self.distance_matrix.neighbor_distances
+        elif uses_neighbors and distance_matrix is None:
+            self.neighbor_lists = knn_neighbor_lists(cities_locations, local_search_neighbors)
+        elif uses_neighbors:
+            self.neighbor_lists = build_neighbor_lists(self.distance_matrix, local_search_neighbors)
+        # Listas Python: os operadores fazem acessos escalares
+        self._neighbors = self.neighbor_lists.tolist() if self.neighbor_lists is not None else None
+        self._crossover_distances = None
+        if "eax" in self._crossover_pool():
+            self._crossover_distances = self.distance_matrix if self.matrix_free else self.distance_matrix.tolist()
+        self.local_searcher = None
+        if local_search is not None:
+            self.local_searcher = TwoOptLocalSearch(self.distance_matrix, neighbor_lists=self.neighbor_lists,
+                                                    neighbor_distances=neighbor_distances)
+
+        if initial_population is None:
+            self.population = create_population_array(len(self.distance_matrix), population_size)
+        else:
+            self.population = np.array(initial_population, dtype=POPULATION_DTYPE)
+            self.population_size = len(self.population)
+        self.next_population = np.empty_like(self.population)
+        # Distâncias da próxima geração; NaN marca rotas que precisam de avaliação completa
+        self.next_distances = np.empty(len(self.population))
+        self._child_distance = 0.0
+        # Operadores usados em cada filho e distância do melhor pai, para a recompensa adaptativa
+        self._child_operators = np.zeros((len(self.population), 2), dtype=np.intp)
+        self._parent_distances = np.empty(len(self.population))
+        # Um cache recebido pronto é compartilhado (ex.: entre as épocas de um processo do modelo de ilhas)
+        self.fitness_cache = fitness_cache if fitness_cache is not None else FitnessCache(fitness_cache_size)
+
+        # Listas para armazenar dados de performance
+        self.best_fitness_history = []
+        self.best_distance_history = []
+        self.avg_distance_history = []
+
+        self.phase_timer = phase_timer
+        self._clock = time.perf_counter_ns if phase_timer is not None else null_clock
+
+        self.generation = 0
+        self.evaluations = 0
+        self.incumbent = None
+        self.incumbent_distance = np.inf
+        self.stop_reason = None
+        # Distâncias já conhecidas de `initial_population` (NaN nas linhas a avaliar)
+        if initial_distances is not None:
+            initial_distances = np.array(initial_distances, dtype=np.float64)
+        self._evaluate(initial_distances)
+        self.end_generation_timing()
+
+    @property
+    def best_individual(self):
+        """Melhor rota da geração atual (cópia, segura para guardar ou desenhar)."""
+        return self.population[self.sorted_indices[0]].copy()
+
+    @property
+    def best_distance(self):
+        return self.best_distance_history[-1]
+
+    def top_individuals(self, n):
+        """Retorna uma cópia das `n` melhores rotas da geração atual."""
+        return self.population[self.sorted_indices[:n]]
+
+    def sorted_population(self):
+        """Retorna uma cópia da população ordenada da melhor para a pior rota."""
+        return self.population[self.sorted_indices]
+
+    def has_converged(self, convergence_generations):
+        """Verifica se a melhor distância não mudou nas últimas `convergence_generations` gerações."""
+        if not convergence_generations or len(self.best_distance_history) <= convergence_generations:
+            return False
+        return abs(self.best_distance_history[-1] - self.best_distance_history[-1 - convergence_generations]) < 1e-6
+
+    def _evaluate(self, known_distances=None):
+        """
+        Avalia a população atual e registra as estatísticas da geração.
+
+        Args:
+            known_distances (np.ndarray, opcional): Distâncias já conhecidas de cada
+                linha (NaN nas que precisam ser calculadas). É atualizado in-place.
+
+        `incumbent` recebe uma cópia da melhor rota, se ela melhorou.
+        """
+        clock = self._clock
+        start = clock()
+        self.generation += 1
+        if known_distances is None:
+            known_distances = np.full(len(self.population), np.nan)
+        missing = np.isnan(known_distances)
+        if missing.any():
+            known_distances[missing] = self._score(self.population[missing])
+        evaluated = clock()
+        self.population_distances = known_distances
+        self.population_fitness = 1 / (self.population_distances + 1e-10)
+        self.sorted_indices = np.argsort(-self.population_fitness, kind='stable')
+
+        best_index = self.sorted_indices[0]
+        self.best_fitness_history.append(self.population_fitness[best_index])
+        self.best_distance_history.append(self.population_distances[best_index])
+        self.avg_distance_history.append(np.mean(self.population_distances))
+        if self.population_distances[best_index] < self.incumbent_distance:
+            self.incumbent = self.population[best_index].copy()
+            self.incumbent_distance = float(self.population_distances[best_index])
+        self.record_time("evaluation", evaluated - start)
+        self.record_time("sorting", clock() - evaluated)
+
+    def _score(self, paths, keys=None):
+        """
+        Avalia `paths` por completo (consultando o cache) e retorna suas distâncias.
+
+        Só as rotas de fato calculadas entram em `evaluations`: acertos do
+        cache não contam, nem os filhos avaliados por delta (que nem chegam aqui).
+        """
+        cache = self.fitness_cache
+        misses = cache.misses
+        distances = calculate_population_distances(paths, self.cities_locations, cache, self.evaluator, keys=keys)
+        self.evaluations += cache.misses - misses if cache.maxsize else len(distances)
+        return distances
+
+    def record_time(self, phase, nanoseconds):
+        """
+        Soma `nanoseconds` à fase `phase` da geração atual (nada faz sem `phase_timer`).
+
+        Sem `phase_timer`, o relógio das fases é `null_clock` e o custo da
+        instrumentação é desprezível.
+        """
+        if self.phase_timer is not None:
+            self.phase_timer.add(phase, nanoseconds)
+
+    def end_generation_timing(self):
+        """Fecha o registro de tempos da geração atual no `phase_timer` (nada faz sem ele)."""
+        if self.phase_timer is not None:
+            self.phase_timer.end_generation(self.generation, best_distance=float(self.best_distance))
+
+    def _mutate(self, child, mutation, probability):
+        """Aplica a mutação `mutation` ao filho e retorna a variação no seu comprimento."""
+        if mutation == "reverse":
+            return reverse_mutation_delta(child, probability, self.distance_matrix)
+        if mutation == "swap":
+            return swap_mutation_delta(child, probability, self.distance_matrix)
+        if mutation == "neighbor":
+            return neighbor_reverse_mutation_delta(child, probability, self.distance_matrix, self._neighbors)
+        return 0.0
+
+    def _mutate_duplicate(self, individual):
+        self._child_distance += reverse_mutation_delta(individual, 1.0, self.distance_matrix)
+
+    def _improve_elite(self):
+        """Aplica 2-opt às melhores rotas da população atual e atualiza sua avaliação."""
+        elite = self.sorted_indices[:self.local_search_budget]
+        # A distância nova sai do ganho do 2-opt, sem reavaliar a rota
+        gains = [self.local_searcher.improve(self.population[index]) for index in elite]
+        distances = self.population_distances[elite] - gains
+        self.population_distances[elite] = distances
+        self.population_fitness[elite] = 1 / (distances + 1e-10)
+        self.sorted_indices = np.argsort(-self.population_fitness, kind='stable')
+
+    def _crossover_pool(self):
+        """Operadores de crossover que podem ser usados nesta execução."""
+        if self.crossover_selector is not None:
+            return self.crossover_selector.operators
+        return (self.crossover,)
+
+    def _update_operator_probabilities(self):
+        """Recompensa os operadores de cada filho pela melhoria relativa sobre o melhor pai."""
+        parents = self._parent_distances[1:]
+        rewards = np.maximum(0.0, (parents - self.population_distances[1:]) / parents)
+        self.crossover_selector.update(self._child_operators[1:, 0], rewards)
+        self.mutation_selector.update(self._child_operators[1:, 1], rewards)
+        self.operator_history.append({**self.crossover_selector.as_dict(), **self.mutation_selector.as_dict()})
+
+    def _draw_operators(self, n_pairs):
+        """
+        Sorteia (crossover, mutação) de cada par na seleção adaptativa; None com taxas fixas.
+
+        Os crossovers são `adaptive_crossovers` + "clone" (cópia de um pai) e as
+        mutações, todas as de `MUTATION_OPERATORS`.
+        """
+        if self.crossover_selector is None:
+            return None
+        return np.column_stack((self.crossover_selector.select(n_pairs),
+                                self.mutation_selector.select(n_pairs))).tolist()
+
+    def _select_parents(self, n_pairs):
+        """
+        Sorteia `n_pairs` pares de pais e o crossover de cada par.
+
+        O crossover de cada par ("clone" = cópia de um pai) é decidido antes de
+        gerar qualquer filho, para que o OX seja aplicado de uma vez
+        (`order_crossover_batch`) só nos pares que o usam; os demais
+        operadores geram cada filho no laço de `step()`.
+
+        Returns:
+            tuple: (lista de pares de índices, crossover de cada par, operadores
+            sorteados por `_draw_operators`, filhos do OX ou None). A linha i dos
+            filhos do OX só é preenchida se o par i usa o OX.
+        """
+        clock = self._clock
+        start = clock()
+        indices = select_parent_indices(self.population_fitness, 2 * n_pairs, self.selection, self.tournament_size,
+                                        self.selection_pressure, self.tournament_replacement).reshape(n_pairs, 2)
+        operators = self._draw_operators(n_pairs)
+        if operators is None:
+            crossed = np.random.random(n_pairs) < self.crossover_probability
+            crossovers = [self.crossover if is_crossed else "clone" for is_crossed in crossed.tolist()]
+        else:
+            crossover_pool = self._crossover_pool()
+            crossovers = [crossover_pool[crossover_index] for crossover_index, _ in operators]
+        selected = clock()
+        offspring = None
+        ox_pairs = [pair for pair, crossover in enumerate(crossovers) if crossover == "ox"]
+        if ox_pairs:
+            offspring = np.empty((n_pairs, self.population.shape[1]), dtype=self.population.dtype)
+            ox_parents = indices[ox_pairs]
+            offspring[ox_pairs] = order_crossover_batch(self.population[ox_parents[:, 0]],
+                                                        self.population[ox_parents[:, 1]])
+        self.record_time("selection", selected - start)
+        self.record_time("crossover", clock() - selected)
+        return indices.tolist(), crossovers, operators, offspring
+
+    def step(self):
+        """
+        Gera a próxima geração (elitismo + seleção + crossover + mutação) e a avalia.
+
+        Filhos que são cópias de um pai não são reavaliados: a distância do pai
+        é ajustada pelo delta da mutação, calculado só com as arestas
+        alteradas. Apenas os filhos de crossover passam pela avaliação
+        completa. Com `local_search="offspring"`, os primeiros
+        `local_search_budget` filhos passam por 2-opt; com "elite", as
+        melhores rotas da população atual (`_improve_elite`).
+        """
+        clock = self._clock
+        if self.local_search == "elite":
+            start = clock()
+            self._improve_elite()
+            self.record_time("local_search", clock() - start)
+        improve_offspring = self.local_search_budget if self.local_search == "offspring" else 0
+
+        population, next_population = self.population, self.next_population
+        population_distances, next_distances = self.population_distances, self.next_distances
+
+        best_index = self.sorted_indices[0]
+        next_population[0] = population[best_index]
+        next_distances[0] = population_distances[best_index]
+        seen_tours = {tour_key(next_population[0]): 1}
+        n_filled = 1
+        parent_pairs, crossovers, operators, offspring = self._select_parents(self.population_size - 1)
+        n_used = 0
+        # Tempos do laço somados localmente e registrados uma vez por geração
+        crossover_time = mutation_time = search_time = duplicates_time = 0
+        while n_filled < self.population_size:
+            if n_used == len(parent_pairs):
+                # Filhos rejeitados como duplicatas consomem pares extras
+                parent_pairs, crossovers, operators, offspring = self._select_parents(self.population_size - n_filled)
+                n_used = 0
+            parent1, parent2 = parent_pairs[n_used]
+            crossover = crossovers[n_used]
+            if operators is None:
+                mutation, mutation_probability = self.mutation, self.mutation_probability
+            else:
+                mutation, mutation_probability = MUTATION_OPERATORS[operators[n_used][1]], 1.0
+            n_used += 1
+            child = next_population[n_filled]
+            started = clock()
+            if crossover == "clone":
+                parent = parent1 if random.random() < 0.5 else parent2
+                child[:] = population[parent]
+                self._child_distance = population_distances[parent]
+            else:
+                if crossover == "ox":
+                    child[:] = offspring[n_used - 1]
+                else:
+                    crossover_into(crossover, population[parent1], population[parent2], child,
+                                   self._crossover_distances, self._neighbors)
+                self._child_distance = np.nan
+            crossed = clock()
+
+            self._child_distance += self._mutate(child, mutation, mutation_probability)
+            mutated = clock()
+            if improve_offspring > 0:
+                self._child_distance -= self.local_searcher.improve(child)
+                improve_offspring -= 1
+            searched = clock()
+            # A linha só é "aceita" se passar pela política de duplicatas
+            accepted = register_child(child, seen_tours, self.duplicate_policy, self.max_duplicate_copies,
+                                      mutate=self._mutate_duplicate)
+            checked = clock()
+            crossover_time += crossed - started
+            mutation_time += mutated - crossed
+            search_time += searched - mutated
+            duplicates_time += checked - searched
+            if accepted:
+                next_distances[n_filled] = self._child_distance
+                if operators is not None:
+                    self._child_operators[n_filled] = operators[n_used - 1]
+                    self._parent_distances[n_filled] = min(population_distances[parent1],
+                                                           population_distances[parent2])
+                n_filled += 1
+
+        self.record_time("crossover", crossover_time)
+        self.record_time("mutation", mutation_time)
+        self.record_time("local_search", search_time)
+        self.record_time("duplicates", duplicates_time)
+
+        self.population, self.next_population = next_population, population
+        self.next_distances = population_distances
+        self._evaluate(next_distances)
+        if self.crossover_selector is not None:
+            start = clock()
+            self._update_operator_probabilities()
+            self.record_time("adaptive", clock() - start)
+
+    def run(self, n_generations=None, convergence_generations=None, on_generation=None, budget=None,
+            reporter=None, handle_interrupt=False):
+        """
+        Executa gerações até esgotar o orçamento da execução.
+
+        Args:
+            n_generations (int, opcional): Número máximo de gerações (contando a inicial).
+            convergence_generations (int, opcional): Janela do critério de parada por estagnação.
+            on_generation (callable, opcional): Chamado como `on_generation(ga)` após cada geração;
+                se retornar True, a execução é interrompida.
+            budget (Budget, opcional): Limites de gerações, tempo, avaliações e
+                distância-alvo; substitui `n_generations` e `convergence_generations`.
+            reporter (AnytimeReporter, opcional): Registra a melhor rota em
+                intervalos fixos, além do início e do fim da execução.
+            handle_interrupt (bool): Se True, um Ctrl+C termina a geração em curso
+                e encerra a execução normalmente (`stop_reason` = "interrupted").
+
+        Returns:
+            GeneticAlgorithm: A própria instância, para encadear chamadas; a
+            melhor rota fica em `incumbent` e o motivo da parada em `stop_reason`.
+        """
+        if budget is None:
+            budget = Budget(n_generations, convergence_generations=convergence_generations)
+        budget.start()
+        if reporter is not None:
+            reporter.record(self)
+        self.stop_reason = budget.exhausted(self)
+        with deferred_interrupt(handle_interrupt) as interrupt:
+            while self.stop_reason is None:
+                self.step()
+                stop = on_generation is not None and on_generation(self)
+                self.end_generation_timing()
+                if reporter is not None:
+                    reporter.maybe_record(self)
+                if stop:
+                    self.stop_reason = "callback"
+                elif interrupt["interrupted"]:
+                    self.stop_reason = "interrupted"
+                else:
+                    self.stop_reason = budget.exhausted(self)
+        if reporter is not None:
+            reporter.record(self)
+        return self
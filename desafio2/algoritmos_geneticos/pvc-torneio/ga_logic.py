@@ -1,8 +1,13 @@
 # ga_logic.py
 
 import random
+from collections import OrderedDict
+
 import numpy as np
 
+# Tipo inteiro usado para armazenar as rotas na matriz da população.
+POPULATION_DTYPE = np.int32
+
 def create_initial_population(n_cities, pop_size):
     """Cria a população inicial de rotas aleatórias."""
     population = []
@@ -12,41 +17,473 @@ def create_initial_population(n_cities, pop_size):
         population.append(individual)
     return population
 
+def create_population_array(n_cities, pop_size):
+    """
+    Cria a população inicial como uma matriz (pop_size, n_cities) pré-alocada.
+
+    Cada linha é uma permutação aleatória das cidades. Os operadores
+    `*_into`/`*_inplace` escrevem diretamente nas linhas desta matriz.
+    """
+    return np.argsort(np.random.random((pop_size, n_cities)), axis=1).astype(POPULATION_DTYPE)
+
 def calculate_distance(city1, city2):
     """Calcula a distância euclidiana entre duas cidades."""
     return np.sqrt((city1[0] - city2[0])**2 + (city1[1] - city2[1])**2)
 
-def calculate_total_distance(path, cities):
+def build_distance_matrix(cities):
+    """Pré-calcula a matriz (N, N) de distâncias euclidianas entre todas as cidades."""
+    coords = np.asarray(cities, dtype=np.float64)
+    diff = coords[:, np.newaxis, :] - coords[np.newaxis, :, :]
+    return np.sqrt((diff ** 2).sum(axis=-1))
+
+# Cache da última matriz calculada. As cidades são criadas uma única vez por
+# simulação e a mesma lista é repassada a cada chamada, então basta comparar
+# a identidade do objeto para reaproveitar a matriz.
+_distance_matrix_cache = {"cities": None, "matrix": None}
+
+def get_distance_matrix(cities):
+    """Retorna a matriz de distâncias de `cities`, calculando-a só na primeira chamada."""
+    if _distance_matrix_cache["cities"] is not cities:
+        _distance_matrix_cache["matrix"] = build_distance_matrix(cities)
+        _distance_matrix_cache["cities"] = cities
+    return _distance_matrix_cache["matrix"]
+
+class FitnessCache:
+    """
+    Cache LRU com tamanho limitado para o comprimento das rotas.
+
+    As entradas são indexadas pela chave canônica da rota (`tour_key`), então
+    rotações e inversões da mesma rota compartilham a mesma entrada. Use um
+    cache por instância do problema (conjunto de cidades).
+    """
+
+    def __init__(self, maxsize=100_000):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._distances = OrderedDict()
+
+    def __len__(self):
+        return len(self._distances)
+
+    def get(self, key):
+        """Retorna a distância armazenada para `key` ou None, contabilizando acerto/falha."""
+        distance = self._distances.get(key)
+        if distance is None:
+            self.misses += 1
+            return None
+        self._distances.move_to_end(key)
+        self.hits += 1
+        return distance
+
+    def put(self, key, distance):
+        """Armazena a distância de `key`, descartando a entrada menos usada se necessário."""
+        self._distances[key] = distance
+        self._distances.move_to_end(key)
+        if len(self._distances) > self.maxsize:
+            self._distances.popitem(last=False)
+
+    def items(self):
+        """Retorna os pares (chave, distância), do menos para o mais usado recentemente."""
+        return list(self._distances.items())
+
+    def clear(self):
+        """Esvazia o cache e zera os contadores."""
+        self._distances.clear()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hit_rate(self):
+        """Fração das consultas atendidas pelo cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+def score_paths(paths, distance_matrix):
+    """Soma as arestas de cada linha de uma matriz (P, N) de rotas (gather-and-sum)."""
+    return distance_matrix[paths, np.roll(paths, -1, axis=1)].sum(axis=1)
+
+def calculate_population_distances(population, cities, cache=None, evaluator=None, keys=None):
+    """
+    Calcula o comprimento de todas as rotas da população de uma só vez.
+
+    A população é tratada como uma matriz de índices (P, N); cada aresta é
+    buscada na matriz de distâncias e as linhas são somadas.
+
+    Args:
+        population: Sequência de P rotas com N cidades cada (ou array (P, N)).
+        cities: Lista de coordenadas das cidades.
+        cache (FitnessCache, opcional): Se informado, só as rotas ausentes do
+            cache são avaliadas e o resultado delas é armazenado. Um cache de
+            tamanho 0 equivale a não ter cache (as chaves nem são calculadas).
+        evaluator (callable, opcional): Função `evaluator(paths) -> distâncias`
+            usada no lugar da matriz local (ex.: `SharedMemoryEvaluator`).
+        keys (list[bytes], opcional): Chaves canônicas das rotas, se já
+            calculadas; evita recalculá-las para consultar o cache.
+
+    Returns:
+        np.ndarray: Array (P,) com a distância total de cada rota.
+    """
+    paths = np.asarray(population, dtype=POPULATION_DTYPE if evaluator is not None else np.intp)
+    if paths.ndim == 1:
+        paths = paths[np.newaxis, :]
+    if evaluator is None:
+        distance_matrix = get_distance_matrix(cities)
+        evaluator = lambda missing_paths: score_paths(missing_paths, distance_matrix)
+    if cache is None or cache.maxsize == 0:
+        return evaluator(paths)
+
+    if keys is None:
+        keys = population_tour_keys(paths)
+    distances = np.empty(len(paths))
+    missing = []
+    for i, key in enumerate(keys):
+        distance = cache.get(key)
+        if distance is None:
+            missing.append(i)
+        else:
+            distances[i] = distance
+    if missing:
+        missing_paths = paths[missing]
+        missing_distances = evaluator(missing_paths)
+        distances[missing] = missing_distances
+        for i, distance in zip(missing, missing_distances):
+            cache.put(keys[i], float(distance))
+    return distances
+
+def calculate_population_fitness(population, cities, cache=None):
+    """Calcula a aptidão (inverso da distância) de todas as rotas da população."""
+    return 1 / (calculate_population_distances(population, cities, cache) + 1e-10)
+
+def calculate_total_distance(path, cities, cache=None):
     """Calcula o comprimento total de uma rota."""
-    distance = 0
-    for i in range(len(path)):
-        city1_index = path[i]
-        city2_index = path[(i + 1) % len(path)]
-        distance += calculate_distance(cities[city1_index], cities[city2_index])
-    return distance
-
-def calculate_fitness(path, cities):
+    return float(calculate_population_distances(path, cities, cache)[0])
+
+def calculate_fitness(path, cities, cache=None):
     """Calcula a aptidão de uma rota (inverso da distância total)."""
-    distance = calculate_total_distance(path, cities)
+    distance = calculate_total_distance(path, cities, cache)
     return 1 / (distance + 1e-10)
 
 def order_crossover(parent1, parent2):
-    """Realiza o crossover de ordem."""
+    """
+    Realiza o crossover de ordem.
+
+    Os genes do segmento copiado do pai 1 são marcados numa máscara de
+    visitados, então cada gene do pai 2 é testado em O(1) e o filho sai em O(N).
+    """
     size = len(parent1)
     start, end = sorted(random.sample(range(size), 2))
-    
-    child = [-1] * size
-    child[start:end+1] = parent1[start:end+1]
-    
-    current_index = 0
+
+    child = list(parent1)
+    visited = [False] * size
+    for gene in parent1[start:end+1]:
+        visited[gene] = True
+
+    # Posições fora do segmento, da esquerda para a direita, na ordem do pai 2
+    positions = iter(list(range(start)) + list(range(end + 1, size)))
     for gene in parent2:
-        if gene not in child:
-            while child[current_index] != -1:
-                current_index = (current_index + 1) % size
-            child[current_index] = gene
-            
+        if not visited[gene]:
+            child[next(positions)] = gene
+
     return child
 
+def order_crossover_into(parent1, parent2, out):
+    """
+    Realiza o crossover de ordem escrevendo o filho em `out`.
+
+    Equivalente a `order_crossover`, mas opera sobre arrays NumPy e preenche
+    uma linha já alocada da próxima população, sem criar listas intermediárias.
+    A máscara de visitados substitui o `np.isin` (que ordena os arrays).
+    `out` não pode compartilhar memória com os pais.
+    """
+    size = len(parent1)
+    start, end = sorted(random.sample(range(size), 2))
+
+    segment = parent1[start:end+1]
+    out[start:end+1] = segment
+
+    visited = np.zeros(size, dtype=bool)
+    visited[segment] = True
+    remaining = parent2[~visited[parent2]]
+    out[:start] = remaining[:start]
+    out[end+1:] = remaining[start:]
+    return out
+
+def order_crossover_batch(parents1, parents2, out=None):
+    """
+    Aplica o crossover de ordem a M pares de pais de uma só vez.
+
+    Cada linha sorteia seu próprio segmento [start, end]. Os genes do
+    segmento são marcados numa máscara (M, N) de visitados; os genes livres
+    do pai 2 são copiados, na ordem, para as posições fora do segmento com
+    uma única atribuição booleana (a contagem de genes livres e de posições
+    livres é a mesma em todas as linhas).
+
+    Args:
+        parents1, parents2: Matrizes (M, N) de rotas.
+        out (np.ndarray, opcional): Matriz (M, N) onde os filhos são escritos.
+
+    Returns:
+        np.ndarray: Matriz (M, N) com os filhos.
+    """
+    parents1 = np.asarray(parents1)
+    parents2 = np.asarray(parents2)
+    n_children, size = parents1.shape
+    if out is None:
+        out = np.empty_like(parents1)
+
+    # Dois pontos de corte distintos por linha, como em random.sample(range(size), 2)
+    first = np.random.randint(0, size, n_children)
+    second = np.random.randint(0, size - 1, n_children)
+    second += second >= first
+    starts = np.minimum(first, second)[:, np.newaxis]
+    ends = np.maximum(first, second)[:, np.newaxis]
+    positions = np.arange(size)
+    in_segment = (positions >= starts) & (positions <= ends)
+
+    visited = np.zeros((n_children, size), dtype=bool)
+    np.put_along_axis(visited, parents1, in_segment, axis=1)
+    free_genes = ~np.take_along_axis(visited, parents2, axis=1)
+
+    out[in_segment] = parents1[in_segment]
+    out[~in_segment] = parents2[free_genes]
+    return out
+
+def pmx_crossover_into(parent1, parent2, out):
+    """
+    Crossover parcialmente mapeado (PMX), escrevendo o filho em `out`.
+
+    O segmento [start, end] vem do pai 1; as demais posições recebem o gene
+    do pai 2 e, se ele já estiver no segmento, seguem o mapeamento
+    pai 1 -> pai 2 até encontrar um gene livre. O mapeamento é aplicado de
+    forma vetorizada a todas as posições em conflito ao mesmo tempo.
+    """
+    size = len(parent1)
+    start, end = sorted(random.sample(range(size), 2))
+    position1 = np.empty(size, dtype=np.intp)
+    position1[parent1] = np.arange(size)
+    in_segment = np.zeros(size, dtype=bool)
+    in_segment[parent1[start:end+1]] = True
+
+    genes = parent2.copy()
+    outside = np.ones(size, dtype=bool)
+    outside[start:end+1] = False
+    conflict = outside & in_segment[genes]
+    while conflict.any():
+        genes[conflict] = parent2[position1[genes[conflict]]]
+        conflict = outside & in_segment[genes]
+    out[:] = genes
+    out[start:end+1] = parent1[start:end+1]
+    return out
+
+def _adjacency(parent):
+    """Vizinhos (anterior, seguinte) de cada cidade na rota, como array (N, 2)."""
+    links = np.empty((len(parent), 2), dtype=np.intp)
+    links[parent, 0] = np.roll(parent, 1)
+    links[parent, 1] = np.roll(parent, -1)
+    return links
+
+def edge_recombination_crossover_into(parent1, parent2, out):
+    """
+    Crossover de recombinação de arestas (ERX), escrevendo o filho em `out`.
+
+    Monta a tabela com os vizinhos de cada cidade nos dois pais (até 4) e,
+    a partir da primeira cidade do pai 1, segue sempre para o vizinho ainda
+    não visitado com menos vizinhos livres (empates sorteados). Só quando a
+    cidade atual não tem vizinho livre é que uma cidade não adjacente entra
+    na rota, então quase todas as arestas do filho vêm de um dos pais.
+    """
+    size = len(parent1)
+    neighbors = [list(set(row)) for row in np.hstack((_adjacency(parent1), _adjacency(parent2))).tolist()]
+    degree = [len(row) for row in neighbors]
+    visited = [False] * size
+    unvisited = set(range(size))
+
+    current = int(parent1[0])
+    for i in range(size):
+        out[i] = current
+        visited[current] = True
+        unvisited.discard(current)
+        for city in neighbors[current]:
+            degree[city] -= 1
+        if i == size - 1:
+            break
+        candidates = [city for city in neighbors[current] if not visited[city]]
+        if candidates:
+            fewest = min(degree[city] for city in candidates)
+            current = random.choice([city for city in candidates if degree[city] == fewest])
+        else:
+            current = random.choice(tuple(unvisited))
+    return out
+
+def _ab_cycles(links1, links2):
+    """
+    Decompõe a união das arestas dos dois pais em ciclos AB.
+
+    Um ciclo AB alterna arestas do pai A e do pai B. As arestas comuns aos
+    dois pais são descartadas antes, pois só formariam ciclos inócuos.
+
+    Returns:
+        list: Ciclos como listas de cidades [c0, c1, ..., c0]; a aresta
+        (c0, c1) é de A e os tipos alternam a partir dela.
+    """
+    size = len(links1)
+    edges = ([list(row) for row in links1.tolist()], [list(row) for row in links2.tolist()])
+    for city in range(size):
+        for other in links1[city]:
+            if other in edges[1][city] and other in edges[0][city]:
+                edges[0][city].remove(other)
+                edges[1][city].remove(other)
+
+    cycles = []
+    starts = [city for city in range(size) if edges[0][city]]
+    random.shuffle(starts)
+    for start in starts:
+        while edges[0][start]:
+            path, types = [start], []
+            current, edge_type = start, 0
+            while True:
+                options = edges[edge_type][current]
+                if not options:
+                    break
+                following = random.choice(options)
+                options.remove(following)
+                edges[edge_type][following].remove(current)
+                path.append(following)
+                types.append(edge_type)
+                edge_type ^= 1
+                current = following
+                # Fecha um ciclo se `current` já apareceu saindo por uma aresta do tipo da próxima
+                closing = next((j for j in range(len(path) - 2, -1, -1)
+                                if path[j] == current and types[j] == edge_type), None)
+                if closing is not None:
+                    cycle = path[closing:]
+                    if types[closing] == 1:
+                        # Gira o ciclo para que ele comece por uma aresta de A
+                        cycle = cycle[1:] + [cycle[1]]
+                    cycles.append(cycle)
+                    path, types = path[:closing + 1], types[:closing]
+                    if len(path) == 1:
+                        break
+    return cycles
+
+def _subtours(adjacency):
+    """Rótulo do subciclo de cada cidade num grafo em que todas têm grau 2."""
+    size = len(adjacency)
+    labels = [-1] * size
+    n_labels = 0
+    for start in range(size):
+        if labels[start] >= 0:
+            continue
+        previous, current = -1, start
+        while labels[current] < 0:
+            labels[current] = n_labels
+            a, b = adjacency[current]
+            previous, current = current, (a if a != previous else b)
+        n_labels += 1
+    return labels, n_labels
+
+def eax_crossover_into(parent1, parent2, out, distance_matrix, neighbor_lists=None):
+    """
+    Crossover de montagem de arestas (EAX) simplificado, escrevendo o filho em `out`.
+
+    1. As arestas dos dois pais são decompostas em ciclos AB (alternando
+       arestas de A = pai 1 e B = pai 2).
+    2. Um ciclo AB sorteado é aplicado ao pai 1: suas arestas de A saem e
+       as de B entram, o que em geral divide a rota em subciclos.
+    3. Os subciclos são unidos gulosamente: o menor é ligado a outro pela
+       troca de duas arestas mais barata, procurando só entre os vizinhos
+       próximos (`neighbor_lists`) ou entre todas as cidades.
+
+    O filho herda quase todas as arestas dos pais e as novas são curtas,
+    por isso o EAX chega a rotas boas com bem menos avaliações que o OX.
+    """
+    size = len(parent1)
+    links1 = _adjacency(parent1)
+    cycles = _ab_cycles(links1, _adjacency(parent2))
+    if not cycles:
+        out[:] = parent1
+        return out
+
+    adjacency = links1.tolist()
+    cycle = random.choice(cycles)
+    for i in range(len(cycle) - 1):
+        a, b = cycle[i], cycle[i + 1]
+        if i % 2 == 0:
+            adjacency[a].remove(b)
+            adjacency[b].remove(a)
+        else:
+            adjacency[a].append(b)
+            adjacency[b].append(a)
+
+    distances = distance_matrix
+    labels, n_subtours = _subtours(adjacency)
+    members = [[] for _ in range(n_subtours)]
+    for city, label in enumerate(labels):
+        members[label].append(city)
+    alive = set(range(n_subtours))
+    while len(alive) > 1:
+        smallest = min(alive, key=lambda label: len(members[label]))
+        best = None
+        for u in members[smallest]:
+            candidates = neighbor_lists[u] if neighbor_lists is not None else range(size)
+            for v in candidates:
+                if labels[v] == smallest:
+                    continue
+                for u_next in adjacency[u]:
+                    removed_u = distances[u][u_next]
+                    for v_next in adjacency[v]:
+                        removed = removed_u + distances[v][v_next]
+                        # Liga (u, v) + (u_next, v_next) ou (u, v_next) + (u_next, v)
+                        for a, b in ((v, v_next), (v_next, v)):
+                            cost = distances[u][a] + distances[u_next][b] - removed
+                            if best is None or cost < best[0]:
+                                best = (cost, u, u_next, v, v_next, a, b)
+        if best is None:
+            # Nenhum vizinho fora do subciclo: procura entre todas as cidades
+            neighbor_lists = None
+            continue
+        _, u, u_next, v, v_next, a, b = best
+        adjacency[u].remove(u_next)
+        adjacency[u_next].remove(u)
+        adjacency[v].remove(v_next)
+        adjacency[v_next].remove(v)
+        adjacency[u].append(a)
+        adjacency[a].append(u)
+        adjacency[u_next].append(b)
+        adjacency[b].append(u_next)
+        target = labels[v]
+        for city in members[smallest]:
+            labels[city] = target
+        members[target].extend(members[smallest])
+        alive.discard(smallest)
+
+    previous, current = -1, int(parent1[0])
+    for i in range(size):
+        out[i] = current
+        a, b = adjacency[current]
+        previous, current = current, (a if a != previous else b)
+    return out
+
+CROSSOVER_OPERATORS = ("ox", "pmx", "erx", "eax")
+
+def crossover_into(operator, parent1, parent2, out, distance_matrix=None, neighbor_lists=None):
+    """
+    Aplica o crossover `operator` (um de `CROSSOVER_OPERATORS`) escrevendo o filho em `out`.
+
+    `distance_matrix` (lista de listas ou array) e `neighbor_lists` só são
+    usados pelo EAX.
+    """
+    if operator == "ox":
+        return order_crossover_into(parent1, parent2, out)
+    if operator == "pmx":
+        return pmx_crossover_into(parent1, parent2, out)
+    if operator == "erx":
+        return edge_recombination_crossover_into(parent1, parent2, out)
+    if operator == "eax":
+        return eax_crossover_into(parent1, parent2, out, distance_matrix, neighbor_lists)
+    raise ValueError(f"Operador de crossover desconhecido: {operator!r}")
+
 def swap_mutation(individual, mutation_prob):
     """Aplica mutação por troca de genes."""
     mutated_individual = list(individual)
@@ -55,12 +492,23 @@ def swap_mutation(individual, mutation_prob):
         mutated_individual[idx1], mutated_individual[idx2] = mutated_individual[idx2], mutated_individual[idx1]
     return tuple(mutated_individual)
 
-# Adicione esta função auxiliar dentro de run_simulation():
+def swap_mutation_inplace(individual, mutation_prob):
+    """Aplica a mutação por troca diretamente no array. Retorna True se houve mutação."""
+    if random.random() < mutation_prob:
+        idx1, idx2 = random.sample(range(len(individual)), 2)
+        individual[idx1], individual[idx2] = individual[idx2], individual[idx1]
+        return True
+    return False
+
 def select_parent_by_tournament(population, population_fitness, k):
     """Seleciona um pai usando o método de Seleção por Torneio (k participantes)."""
+    return population[select_parent_index_by_tournament(population_fitness, k)]
+
+def select_parent_index_by_tournament(population_fitness, k):
+    """Igual a `select_parent_by_tournament`, mas retorna o índice do vencedor."""
     
     # 1. Seleciona K índices aleatórios de toda a população
-    participants_indices = random.sample(range(len(population)), k)
+    participants_indices = random.sample(range(len(population_fitness)), k)
     
     best_fitness_found = -1 # Fitness é sempre positivo (inverso da distância)
     winner_index = -1
@@ -71,9 +519,163 @@ def select_parent_by_tournament(population, population_fitness, k):
         if current_fitness > best_fitness_found:
             best_fitness_found = current_fitness
             winner_index = index
-            
-    # Retorna o indivíduo (rota) vencedor
-    return population[winner_index]
+
+    return winner_index
+
+def select_parent_indices_by_tournament(population_fitness, n_parents, k, pressure=1.0, replace=True):
+    """
+    Realiza `n_parents` torneios de uma vez e retorna os índices dos vencedores.
+
+    Todos os participantes são sorteados numa única matriz (n_parents, k) e o
+    vencedor de cada linha sai de um `argmax` sobre o array de fitness, sem
+    laço Python por pai.
+
+    Args:
+        population_fitness (np.ndarray): Fitness (P,) da população.
+        n_parents (int): Número de torneios (ex.: 2·P para uma geração inteira).
+        k (int): Participantes por torneio.
+        pressure (float): Probabilidade (0 a 1] de o melhor participante vencer.
+            Com pressure < 1 o torneio é probabilístico: o i-ésimo melhor vence
+            com probabilidade pressure·(1 - pressure)^i (o pior fica com o resto).
+        replace (bool): Se False, os participantes de cada torneio são distintos.
+
+    Returns:
+        np.ndarray: Array (n_parents,) com o índice de cada vencedor.
+    """
+    population_fitness = np.asarray(population_fitness)
+    pop_size = len(population_fitness)
+    if not replace and k > pop_size:
+        raise ValueError(f"Torneio sem reposição com k={k} maior que a população ({pop_size})")
+    if not replace and 2 * k > pop_size:
+        # Mais da metade da população por torneio: as k menores chaves aleatórias de
+        # cada linha; o custo O(P) por linha já é O(k)
+        participants = np.argpartition(np.random.random((n_parents, pop_size)), k - 1, axis=1)[:, :k]
+    else:
+        participants = np.random.randint(0, pop_size, size=(n_parents, k))
+    if not replace and 2 * k <= pop_size:
+        # Sorteia de novo só as posições repetidas, e só nas linhas que as têm; cada
+        # novo sorteio repete com probabilidade < 1/2, então o custo fica em O(n_parents·k log k)
+        rows = np.arange(n_parents)
+        while len(rows):
+            block = participants[rows]
+            order = np.argsort(block, axis=1, kind='stable')
+            ordered = np.take_along_axis(block, order, axis=1)
+            repeated_rows, repeated_columns = np.nonzero(ordered[:, 1:] == ordered[:, :-1])
+            redrawn = np.random.randint(0, pop_size, size=len(repeated_rows))
+            participants[rows[repeated_rows], order[repeated_rows, repeated_columns + 1]] = redrawn
+            rows = rows[np.unique(repeated_rows)]
+
+    fitness = population_fitness[participants]
+    rows = np.arange(n_parents)
+    if pressure >= 1.0:
+        return participants[rows, np.argmax(fitness, axis=1)]
+    ranks = np.minimum(np.random.geometric(pressure, size=n_parents) - 1, k - 1)
+    order = np.argsort(-fitness, axis=1, kind='stable')
+    return participants[rows, order[rows, ranks]]
+
+# --- Seleção proporcional ao fitness ---
+
+SELECTION_METHODS = ("tournament", "roulette", "sus", "rank")
+# Pressão seletiva padrão de cada método (a roleta e a SUS não usam)
+DEFAULT_SELECTION_PRESSURE = {"tournament": 1.0, "roulette": None, "sus": None, "rank": 1.5}
+
+def build_alias_table(weights):
+    """
+    Monta a tabela do método alias (Vose) para sortear índices com probabilidade proporcional a `weights`.
+
+    Returns:
+        tuple: (prob, alias), arrays (P,) usados por `sample_alias`.
+    """
+    weights = np.asarray(weights, dtype=np.float64)
+    n = len(weights)
+    scaled = weights * (n / weights.sum())
+    prob = np.ones(n)
+    alias = np.arange(n)
+    small = [i for i in range(n) if scaled[i] < 1.0]
+    large = [i for i in range(n) if scaled[i] >= 1.0]
+    while small and large:
+        less, more = small.pop(), large.pop()
+        prob[less] = scaled[less]
+        alias[less] = more
+        scaled[more] -= 1.0 - scaled[less]
+        (small if scaled[more] < 1.0 else large).append(more)
+    return prob, alias
+
+def sample_alias(prob, alias, n_samples):
+    """Sorteia `n_samples` índices em O(1) cada a partir de uma tabela de `build_alias_table`."""
+    columns = np.random.randint(0, len(prob), size=n_samples)
+    keep = np.random.random(n_samples) < prob[columns]
+    return np.where(keep, columns, alias[columns])
+
+def select_parent_indices_by_roulette(weights, n_parents, method="cumsum"):
+    """
+    Seleção por roleta: sorteia `n_parents` índices com probabilidade proporcional a `weights`.
+
+    A distribuição é montada uma única vez (soma acumulada ou tabela alias)
+    e todos os pais da geração saem de uma chamada vetorizada.
+
+    Args:
+        weights (np.ndarray): Pesos não negativos (P,), ex.: o fitness da população.
+        n_parents (int): Número de índices sorteados.
+        method (str): "cumsum" (busca binária, O(log P) por sorteio) ou
+            "alias" (O(1) por sorteio, com montagem O(P) em Python).
+
+    Returns:
+        np.ndarray: Array (n_parents,) de índices.
+    """
+    if method == "alias":
+        return sample_alias(*build_alias_table(weights), n_parents)
+    if method != "cumsum":
+        raise ValueError(f"Método de roleta desconhecido: {method!r}")
+    cumulative = np.cumsum(weights, dtype=np.float64)
+    points = np.random.random(n_parents) * cumulative[-1]
+    return np.minimum(np.searchsorted(cumulative, points, side='right'), len(cumulative) - 1)
+
+def select_parent_indices_by_sus(weights, n_parents):
+    """
+    Amostragem estocástica universal (SUS).
+
+    Usa `n_parents` ponteiros igualmente espaçados sobre a roleta, com um
+    único deslocamento aleatório; cada indivíduo recebe o número esperado de
+    cópias com variância mínima. Os índices são embaralhados antes de
+    retornar, para que possam ser agrupados em pares.
+    """
+    cumulative = np.cumsum(weights, dtype=np.float64)
+    spacing = cumulative[-1] / n_parents
+    points = (np.random.random() + np.arange(n_parents)) * spacing
+    indices = np.minimum(np.searchsorted(cumulative, points, side='right'), len(cumulative) - 1)
+    return np.random.permutation(indices)
+
+def rank_weights(population_fitness, pressure=1.5):
+    """
+    Pesos da seleção por ranking linear.
+
+    O pior indivíduo recebe peso 2 - pressure e o melhor, `pressure`
+    (1 < pressure <= 2), independentemente da escala do fitness.
+    """
+    n = len(population_fitness)
+    ranks = np.empty(n)
+    ranks[np.argsort(population_fitness, kind='stable')] = np.arange(n)
+    return (2.0 - pressure) + 2.0 * (pressure - 1.0) * ranks / max(n - 1, 1)
+
+def select_parent_indices(population_fitness, n_parents, method="tournament", k=10, pressure=1.0,
+                          replace=True, roulette="cumsum"):
+    """
+    Seleciona `n_parents` índices de pais com o método escolhido em `SELECTION_METHODS`.
+
+    `k` e `replace` valem para o torneio; `pressure` é a probabilidade de o
+    melhor vencer o torneio ou, no ranking, o peso do melhor indivíduo;
+    `roulette` escolhe entre "cumsum" e "alias" na roleta e no ranking.
+    """
+    if method == "tournament":
+        return select_parent_indices_by_tournament(population_fitness, n_parents, k, pressure, replace)
+    if method == "roulette":
+        return select_parent_indices_by_roulette(population_fitness, n_parents, roulette)
+    if method == "sus":
+        return select_parent_indices_by_sus(population_fitness, n_parents)
+    if method == "rank":
+        return select_parent_indices_by_roulette(rank_weights(population_fitness, pressure), n_parents, roulette)
+    raise ValueError(f"Método de seleção desconhecido: {method!r}")
 
 def reverse_mutation(individual: tuple, mutation_probability: float) -> tuple:
     """
@@ -109,3 +711,189 @@ def reverse_mutation(individual: tuple, mutation_probability: float) -> tuple:
     
     return individual
 
+def reverse_mutation_inplace(individual, mutation_probability):
+    """
+    Aplica a Mutação por Inversão diretamente no array da rota.
+
+    Mesmo sorteio de `reverse_mutation`, sem converter para lista/tupla.
+
+    Returns:
+        bool: True se o segmento foi invertido.
+    """
+    if random.random() < mutation_probability:
+        n = len(individual)
+        start_index = random.randint(0, n - 1)
+        end_index = random.randint(start_index, n - 1)
+        individual[start_index : end_index + 1] = individual[start_index : end_index + 1][::-1]
+        return True
+    return False
+
+# --- Avaliação incremental (delta) das mutações ---
+
+def swap_delta(individual, idx1, idx2, distance_matrix):
+    """
+    Variação no comprimento da rota ao trocar as cidades das posições idx1 e idx2.
+
+    Só as (até quatro) arestas ligadas às duas posições são consultadas, O(1).
+    """
+    n = len(individual)
+    i, j = min(idx1, idx2), max(idx1, idx2)
+    if i == j:
+        return 0.0
+    if i == 0 and j == n - 1:
+        # Vizinhas pela aresta que fecha o ciclo: trata como o par (j, i)
+        i, j = j, i
+    a, b = individual[i], individual[j]
+    prev_a, next_b = individual[i - 1], individual[(j + 1) % n]
+    d = distance_matrix
+    if (j - i) % n == 1:
+        return d[prev_a, b] + d[a, next_b] - d[prev_a, a] - d[b, next_b]
+    next_a, prev_b = individual[(i + 1) % n], individual[j - 1]
+    return (d[prev_a, b] + d[b, next_a] + d[prev_b, a] + d[a, next_b]
+            - d[prev_a, a] - d[a, next_a] - d[prev_b, b] - d[b, next_b])
+
+def reverse_delta(individual, start_index, end_index, distance_matrix):
+    """
+    Variação no comprimento da rota ao inverter o trecho [start_index, end_index].
+
+    Apenas as duas arestas das bordas do trecho mudam, O(1).
+    """
+    n = len(individual)
+    if end_index - start_index + 1 >= n - 1 or start_index == end_index:
+        return 0.0
+    first, last = individual[start_index], individual[end_index]
+    before, after = individual[start_index - 1], individual[(end_index + 1) % n]
+    d = distance_matrix
+    return d[before, last] + d[first, after] - d[before, first] - d[last, after]
+
+def swap_mutation_delta(individual, mutation_prob, distance_matrix):
+    """
+    Aplica a mutação por troca in-place e retorna a variação no comprimento da rota.
+
+    Returns:
+        float: Nova distância - distância anterior (0.0 se não houve mutação).
+    """
+    if random.random() < mutation_prob:
+        idx1, idx2 = random.sample(range(len(individual)), 2)
+        delta = swap_delta(individual, idx1, idx2, distance_matrix)
+        individual[idx1], individual[idx2] = individual[idx2], individual[idx1]
+        return float(delta)
+    return 0.0
+
+def reverse_mutation_delta(individual, mutation_probability, distance_matrix):
+    """
+    Aplica a Mutação por Inversão in-place e retorna a variação no comprimento da rota.
+
+    Returns:
+        float: Nova distância - distância anterior (0.0 se não houve mutação).
+    """
+    if random.random() < mutation_probability:
+        n = len(individual)
+        start_index = random.randint(0, n - 1)
+        end_index = random.randint(start_index, n - 1)
+        delta = reverse_delta(individual, start_index, end_index, distance_matrix)
+        individual[start_index : end_index + 1] = individual[start_index : end_index + 1][::-1]
+        return float(delta)
+    return 0.0
+
+def neighbor_reverse_mutation_delta(individual, mutation_probability, distance_matrix, neighbor_lists):
+    """
+    Inversão guiada por vizinhos: liga uma cidade sorteada a um dos seus vizinhos próximos.
+
+    Sorteia a posição i (cidade a) e uma cidade c entre os vizinhos de `a` em
+    `neighbor_lists`; inverte o trecho entre as duas de modo que a aresta
+    (a, c) passe a existir. É o movimento 2-opt restrito às listas de
+    candidatos, aplicado in-place e avaliado pelo delta.
+
+    Returns:
+        float: Nova distância - distância anterior (0.0 se não houve mutação).
+    """
+    if random.random() < mutation_probability:
+        i = random.randrange(len(individual))
+        candidates = neighbor_lists[individual[i]]
+        j = int(np.flatnonzero(individual == candidates[random.randrange(len(candidates))])[0])
+        # j > i: a ... c vira a c ...; j < i: c ... a vira c a ...
+        start_index, end_index = (i + 1, j) if j > i else (j + 1, i)
+        delta = reverse_delta(individual, start_index, end_index, distance_matrix)
+        individual[start_index : end_index + 1] = individual[start_index : end_index + 1][::-1]
+        return float(delta)
+    return 0.0
+
+# --- Detecção de rotas duplicadas ---
+
+DUPLICATE_POLICIES = ("reject", "mutate", "allow")
+
+def canonical_tour(path):
+    """
+    Retorna a forma canônica de uma rota, invariante a rotação e sentido.
+
+    A rota é girada para começar na cidade 0 e, entre os dois sentidos
+    possíveis, é escolhido aquele cujo segundo elemento é o menor.
+    """
+    path = np.asarray(path, dtype=POPULATION_DTYPE)
+    start = int(np.flatnonzero(path == 0)[0])
+    canonical = np.roll(path, -start)
+    if len(canonical) > 2 and canonical[1] > canonical[-1]:
+        canonical[1:] = canonical[:0:-1].copy()
+    return canonical
+
+def tour_key(path):
+    """Chave hashable (bytes) da forma canônica da rota, usada em sets e caches."""
+    return canonical_tour(path).tobytes()
+
+def population_tour_keys(population):
+    """Calcula as chaves canônicas de todas as linhas de uma matriz (P, N) de rotas."""
+    paths = np.asarray(population, dtype=POPULATION_DTYPE)
+    n_individuals, n_cities = paths.shape
+    starts = np.argmax(paths == 0, axis=1)
+    columns = (starts[:, np.newaxis] + np.arange(n_cities)) % n_cities
+    canonical = paths[np.arange(n_individuals)[:, np.newaxis], columns]
+    if n_cities > 2:
+        flip = canonical[:, 1] > canonical[:, -1]
+        canonical[flip, 1:] = canonical[flip, :0:-1]
+    return [row.tobytes() for row in canonical]
+
+def register_child(child, seen_tours, policy="reject", max_copies=1, mutate=None, max_mutations=10, key=None):
+    """
+    Decide se um filho entra na próxima geração, conforme a política de duplicatas.
+
+    As rotas já aceitas na geração ficam em `seen_tours` (chave canônica ->
+    número de cópias), o que torna a verificação O(1) em vez de uma busca
+    linear na população.
+
+    Args:
+        child: Rota candidata (array). Pode ser alterada in-place na política "mutate".
+        seen_tours (dict): Rotas já aceitas nesta geração; é atualizado se o filho entrar.
+        policy (str): "reject" descarta duplicatas, "mutate" aplica `mutate(child)`
+            até obter uma rota inédita (no máximo `max_mutations` vezes) e
+            "allow" aceita até `max_copies` cópias de cada rota.
+        max_copies (int): Limite de cópias da mesma rota na política "allow".
+        mutate: Função que altera `child` in-place (obrigatória em "mutate").
+        max_mutations (int): Tentativas de mutação antes de descartar o filho.
+        key (bytes, opcional): Chave canônica de `child`, se já calculada
+            (ex.: por `population_tour_keys` para um bloco de filhos).
+
+    Returns:
+        bytes | None: A chave canônica do filho, se ele foi aceito (a rota
+        pode ter mudado na política "mutate"); None se foi descartado.
+    """
+    if policy not in DUPLICATE_POLICIES:
+        raise ValueError(f"Política de duplicatas desconhecida: {policy!r}")
+
+    if key is None:
+        key = tour_key(child)
+    if policy == "mutate" and key in seen_tours:
+        for _ in range(max_mutations):
+            mutate(child)
+            key = tour_key(child)
+            if key not in seen_tours:
+                break
+        else:
+            return None
+
+    copies = seen_tours.get(key, 0)
+    limit = max_copies if policy == "allow" else 1
+    if copies >= limit:
+        return None
+    seen_tours[key] = copies + 1
+    return key
@@ -0,0 +1,204 @@
+# island_model.py
+
+import argparse
+import multiprocessing
+import random
+import time
+import numpy as np
+
+from ga_engine import GeneticAlgorithm
+from ga_logic import FitnessCache
+from config import (N_CITIES, POPULATION_SIZE, N_GENERATIONS, MUTATION_PROBABILITY, CROSSOVER_PROBABILITY,
+                    TOURNAMENT_SIZE, DUPLICATE_POLICY, MAX_DUPLICATE_COPIES, FITNESS_CACHE_SIZE, create_cities)
+
+# --- Parâmetros do Modelo de Ilhas ---
+N_ISLANDS = 4
+MIGRATION_INTERVAL = 20  # Gerações entre migrações
+N_MIGRANTS = 5  # Melhores indivíduos enviados por ilha a cada migração
+TOPOLOGY = "ring"  # "ring" ou "random"
+
+TOPOLOGIES = ("ring", "random")
+
+# Cidades e cache de avaliação de cada processo do pool, criados uma única vez
+# pelo inicializador. Manter o mesmo objeto de cidades permite que o cache da
+# matriz de distâncias seja reaproveitado em todas as épocas executadas pelo
+# processo; as listas de vizinhos, montadas na primeira época, também ficam.
+_worker_cities = None
+_worker_state = {"fitness_cache": None, "neighbor_lists": None}
+
+def _init_worker(cities_locations, fitness_cache_size):
+    global _worker_cities
+    _worker_cities = cities_locations
+    _worker_state["fitness_cache"] = FitnessCache(fitness_cache_size)
+
+def _evolve_island(task):
+    """
+    Evolui uma ilha por `n_generations` gerações dentro de um processo do pool.
+
+    Returns:
+        tuple: (island_id, população ordenada da melhor para a pior, distâncias
+        ordenadas, histórico da melhor distância na época).
+    """
+    island_id, population, distances, n_generations, seed, ga_params = task
+    random.seed(seed)
+    np.random.seed(seed)
+
+    # As distâncias vêm junto com a população (None só na primeira época), então
+    # o AG da época começa sem reavaliar ninguém
+    ga = GeneticAlgorithm(_worker_cities, initial_population=population, initial_distances=distances,
+                          neighbor_lists=_worker_state["neighbor_lists"],
+                          fitness_cache=_worker_state["fitness_cache"], **ga_params)
+    _worker_state["neighbor_lists"] = ga.neighbor_lists
+    for _ in range(n_generations):
+        ga.step()
+    return (island_id, ga.sorted_population(), ga.population_distances[ga.sorted_indices],
+            ga.best_distance_history)
+
+def migration_targets(n_islands, topology, rng):
+    """Retorna, para cada ilha de origem, a ilha de destino dos seus migrantes."""
+    if topology == "ring":
+        return [(i + 1) % n_islands for i in range(n_islands)]
+    if topology == "random":
+        return [rng.choice([j for j in range(n_islands) if j != i]) for i in range(n_islands)]
+    raise ValueError(f"Topologia desconhecida: {topology!r}")
+
+def migrate(populations, n_migrants, targets, distances=None):
+    """
+    Copia os `n_migrants` melhores de cada ilha sobre os piores da ilha de destino.
+
+    As populações devem estar ordenadas da melhor para a pior rota. Os
+    migrantes são copiados antes de qualquer substituição, então a ordem
+    das ilhas não influencia o resultado. Se `distances` (as distâncias de
+    cada ilha, na mesma ordem) for informado, elas migram junto com as rotas.
+    """
+    migrants = [population[:n_migrants].copy() for population in populations]
+    for source, target in enumerate(targets):
+        populations[target][-n_migrants:] = migrants[source]
+    if distances is not None:
+        migrant_distances = [island_distances[:n_migrants].copy() for island_distances in distances]
+        for source, target in enumerate(targets):
+            distances[target][-n_migrants:] = migrant_distances[source]
+
+def run_islands(cities_locations, n_islands=N_ISLANDS, island_population=POPULATION_SIZE // N_ISLANDS,
+                n_generations=N_GENERATIONS, migration_interval=MIGRATION_INTERVAL, n_migrants=N_MIGRANTS,
+                topology=TOPOLOGY, n_workers=None, seed=None, ga_params=None, on_epoch=None):
+    """
+    Executa o AG em K ilhas paralelas, com migração periódica dos melhores indivíduos.
+
+    Cada ilha roda o laço de `GeneticAlgorithm` (torneio + OX + inversão) em
+    um processo do pool por `migration_interval` gerações; depois, as ilhas
+    trocam seus melhores indivíduos segundo a topologia ("ring" ou "random").
+
+    Args:
+        cities_locations: Coordenadas das cidades.
+        n_islands (int): Número de ilhas (K).
+        island_population (int): Tamanho da população de cada ilha.
+        n_generations (int): Total de gerações de cada ilha.
+        migration_interval (int): Gerações entre migrações (M).
+        n_migrants (int): Indivíduos enviados por ilha em cada migração.
+        topology (str): "ring" (i -> i+1) ou "random" (destino sorteado a cada migração).
+        n_workers (int, opcional): Processos do pool (padrão: min(K, núcleos)).
+        seed (int, opcional): Semente para tornar a execução reprodutível.
+        ga_params (dict, opcional): Parâmetros extras repassados a `GeneticAlgorithm`.
+        on_epoch (callable, opcional): Chamado como `on_epoch(result)` após cada migração.
+
+    Returns:
+        dict: Melhor rota global, sua distância, estatísticas por ilha e o
+        histórico da melhor distância global por época.
+    """
+    if topology not in TOPOLOGIES:
+        raise ValueError(f"Topologia desconhecida: {topology!r}")
+    rng = random.Random(seed)
+    np_rng = np.random.default_rng(seed)
+    ga_params = dict(ga_params or {})
+    # O cache de avaliação é criado pelo inicializador de cada processo, não por ilha
+    fitness_cache_size = ga_params.pop("fitness_cache_size", FITNESS_CACHE_SIZE)
+    n_workers = n_workers or min(n_islands, multiprocessing.cpu_count())
+
+    n_cities = len(cities_locations)
+    populations = [np.argsort(np_rng.random((island_population, n_cities)), axis=1)
+                   for _ in range(n_islands)]
+    distances = [None] * n_islands
+    island_stats = [{"island": i, "best_distance": float('inf'), "avg_distance": float('inf'), "history": []}
+                    for i in range(n_islands)]
+    result = {"best_individual": None, "best_distance": float('inf'), "generation": 0,
+              "global_best_history": [], "islands": island_stats}
+
+    start = time.perf_counter()
+    with multiprocessing.Pool(n_workers, initializer=_init_worker,
+                              initargs=(cities_locations, fitness_cache_size)) as pool:
+        while result["generation"] < n_generations:
+            epoch_generations = min(migration_interval, n_generations - result["generation"])
+            tasks = [(i, populations[i], distances[i], epoch_generations, rng.getrandbits(32), ga_params)
+                     for i in range(n_islands)]
+            for island_id, population, island_distances, history in pool.imap_unordered(_evolve_island, tasks):
+                populations[island_id] = population
+                distances[island_id] = island_distances
+                stats = island_stats[island_id]
+                stats["best_distance"] = float(island_distances[0])
+                stats["avg_distance"] = float(np.mean(island_distances))
+                stats["history"].extend(history[1:])
+                if island_distances[0] < result["best_distance"]:
+                    result["best_distance"] = float(island_distances[0])
+                    result["best_individual"] = population[0].copy()
+
+            result["generation"] += epoch_generations
+            result["global_best_history"].append(result["best_distance"])
+            if on_epoch is not None:
+                on_epoch(result)
+
+            if result["generation"] < n_generations and n_migrants > 0:
+                migrate(populations, n_migrants, migration_targets(n_islands, topology, rng), distances)
+
+    result["elapsed"] = time.perf_counter() - start
+    return result
+
+def print_island_report(result):
+    """Exibe o melhor global e as estatísticas finais de cada ilha."""
+    print(f"{'Ilha':>4} | {'Melhor':>10} | {'Média':>10}")
+    for stats in result["islands"]:
+        print(f"{stats['island']:>4} | {stats['best_distance']:>10.2f} | {stats['avg_distance']:>10.2f}")
+    print(f"Melhor distância global: {result['best_distance']:.2f} após {result['generation']} gerações "
+          f"({result['elapsed']:.2f}s)")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="PCV com AG em modelo de ilhas (um processo por ilha).")
+    parser.add_argument("--islands", type=int, default=N_ISLANDS, help="número de ilhas (padrão: %(default)s)")
+    parser.add_argument("--population", type=int, default=POPULATION_SIZE // N_ISLANDS,
+                        help="população de cada ilha (padrão: %(default)s)")
+    parser.add_argument("--generations", type=int, default=N_GENERATIONS,
+                        help="gerações de cada ilha (padrão: %(default)s)")
+    parser.add_argument("--migration-interval", type=int, default=MIGRATION_INTERVAL,
+                        help="gerações entre migrações (padrão: %(default)s)")
+    parser.add_argument("--migrants", type=int, default=N_MIGRANTS,
+                        help="indivíduos enviados por ilha (padrão: %(default)s)")
+    parser.add_argument("--topology", choices=TOPOLOGIES, default=TOPOLOGY,
+                        help="topologia de migração (padrão: %(default)s)")
+    parser.add_argument("--workers", type=int, default=None, help="processos do pool (padrão: núcleos)")
+    parser.add_argument("--cities", type=int, default=N_CITIES, help="número de cidades (padrão: %(default)s)")
+    parser.add_argument("--seed", type=int, default=None, help="semente dos geradores aleatórios")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.seed is not None:
+        random.seed(args.seed)
+    cities_locations = create_cities(args.cities)
+    ga_params = {"mutation_probability": MUTATION_PROBABILITY,
+                 "crossover_probability": CROSSOVER_PROBABILITY,
+                 "tournament_size": TOURNAMENT_SIZE,
+                 "duplicate_policy": DUPLICATE_POLICY,
+                 "max_duplicate_copies": MAX_DUPLICATE_COPIES,
+                 "fitness_cache_size": FITNESS_CACHE_SIZE}
+
+    def log_epoch(result):
+        print(f"Geração {result['generation']}: melhor distância global {result['best_distance']:.2f}")
+
+    result = run_islands(cities_locations, n_islands=args.islands, island_population=args.population,
+                         n_generations=args.generations, migration_interval=args.migration_interval,
+                         n_migrants=args.migrants, topology=args.topology, n_workers=args.workers,
+                         seed=args.seed, ga_params=ga_params, on_epoch=log_epoch)
+    print_island_report(result)
+
+if __name__ == '__main__':
+    main()
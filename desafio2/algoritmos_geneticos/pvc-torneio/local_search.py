@@ -0,0 +1,137 @@
+# local_search.py
+
+from collections import deque
+import numpy as np
+
+from coordinate_distances import CoordinateDistances
+
+LOCAL_SEARCH_MODES = ("elite", "offspring")
+
+def build_neighbor_lists(distance_matrix, k):
+    """
+    Retorna, para cada cidade, as `k` cidades mais próximas em ordem crescente de distância.
+
+    Returns:
+        np.ndarray: Matriz (N, k) de índices.
+    """
+    n_cities = len(distance_matrix)
+    k = min(k, n_cities - 1)
+    distances = np.array(distance_matrix, dtype=np.float64)
+    np.fill_diagonal(distances, np.inf)
+    candidates = np.argpartition(distances, k - 1, axis=1)[:, :k]
+    order = np.argsort(np.take_along_axis(distances, candidates, axis=1), axis=1)
+    return np.take_along_axis(candidates, order, axis=1)
+
+class TwoOptLocalSearch:
+    """
+    Busca local 2-opt com listas de vizinhos candidatos e bits "don't look".
+
+    Para cada cidade `a` só são testados os movimentos que criam a aresta
+    (a, c) com `c` entre os k vizinhos mais próximos de `a`, e a busca para
+    assim que a aresta candidata já é mais longa que a aresta atual. Cidades
+    cujos arredores não mudaram ficam fora da fila ("don't look"), então cada
+    passada custa perto de O(N·k) em vez de O(N²).
+
+    As distâncias até os candidatos são guardadas junto com as listas, então
+    o laço de candidatos não consulta a matriz. Com uma `CoordinateDistances`
+    no lugar da matriz, as demais arestas são calculadas sob demanda.
+
+    Args:
+        distance_matrix: Matriz (N, N) de distâncias ou `CoordinateDistances`.
+        n_neighbors (int): Tamanho da lista de candidatos de cada cidade.
+        neighbor_lists (np.ndarray, opcional): Listas (N, k) já calculadas.
+        neighbor_distances (np.ndarray, opcional): Distâncias (N, k) até os candidatos.
+    """
+
+    def __init__(self, distance_matrix, n_neighbors=10, neighbor_lists=None, neighbor_distances=None):
+        if isinstance(distance_matrix, CoordinateDistances):
+            self.distances = distance_matrix
+        else:
+            distance_matrix = np.asarray(distance_matrix)
+            # Listas Python são bem mais rápidas que arrays NumPy para acessos escalares
+            self.distances = distance_matrix.tolist()
+        if neighbor_lists is None:
+            neighbor_lists = build_neighbor_lists(distance_matrix, n_neighbors)
+        neighbor_lists = np.asarray(neighbor_lists)
+        if neighbor_distances is None:
+            neighbor_distances = distance_matrix[np.arange(len(neighbor_lists))[:, np.newaxis], neighbor_lists]
+        self.neighbors = neighbor_lists.tolist()
+        self.neighbor_distances = np.asarray(neighbor_distances).tolist()
+
+    def improve(self, individual, max_moves=None):
+        """
+        Aplica 2-opt na rota até atingir um ótimo local (ou `max_moves` movimentos).
+
+        A rota (array NumPy) é modificada in-place.
+
+        Returns:
+            float: Redução obtida no comprimento da rota (>= 0).
+        """
+        dist = self.distances
+        neighbors = self.neighbors
+        neighbor_distances = self.neighbor_distances
+        tour = individual.tolist()
+        n = len(tour)
+        if n < 4:
+            return 0.0
+        pos = [0] * n
+        for i, city in enumerate(tour):
+            pos[city] = i
+
+        queue = deque(tour)
+        in_queue = [True] * n
+        gain = 0.0
+        moves = 0
+        while queue and (max_moves is None or moves < max_moves):
+            a = queue.popleft()
+            in_queue[a] = False
+            dist_a = dist[a]
+            for forward in (True, False):
+                i = pos[a]
+                b = tour[(i + 1) % n] if forward else tour[i - 1]
+                d_ab = dist_a[b]
+                improved = False
+                for c, d_ac in zip(neighbors[a], neighbor_distances[a]):
+                    if d_ac >= d_ab:
+                        break
+                    j = pos[c]
+                    d = tour[(j + 1) % n] if forward else tour[j - 1]
+                    if d == a:
+                        continue
+                    delta = d_ac + dist[b][d] - d_ab - dist[c][d]
+                    if delta < -1e-10:
+                        # forward: a b ... c d -> a c ... b d (inverte b..c)
+                        # backward: b a ... d c -> b d ... a c (inverte a..d)
+                        if forward:
+                            self._reverse(tour, pos, pos[b], pos[c])
+                        else:
+                            self._reverse(tour, pos, pos[a], pos[d])
+                        gain -= delta
+                        moves += 1
+                        for city in (a, b, c, d):
+                            if not in_queue[city]:
+                                in_queue[city] = True
+                                queue.append(city)
+                        improved = True
+                        break
+                if improved:
+                    break
+
+        individual[:] = tour
+        return gain
+
+    @staticmethod
+    def _reverse(tour, pos, i, j):
+        """Inverte, de forma cíclica, o trecho da rota entre as posições i e j (inclusive)."""
+        n = len(tour)
+        length = (j - i) % n + 1
+        if 2 * length > n:
+            # Inverter o complemento produz o mesmo ciclo e mexe em menos posições
+            i, j = (j + 1) % n, (i - 1) % n
+            length = n - length
+        for _ in range(length // 2):
+            city_i, city_j = tour[i], tour[j]
+            tour[i], tour[j] = city_j, city_i
+            pos[city_j], pos[city_i] = i, j
+            i = (i + 1) % n
+            j = (j - 1) % n
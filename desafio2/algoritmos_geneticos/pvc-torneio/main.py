@@ -1,101 +1,203 @@
 # main.py
 
-import itertools
-import pygame
+import argparse
 import sys
-import matplotlib.pyplot as plt
 import random
+import time
+from contextlib import nullcontext
 import numpy as np
 
 # Importar as funções dos módulos
-from ga_logic import create_initial_population, calculate_fitness, calculate_total_distance, order_crossover, swap_mutation,select_parent_by_tournament,reverse_mutation
-from visualization import setup_pygame_display, draw_all_elements, update_performance_plots_at_end
+from ga_engine import MUTATION_OPERATORS
+from steady_state import REPLACEMENT_POLICIES, create_genetic_algorithm
+from ga_logic import SELECTION_METHODS, CROSSOVER_OPERATORS
+from parallel_eval import SharedMemoryEvaluator
+from local_search import LOCAL_SEARCH_MODES
+from seeding import SEEDING_METHODS, create_seeded_population
+from checkpoint import save_checkpoint, load_checkpoint, restore_checkpoint
+from adaptive import ADAPTATION_SCHEMES
+from coordinate_distances import CoordinateDistances
+from profiling import PROFILERS, PhaseTimer, profile_block
+from budget import Budget, AnytimeReporter
+from config import (WIDTH, HEIGHT, N_CITIES, POPULATION_SIZE, N_GENERATIONS, MUTATION_PROBABILITY,
+                    CROSSOVER_PROBABILITY, TOURNAMENT_SIZE, DUPLICATE_POLICY, MAX_DUPLICATE_COPIES,
+                    FITNESS_CACHE_SIZE, create_cities)
 
 # --- Parâmetros ---
-WIDTH, HEIGHT = 1200, 1000
-N_CITIES = 80
-POPULATION_SIZE = 1000
-N_GENERATIONS = 800
-MUTATION_PROBABILITY = 0.1
-CROSSOVER_PROBABILITY = 0.95
 CONVERGENCE_GENERATIONS = 200
-TSP_DISPLAY_OFFSET = 60
-TOURNAMENT_SIZE = 10
-def run_simulation():
+CROSSOVER = "ox"  # "ox", "pmx", "erx" ou "eax"
+MUTATION = "reverse"  # "swap", "reverse", "neighbor" (inversão guiada por vizinhos) ou "none"
+ADAPTIVE = None  # None, "probability_matching" ou "adaptive_pursuit" (taxas e operadores adaptativos)
+SELECTION = "tournament"  # "tournament", "roulette", "sus" ou "rank"
+SELECTION_PRESSURE = None  # Torneio: chance de o melhor vencer (0 a 1); ranking: 1 a 2; None = padrão
+TOURNAMENT_REPLACEMENT = True  # Permite participantes repetidos no mesmo torneio
+STEADY_STATE = None  # None (AG geracional), "worst" ou "tournament" (AG estacionário e quem cada filho substitui)
+OFFSPRING_PER_STEP = None  # Filhos gerados por passo no AG estacionário (None = P/8)
+MATRIX_FREE_CACHE_SIZE = 0  # Cache sem matriz: rotas enormes quase nunca se repetem e cada chave ocupa 4·N bytes
+FPS = 30  # Taxa de atualização da tela; o AG roda na velocidade máxima
+N_EVAL_WORKERS = 0  # Processos para avaliar a população (0 = avaliação local)
+LOCAL_SEARCH = None  # None, "elite" ou "offspring" (AG memético com 2-opt)
+LOCAL_SEARCH_BUDGET = 10  # Rotas otimizadas por 2-opt a cada geração
+LOCAL_SEARCH_NEIGHBORS = 10  # Vizinhos candidatos por cidade no 2-opt
+SEED_FRACTION = 0.0  # Fração da população inicial criada por heurísticas construtivas
+CHECKPOINT_EVERY = 50  # Gerações entre checkpoints (quando --checkpoint é informado)
+TIME_LIMIT = None  # Segundos de execução (None = sem limite)
+MAX_EVALUATIONS = None  # Avaliações de rotas (None = sem limite)
+
+STOP_MESSAGES = {
+    "generations": "Limite de gerações atingido na Geração {generation}.",
+    "convergence": "Convergência detectada na Geração {generation}. Parando a simulação.",
+    "time_limit": "Limite de tempo atingido na Geração {generation}.",
+    "evaluations": "Limite de avaliações atingido na Geração {generation}.",
+    "target": "Distância-alvo atingida na Geração {generation}.",
+    "interrupted": "Execução interrompida na Geração {generation}; mantida a melhor rota encontrada.",
+}
+
+def build_genetic_algorithm(args, cities_locations, evaluator=None, initial_population=None, phase_timer=None):
+    """Cria o AG a partir dos argumentos de linha de comando."""
+    distance_matrix = CoordinateDistances(cities_locations) if args.matrix_free else None
+    if initial_population is None and args.seed_fraction > 0:
+        initial_population = create_seeded_population(cities_locations, args.population, args.seed_fraction,
+                                                      args.seed_methods, distance_matrix)
+    return create_genetic_algorithm(cities_locations,
+                                    replacement=args.steady_state,
+                                    offspring_per_step=args.offspring_per_step,
+                                    population_size=args.population,
+                                    mutation_probability=MUTATION_PROBABILITY,
+                                    crossover_probability=CROSSOVER_PROBABILITY,
+                                    tournament_size=TOURNAMENT_SIZE,
+                                    selection=args.selection,
+                                    crossover=args.crossover,
+                                    mutation=args.mutation,
+                                    adaptive=args.adaptive,
+                                    adaptive_crossovers=args.adaptive_crossovers,
+                                    selection_pressure=args.selection_pressure,
+                                    tournament_replacement=TOURNAMENT_REPLACEMENT,
+                                    duplicate_policy=DUPLICATE_POLICY,
+                                    max_duplicate_copies=MAX_DUPLICATE_COPIES,
+                                    fitness_cache_size=(MATRIX_FREE_CACHE_SIZE if args.matrix_free
+                                                        else FITNESS_CACHE_SIZE),
+                                    evaluator=evaluator,
+                                    distance_matrix=distance_matrix,
+                                    local_search=args.local_search,
+                                    local_search_budget=args.ls_budget,
+                                    local_search_neighbors=LOCAL_SEARCH_NEIGHBORS,
+                                    initial_population=initial_population,
+                                    phase_timer=phase_timer)
+
+def print_summary(ga, elapsed):
+    """Exibe o resultado final da execução no terminal."""
+    print(f"Melhor distância: {ga.incumbent_distance:.2f} após {ga.generation} gerações "
+          f"e {ga.evaluations} avaliações ({elapsed:.2f}s, {ga.generation / max(elapsed, 1e-9):.1f} gerações/s)")
+    cache = ga.fitness_cache
+    if cache.maxsize == 0:
+        print("Cache de avaliação: desativado")
+    else:
+        print(f"Cache de avaliação: {cache.hits} acertos, {cache.misses} falhas ({cache.hit_rate:.1%})")
+    if ga.operator_history:
+        probabilities = ", ".join(f"{name} {p:.0%}" for name, p in ga.operator_history[-1].items())
+        print(f"Probabilidades dos operadores: {probabilities}")
+
+def build_budget(args):
+    """Cria o orçamento da execução a partir dos argumentos de linha de comando."""
+    return Budget(args.generations, args.time_limit, args.max_evaluations, args.target_distance,
+                  CONVERGENCE_GENERATIONS)
+
+def print_report(record):
+    """Exibe um registro periódico da melhor rota (veja `AnytimeReporter`)."""
+    print(f"[{record['elapsed']:.1f}s] Geração {record['generation']}, {record['evaluations']} avaliações: "
+          f"melhor distância {record['best_distance']:.2f}")
+
+def print_stop_reason(ga):
+    if ga.stop_reason in STOP_MESSAGES:
+        print(STOP_MESSAGES[ga.stop_reason].format(generation=ga.generation))
+
+def maybe_checkpoint(ga, checkpoint_path, checkpoint_every, force=False):
+    """Salva um checkpoint a cada `checkpoint_every` gerações (ou sempre, com `force`)."""
+    if checkpoint_path and (force or (checkpoint_every and ga.generation % checkpoint_every == 0)):
+        start = time.perf_counter_ns()
+        save_checkpoint(checkpoint_path, ga)
+        ga.record_time("checkpoint", time.perf_counter_ns() - start)
+
+def run_headless(ga, budget, log_every=0, checkpoint_path=None, checkpoint_every=CHECKPOINT_EVERY, report_every=0):
+    """
+    Executa o AG em lote, sem pygame nem matplotlib, até esgotar `budget`.
+
+    Com `report_every`, a melhor rota até o momento é exibida a cada tantos
+    segundos. Um Ctrl+C termina a geração em curso, salva o checkpoint (se
+    houver) e exibe a melhor rota encontrada; um segundo Ctrl+C aborta.
+    """
+    def log_progress(ga):
+        if log_every and ga.generation % log_every == 0:
+            print(f"Geração {ga.generation}: melhor distância {ga.best_distance:.2f}")
+        maybe_checkpoint(ga, checkpoint_path, checkpoint_every)
+
+    reporter = AnytimeReporter(report_every, print_report) if report_every else None
+    start = time.perf_counter()
+    ga.run(on_generation=log_progress, budget=budget, reporter=reporter, handle_interrupt=True)
+    maybe_checkpoint(ga, checkpoint_path, checkpoint_every, force=True)
+    print_stop_reason(ga)
+    print_summary(ga, time.perf_counter() - start)
+    if ga.phase_timer is not None:
+        ga.phase_timer.print_summary()
+
+def run_simulation(ga, budget, fps=FPS, checkpoint_path=None, checkpoint_every=CHECKPOINT_EVERY):
+    """
+    Executa o AG com visualização, até esgotar `budget` ou a janela ser fechada.
+
+    O AG avança uma geração por iteração, sem esperar pela tela; o Pygame só
+    redesenha uma cópia da melhor rota atual quando passa o intervalo de um
+    quadro (1/fps segundos).
+    """
+    import pygame
+    from visualization import setup_pygame_display, draw_all_elements, update_performance_plots_at_end
+
     # Inicialização
     screen, clock = setup_pygame_display(WIDTH, HEIGHT)
-    cities_locations = [(random.randint(TSP_DISPLAY_OFFSET, WIDTH - TSP_DISPLAY_OFFSET),
-                         random.randint(TSP_DISPLAY_OFFSET, HEIGHT - TSP_DISPLAY_OFFSET))
-                        for _ in range(N_CITIES)]
-    
-    population = create_initial_population(N_CITIES, POPULATION_SIZE)
-    
-    # Listas para armazenar dados de performance
-    best_fitness_history = []
-    best_distance_history = []
-    avg_distance_history = []
-    
-    generation = 0
-    
+    frame_interval = 1.0 / fps
+    last_frame = float('-inf')
+    start = time.perf_counter()
+    budget.start()
+    ga.stop_reason = budget.exhausted(ga)
+
     # Loop Principal da Simulação
     running_simulation = True
     while running_simulation:
-        # Verificação de eventos
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running_simulation = False
-            if event.type == pygame.KEYDOWN and (event.key == pygame.K_q or event.key == pygame.K_ESCAPE):
-                running_simulation = False
+        finished = ga.stop_reason is not None
+        if not finished:
+            ga.step()
+            maybe_checkpoint(ga, checkpoint_path, checkpoint_every)
+
+        now = time.perf_counter()
+        if finished or now - last_frame >= frame_interval:
+            last_frame = now
+            drawing_start = time.perf_counter_ns()
+            # Verificação de eventos
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running_simulation = False
+                if event.type == pygame.KEYDOWN and (event.key == pygame.K_q or event.key == pygame.K_ESCAPE):
+                    running_simulation = False
 
-        if generation >= N_GENERATIONS:
+            # Atualiza apenas a visualização do Pygame
+            draw_all_elements(screen, ga.best_individual, ga.top_individuals(5), ga.cities_locations,
+                              ga.generation, budget.max_generations)
+            ga.record_time("drawing", time.perf_counter_ns() - drawing_start)
+        if not finished:
+            ga.end_generation_timing()
+            ga.stop_reason = budget.exhausted(ga)
+
+        if finished:
             running_simulation = False
-            continue
-        
-        generation += 1
-
-        # Avaliação da população e verificação de convergência
-        population_fitness = [calculate_fitness(ind, cities_locations) for ind in population]
-        population_distances = [calculate_total_distance(ind, cities_locations) for ind in population]
-        
-        sorted_population = sorted(population, key=lambda ind: calculate_fitness(ind, cities_locations), reverse=True)
-        best_individual = sorted_population[0]
-        
-        best_fitness = calculate_fitness(best_individual, cities_locations)
-        best_distance = calculate_total_distance(best_individual, cities_locations)
-        avg_distance = np.mean(population_distances)
-        
-        best_fitness_history.append(best_fitness)
-        best_distance_history.append(best_distance)
-        avg_distance_history.append(avg_distance)
-
-        if generation > CONVERGENCE_GENERATIONS:
-            if abs(best_distance_history[generation - 1] - best_distance_history[generation - 1 - CONVERGENCE_GENERATIONS]) < 1e-6:
-                print(f"Convergência detectada na Geração {generation}. Parando a simulação.")
-                running_simulation = False
-                    
-        # Atualiza apenas a visualização do Pygame
-        draw_all_elements(screen, best_individual, sorted_population, cities_locations, generation, N_GENERATIONS)
-        
-        # Próxima Geração
-        next_population = [list(best_individual)]
-        while len(next_population) < POPULATION_SIZE:
-            parent1 = select_parent_by_tournament(population, population_fitness, TOURNAMENT_SIZE)
-            parent2 = select_parent_by_tournament(population, population_fitness, TOURNAMENT_SIZE)
-            if random.random() < CROSSOVER_PROBABILITY:
-                child = order_crossover(list(parent1), list(parent2))
-            else:
-                child = list(random.choice([list(parent1), list(parent2)]))
-            
-            #child = swap_mutation(tuple(child), MUTATION_PROBABILITY)
-            child = reverse_mutation(tuple(child), MUTATION_PROBABILITY)
-            if list(child) not in next_population:
-                next_population.append(list(child))
-        
-        population = [tuple(ind) for ind in next_population]
-        clock.tick(60)
+
+    maybe_checkpoint(ga, checkpoint_path, checkpoint_every, force=True)
+    print_stop_reason(ga)
+    print_summary(ga, time.perf_counter() - start)
+    if ga.phase_timer is not None:
+        ga.phase_timer.print_summary()
 
     # **NOVO:** Chamada para a função que plota todos os gráficos de uma vez
-    update_performance_plots_at_end(best_fitness_history, best_distance_history, avg_distance_history)
+    update_performance_plots_at_end(ga.best_fitness_history, ga.best_distance_history, ga.avg_distance_history)
 
     # Loop de espera para manter a janela aberta após a simulação
     running_display = True
@@ -105,12 +207,137 @@ def run_simulation():
                 running_display = False
             if event.type == pygame.KEYDOWN and (event.key == pygame.K_q or event.key == pygame.K_ESCAPE):
                 running_display = False
-        
+
         pygame.display.flip()
-        
+        clock.tick(fps)
+
     # Finalização
     pygame.quit()
     sys.exit()
 
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="PCV com algoritmo genético e seleção por torneio.")
+    parser.add_argument("--headless", action="store_true",
+                        help="executa em lote, sem pygame nem matplotlib")
+    parser.add_argument("--fps", type=float, default=FPS,
+                        help="quadros por segundo da visualização (padrão: %(default)s)")
+    parser.add_argument("--generations", type=int, default=N_GENERATIONS,
+                        help="número máximo de gerações (padrão: %(default)s)")
+    parser.add_argument("--time-limit", type=float, default=TIME_LIMIT,
+                        help="segundos de execução; para antes de estourar o limite (padrão: sem limite)")
+    parser.add_argument("--max-evaluations", type=int, default=MAX_EVALUATIONS,
+                        help="número máximo de rotas avaliadas (padrão: sem limite)")
+    parser.add_argument("--target-distance", type=float, default=None,
+                        help="para assim que a melhor rota atingir este comprimento")
+    parser.add_argument("--report-every", type=float, default=0,
+                        help="no modo headless, exibe a melhor rota até o momento a cada N segundos")
+    parser.add_argument("--cities", type=int, default=N_CITIES,
+                        help="número de cidades (padrão: %(default)s)")
+    parser.add_argument("--population", type=int, default=POPULATION_SIZE,
+                        help="tamanho da população (padrão: %(default)s)")
+    parser.add_argument("--crossover", choices=CROSSOVER_OPERATORS, default=CROSSOVER,
+                        help="operador de crossover (padrão: %(default)s)")
+    parser.add_argument("--mutation", choices=MUTATION_OPERATORS, default=MUTATION,
+                        help="operador de mutação (padrão: %(default)s)")
+    parser.add_argument("--adaptive", choices=ADAPTATION_SCHEMES, default=ADAPTIVE,
+                        help="ajusta operadores e taxas pelo sucesso dos filhos (padrão: taxas fixas)")
+    parser.add_argument("--adaptive-crossovers", nargs="+", choices=CROSSOVER_OPERATORS, default=None,
+                        help="crossovers disputados na seleção adaptativa (padrão: o de --crossover)")
+    parser.add_argument("--selection", choices=SELECTION_METHODS, default=SELECTION,
+                        help="método de seleção dos pais (padrão: %(default)s)")
+    parser.add_argument("--selection-pressure", type=float, default=SELECTION_PRESSURE,
+                        help="pressão seletiva do torneio (0 a 1) ou do ranking (1 a 2) (padrão: a do método)")
+    parser.add_argument("--steady-state", choices=REPLACEMENT_POLICIES, default=STEADY_STATE,
+                        help="AG estacionário: cada filho substitui a pior rota ou a pior de um torneio "
+                             "(padrão: AG geracional)")
+    parser.add_argument("--offspring-per-step", type=int, default=OFFSPRING_PER_STEP,
+                        help="filhos gerados por passo no AG estacionário (padrão: P/8)")
+    parser.add_argument("--matrix-free", action="store_true",
+                        help="instâncias grandes: calcula as distâncias das coordenadas, sem a matriz (N, N)")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="semente dos geradores aleatórios")
+    parser.add_argument("--workers", type=int, default=N_EVAL_WORKERS,
+                        help="processos para avaliar a população em memória compartilhada (0 = local)")
+    parser.add_argument("--chunk-size", type=int, default=None,
+                        help="rotas avaliadas por tarefa do pool (padrão: automático)")
+    parser.add_argument("--local-search", choices=LOCAL_SEARCH_MODES, default=LOCAL_SEARCH,
+                        help="aplica 2-opt às melhores rotas (elite) ou aos filhos (offspring)")
+    parser.add_argument("--ls-budget", type=int, default=LOCAL_SEARCH_BUDGET,
+                        help="rotas otimizadas por 2-opt a cada geração (padrão: %(default)s)")
+    parser.add_argument("--seed-fraction", type=float, default=SEED_FRACTION,
+                        help="fração da população inicial criada por heurísticas (padrão: %(default)s)")
+    parser.add_argument("--seed-methods", nargs="+", choices=SEEDING_METHODS, default=list(SEEDING_METHODS),
+                        help="heurísticas usadas na população inicial (padrão: todas)")
+    parser.add_argument("--checkpoint", default=None,
+                        help="arquivo .npz onde o estado da execução é salvo periodicamente")
+    parser.add_argument("--checkpoint-every", type=int, default=CHECKPOINT_EVERY,
+                        help="gerações entre checkpoints (padrão: %(default)s)")
+    parser.add_argument("--resume", action="store_true",
+                        help="continua a execução salva em --checkpoint")
+    parser.add_argument("--log-every", type=int, default=0,
+                        help="no modo headless, imprime o progresso a cada N gerações")
+    parser.add_argument("--profile", action="store_true",
+                        help="mede o tempo de cada fase da geração e exibe um resumo ao final")
+    parser.add_argument("--profile-jsonl", default=None,
+                        help="grava os tempos por fase de cada geração neste arquivo JSONL (implica --profile)")
+    parser.add_argument("--profiler", choices=PROFILERS, default=None,
+                        help="executa sob o cProfile ou o perfil por amostragem e exibe as funções mais caras")
+    parser.add_argument("--profile-output", default=None,
+                        help="arquivo onde o cProfile grava as estatísticas (pstats)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.resume and not args.checkpoint:
+        raise SystemExit("--resume exige --checkpoint")
+
+    checkpoint = None
+    if args.resume:
+        # Cidades e parâmetros vêm do checkpoint, para continuar a mesma execução
+        checkpoint = load_checkpoint(args.checkpoint)
+        params = checkpoint["params"]
+        cities_locations = checkpoint["cities"]
+        args.population = params["population_size"]
+        args.local_search = params["local_search"]
+        args.ls_budget = params["local_search_budget"]
+        args.selection = params["selection"]
+        args.crossover = params["crossover"]
+        args.mutation = params["mutation"]
+        args.adaptive = params["adaptive"]
+        args.adaptive_crossovers = params["adaptive_crossovers"]
+        args.selection_pressure = params["selection_pressure"]
+        args.matrix_free = params["matrix_free"]
+        args.steady_state = params.get("replacement")
+        args.offspring_per_step = params.get("offspring_per_step") or OFFSPRING_PER_STEP
+        print(f"Retomando {args.checkpoint} a partir da Geração {int(checkpoint['generation'])}")
+    else:
+        if args.seed is not None:
+            random.seed(args.seed)
+            np.random.seed(args.seed)
+        cities_locations = create_cities(args.cities)
+
+    evaluator = None
+    if args.workers > 0:
+        evaluator = SharedMemoryEvaluator(cities_locations, args.population, args.workers, args.chunk_size,
+                                          use_distance_matrix=not args.matrix_free)
+    phase_timer = PhaseTimer(args.profile_jsonl) if args.profile or args.profile_jsonl else None
+    profiler = profile_block(args.profiler, args.profile_output) if args.profiler else nullcontext()
+    try:
+        with profiler:
+            initial_population = checkpoint["population"] if checkpoint is not None else None
+            ga = build_genetic_algorithm(args, cities_locations, evaluator, initial_population, phase_timer)
+            if checkpoint is not None:
+                restore_checkpoint(ga, checkpoint)
+            budget = build_budget(args)
+            if args.headless:
+                run_headless(ga, budget, args.log_every, args.checkpoint, args.checkpoint_every, args.report_every)
+            else:
+                run_simulation(ga, budget, args.fps, args.checkpoint, args.checkpoint_every)
+    finally:
+        if evaluator is not None:
+            evaluator.close()
+        if phase_timer is not None:
+            phase_timer.close()
+
 if __name__ == '__main__':
-    run_simulation()
\ No newline at end of file
+    main()
@@ -0,0 +1,136 @@
+# parallel_eval.py
+
+import math
+import multiprocessing
+from multiprocessing import shared_memory
+import numpy as np
+
+from ga_logic import POPULATION_DTYPE, build_distance_matrix, score_paths
+from coordinate_distances import CoordinateDistances
+
+# Visões NumPy dos blocos compartilhados, criadas uma vez por processo do pool.
+_worker_arrays = {}
+
+def _attach(name, shape, dtype):
+    """Abre um bloco de memória compartilhada existente e o expõe como array."""
+    block = shared_memory.SharedMemory(name=name)
+    return block, np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+def _init_worker(geometry_spec, population_spec, output_spec, metric):
+    _worker_arrays["blocks"] = []
+    for key, spec in (("geometry", geometry_spec), ("population", population_spec), ("output", output_spec)):
+        block, array = _attach(*spec)
+        _worker_arrays["blocks"].append(block)
+        _worker_arrays[key] = array
+    # Sem matriz, as arestas saem das coordenadas compartilhadas (float32, sem cópia)
+    _worker_arrays["coordinate_distances"] = (CoordinateDistances(_worker_arrays["geometry"], metric)
+                                              if metric is not None else None)
+
+def _score_chunk(bounds):
+    """Avalia as linhas [start, stop) da população compartilhada e grava o resultado."""
+    start, stop = bounds
+    paths = _worker_arrays["population"][start:stop].astype(np.intp)
+    coordinate_distances = _worker_arrays["coordinate_distances"]
+    if coordinate_distances is None:
+        distances = score_paths(paths, _worker_arrays["geometry"])
+    else:
+        distances = coordinate_distances.tour_lengths(paths)
+    _worker_arrays["output"][start:stop] = distances
+
+def _create_shared(array):
+    """Copia `array` para um novo bloco de memória compartilhada."""
+    block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    shared = np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)
+    shared[...] = array
+    return block, shared
+
+class SharedMemoryEvaluator:
+    """
+    Avalia populações em paralelo, com os dados do problema em memória compartilhada.
+
+    A matriz de distâncias (ou só as coordenadas, para instâncias grandes) é
+    colocada em `multiprocessing.shared_memory` uma única vez. Por padrão é a
+    matriz euclidiana das cidades; passe a `distance_matrix` do AG (ex.: as
+    distâncias de uma instância TSPLIB) para que o pool avalie com as mesmas
+    distâncias que ele. A cada chamada, a população é copiada para um buffer
+    também compartilhado e os processos recebem apenas os limites (início,
+    fim) de cada bloco de linhas, então nada além de dois inteiros é
+    serializado por tarefa.
+
+    Pode ser usado como `evaluator` de `calculate_population_distances` e de
+    `GeneticAlgorithm`. Chame `close()` (ou use `with`) para liberar a memória.
+
+    Args:
+        cities_locations: Coordenadas das cidades.
+        max_population (int): Maior número de rotas avaliadas numa chamada.
+        n_workers (int, opcional): Processos do pool (padrão: núcleos da máquina).
+        chunk_size (int, opcional): Rotas por tarefa (padrão: ~4 tarefas por processo).
+        use_distance_matrix (bool): Compartilha a matriz (N, N); se False,
+            compartilha só as coordenadas e calcula as arestas sob demanda.
+        distance_matrix (opcional): Matriz (N, N) explícita ou `CoordinateDistances`
+            (coordenadas e métrica) compartilhada no lugar da euclidiana; nesse
+            caso `cities_locations` e `use_distance_matrix` são ignorados.
+    """
+
+    def __init__(self, cities_locations, max_population, n_workers=None, chunk_size=None,
+                 use_distance_matrix=True, distance_matrix=None):
+        self.n_workers = n_workers or multiprocessing.cpu_count()
+        self.chunk_size = chunk_size
+        self.max_population = max_population
+
+        if isinstance(distance_matrix, CoordinateDistances):
+            geometry, metric = distance_matrix.coords, distance_matrix.metric
+        elif distance_matrix is not None:
+            geometry, metric = np.asarray(distance_matrix, dtype=np.float64), None
+        elif use_distance_matrix:
+            geometry, metric = build_distance_matrix(cities_locations), None
+        else:
+            geometry, metric = np.asarray(cities_locations, dtype=np.float32), "euclidean"
+        n_cities = len(geometry)
+        self._blocks = []
+        geometry_block, _ = self._share(geometry)
+        population_block, self._population = self._share(np.zeros((max_population, n_cities), dtype=POPULATION_DTYPE))
+        output_block, self._output = self._share(np.zeros(max_population))
+
+        specs = [(block.name, array.shape, array.dtype) for block, array in
+                 ((geometry_block, geometry), (population_block, self._population), (output_block, self._output))]
+        self._pool = multiprocessing.Pool(self.n_workers, initializer=_init_worker,
+                                          initargs=(*specs, metric))
+
+    def _share(self, array):
+        block, shared = _create_shared(array)
+        self._blocks.append(block)
+        return block, shared
+
+    def _chunks(self, n_paths):
+        chunk_size = self.chunk_size or max(1, math.ceil(n_paths / (self.n_workers * 4)))
+        return [(start, min(start + chunk_size, n_paths)) for start in range(0, n_paths, chunk_size)]
+
+    def __call__(self, paths):
+        """Retorna as distâncias (P,) das rotas de `paths`, avaliadas pelo pool."""
+        paths = np.asarray(paths)
+        n_paths = len(paths)
+        if n_paths > self.max_population:
+            raise ValueError(f"População com {n_paths} rotas excede max_population={self.max_population}")
+        self._population[:n_paths] = paths
+        self._pool.map(_score_chunk, self._chunks(n_paths))
+        return self._output[:n_paths].copy()
+
+    def close(self):
+        """Encerra o pool e libera os blocos de memória compartilhada."""
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+        # As visões NumPy precisam ser soltas antes de fechar os blocos
+        self._population = self._output = None
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,254 @@
+# performance_profiles.py
+
+import argparse
+import multiprocessing
+import os
+import random
+import time
+import numpy as np
+
+from steady_state import create_genetic_algorithm
+from tsplib import bundled_instances, load_instance
+from budget import Budget
+from benchmark import BASE_PARAMS, CONFIGURATIONS, TARGET_GAP
+
+# --- Parâmetros dos Perfis ---
+PROFILE_INSTANCE = "berlin52"
+PROFILE_RUNS = 10  # Execuções independentes (sementes 0..R-1) por configuração
+PROFILE_GENERATIONS = 300
+GRID_POINTS = 200  # Pontos das curvas agregadas (eixo de avaliações e eixo de tempo)
+QUANTILES = (0.1, 0.25, 0.5, 0.75, 0.9)  # Quantis guardados; a mediana é a curva principal
+
+# Instâncias já carregadas em cada processo do pool
+_worker_instances = {}
+
+def run_traced(task):
+    """
+    Executa o AG uma vez, dentro de um processo do pool, e registra a melhor distância após cada geração.
+
+    Returns:
+        dict: "config", "seed" e os traços "evaluations", "seconds" e
+        "best_distance" (arrays de mesmo tamanho, um ponto por geração,
+        incluindo a população inicial).
+    """
+    config_name, params, instance_name, seed, max_generations, time_limit, max_evaluations = task
+    if instance_name not in _worker_instances:
+        _worker_instances[instance_name] = load_instance(instance_name)
+    instance = _worker_instances[instance_name]
+    random.seed(seed)
+    np.random.seed(seed)
+
+    evaluations, seconds, best_distances = [], [], []
+    start = time.perf_counter()
+
+    def record(ga):
+        evaluations.append(ga.evaluations)
+        seconds.append(time.perf_counter() - start)
+        best_distances.append(ga.incumbent_distance)
+
+    ga = create_genetic_algorithm(instance.coords, distance_matrix=instance.distance_matrix,
+                                  **{**BASE_PARAMS, **params})
+    record(ga)
+    ga.run(budget=Budget(max_generations, time_limit, max_evaluations), on_generation=record)
+    return {
+        "config": config_name,
+        "seed": seed,
+        "evaluations": np.array(evaluations, dtype=np.int64),
+        "seconds": np.array(seconds),
+        "best_distance": np.array(best_distances),
+    }
+
+def best_so_far_at(x, trace_x, trace_best):
+    """
+    Melhor distância de uma execução em cada ponto de `x` (função escada do traço).
+
+    Antes do primeiro ponto registrado o valor é NaN; depois do último, a
+    execução já terminou e fica com a melhor distância final.
+    """
+    positions = np.searchsorted(trace_x, x, side="right") - 1
+    values = trace_best[np.maximum(positions, 0)].astype(np.float64)
+    values[positions < 0] = np.nan
+    return values
+
+def aggregate_runs(runs, grid_points=GRID_POINTS, quantiles=QUANTILES):
+    """
+    Agrega as execuções em curvas de quantis da melhor distância até o momento.
+
+    As curvas são calculadas sobre dois eixos comuns a todas as
+    configurações: avaliações e tempo de parede, ambos de zero até o maior
+    valor atingido por alguma execução, com `grid_points` pontos.
+
+    Args:
+        runs (list[dict]): Resultados de `run_traced`.
+
+    Returns:
+        dict: "grid_evaluations" e "grid_seconds" (G,), "quantiles" (Q,) e, para
+        cada configuração, `{nome: {"by_evaluations": (Q, G), "by_seconds": (Q, G),
+        "final": (R,)}}` em "configs".
+    """
+    grid_evaluations = np.linspace(0, max(run["evaluations"][-1] for run in runs), grid_points)
+    grid_seconds = np.linspace(0, max(run["seconds"][-1] for run in runs), grid_points)
+    by_config = {}
+    for run in runs:
+        by_config.setdefault(run["config"], []).append(run)
+
+    configs = {}
+    for name, config_runs in by_config.items():
+        curves = {}
+        for axis, grid in (("evaluations", grid_evaluations), ("seconds", grid_seconds)):
+            values = np.array([best_so_far_at(grid, run[axis], run["best_distance"]) for run in config_runs])
+            # Pontos em que nenhuma execução tinha resultado ainda ficam NaN
+            defined = ~np.isnan(values).all(axis=0)
+            curve = np.full((len(quantiles), len(grid)), np.nan)
+            curve[:, defined] = np.nanquantile(values[:, defined], quantiles, axis=0)
+            curves[f"by_{axis}"] = curve
+        curves["final"] = np.array([run["best_distance"][-1] for run in config_runs])
+        configs[name] = curves
+    return {"grid_evaluations": grid_evaluations, "grid_seconds": grid_seconds,
+            "quantiles": np.array(quantiles), "configs": configs}
+
+def time_to_target(runs, target):
+    """
+    Avaliações e segundos até cada execução atingir `target`, por configuração.
+
+    Returns:
+        dict: Nome -> {"hit_rate", "median_evaluations", "median_seconds"}
+        (medianas só das execuções que atingiram o alvo; None se nenhuma).
+    """
+    hits = {}
+    for run in runs:
+        reached = np.flatnonzero(run["best_distance"] <= target)
+        hit = (run["evaluations"][reached[0]], run["seconds"][reached[0]]) if len(reached) else None
+        hits.setdefault(run["config"], []).append(hit)
+    result = {}
+    for name, config_hits in hits.items():
+        reached = [hit for hit in config_hits if hit is not None]
+        result[name] = {
+            "hit_rate": len(reached) / len(config_hits),
+            "median_evaluations": float(np.median([hit[0] for hit in reached])) if reached else None,
+            "median_seconds": float(np.median([hit[1] for hit in reached])) if reached else None,
+        }
+    return result
+
+def save_profiles(path, profiles):
+    """
+    Grava os perfis agregados num `.npz` compactado, com as curvas em float32.
+
+    As chaves são "grid_evaluations", "grid_seconds", "quantiles", "configs"
+    (nomes) e, por configuração, "<nome>/by_evaluations", "<nome>/by_seconds"
+    e "<nome>/final".
+    """
+    arrays = {"grid_evaluations": profiles["grid_evaluations"], "grid_seconds": profiles["grid_seconds"],
+              "quantiles": profiles["quantiles"], "configs": np.array(list(profiles["configs"]))}
+    for name, curves in profiles["configs"].items():
+        for key, values in curves.items():
+            arrays[f"{name}/{key}"] = values.astype(np.float32)
+    np.savez_compressed(path, **arrays)
+
+def plot_profiles(profiles, output_dir, optimum=None):
+    """
+    Desenha um gráfico por configuração: mediana e faixas de quantis, por avaliações e por tempo.
+
+    As medianas das outras configurações aparecem em cinza para comparação.
+
+    Returns:
+        list[str]: Caminhos dos PNG gravados.
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    quantiles = list(profiles["quantiles"])
+    median = quantiles.index(0.5) if 0.5 in quantiles else len(quantiles) // 2
+    # Faixas entre quantis simétricos (ex.: 10%-90% e 25%-75%), da mais larga para a mais estreita
+    bands = [(i, len(quantiles) - 1 - i) for i in range(len(quantiles) // 2)]
+    os.makedirs(output_dir, exist_ok=True)
+    paths = []
+    for name, curves in profiles["configs"].items():
+        fig, axes = plt.subplots(1, 2, figsize=(12, 4.5), sharey=True)
+        for ax, axis, label in ((axes[0], "evaluations", "Avaliações"), (axes[1], "seconds", "Tempo (s)")):
+            grid = profiles[f"grid_{axis}"]
+            for other, other_curves in profiles["configs"].items():
+                if other != name:
+                    ax.plot(grid, other_curves[f"by_{axis}"][median], color="0.7", linewidth=1)
+            curve = curves[f"by_{axis}"]
+            for alpha, (low, high) in zip(np.linspace(0.15, 0.3, len(bands)), bands):
+                ax.fill_between(grid, curve[low], curve[high], color="tab:blue", alpha=alpha, linewidth=0,
+                                label=f"{quantiles[low]:.0%}-{quantiles[high]:.0%}")
+            ax.plot(grid, curve[median], color="tab:blue", linewidth=2, label="Mediana")
+            if optimum:
+                ax.axhline(optimum, color="tab:green", linestyle="--", linewidth=1, label="Ótimo")
+            ax.set_xlabel(label)
+            ax.grid(True, alpha=0.3)
+        axes[0].set_ylabel("Melhor distância até o momento")
+        axes[0].legend()
+        fig.suptitle(f"{name} ({len(curves['final'])} execuções)")
+        fig.tight_layout()
+        path = os.path.join(output_dir, f"{name}.png")
+        fig.savefig(path, dpi=100)
+        plt.close(fig)
+        paths.append(path)
+    return paths
+
+def print_profile_summary(profiles, hits, target_gap):
+    """Exibe, por configuração, a distância final (mediana e quartis) e o tempo mediano até o alvo."""
+    def fmt(value, spec, suffix=""):
+        return format(value, spec) + suffix if value is not None else "-"
+
+    print(f"{'Configuração':<18} | {'Mediana':>9} | {'Q25-Q75':>17} | {'Alvo ' + format(target_gap, '.0%'):>8} | "
+          f"{'Aval. alvo':>10} | {'Tempo alvo':>10}")
+    for name, curves in profiles["configs"].items():
+        q25, median, q75 = np.quantile(curves["final"], [0.25, 0.5, 0.75])
+        hit = hits.get(name, {"hit_rate": 0.0, "median_evaluations": None, "median_seconds": None})
+        quartiles = f"{q25:.1f}-{q75:.1f}"
+        print(f"{name:<18} | {median:>9.1f} | {quartiles:>17} | {hit['hit_rate']:>8.0%} | "
+              f"{fmt(hit['median_evaluations'], '.0f'):>10} | {fmt(hit['median_seconds'], '.2f', 's'):>10}")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Perfis de desempenho do AG ao longo da execução (melhor "
+                                                 "distância × avaliações e × tempo) sobre várias sementes.")
+    parser.add_argument("--instance", choices=bundled_instances(), default=PROFILE_INSTANCE,
+                        help="instância avaliada (padrão: %(default)s)")
+    parser.add_argument("--configs", nargs="+", choices=list(CONFIGURATIONS), default=["ga"],
+                        help="configurações do AG comparadas (padrão: %(default)s)")
+    parser.add_argument("--runs", type=int, default=PROFILE_RUNS,
+                        help="execuções (sementes 0..R-1) por configuração (padrão: %(default)s)")
+    parser.add_argument("--generations", type=int, default=PROFILE_GENERATIONS,
+                        help="gerações de cada execução (padrão: %(default)s)")
+    parser.add_argument("--time-limit", type=float, default=None, help="segundos por execução")
+    parser.add_argument("--max-evaluations", type=int, default=None, help="avaliações por execução")
+    parser.add_argument("--target-gap", type=float, default=TARGET_GAP,
+                        help="gap do critério de tempo até o alvo (padrão: %(default)s)")
+    parser.add_argument("--workers", type=int, default=None, help="processos do pool (padrão: núcleos)")
+    parser.add_argument("--output", default=None, help="grava as curvas agregadas neste arquivo .npz")
+    parser.add_argument("--plots", default=None, help="grava um gráfico PNG por configuração neste diretório")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    instance = load_instance(args.instance)
+    tasks = [(name, CONFIGURATIONS[name], args.instance, seed, args.generations, args.time_limit,
+              args.max_evaluations) for name in args.configs for seed in range(args.runs)]
+
+    runs = []
+    with multiprocessing.Pool(args.workers or multiprocessing.cpu_count()) as pool:
+        for run in pool.imap_unordered(run_traced, tasks):
+            runs.append(run)
+            print(f"{run['config']} / semente {run['seed']}: {run['best_distance'][-1]:.0f} "
+                  f"({run['evaluations'][-1]} avaliações, {run['seconds'][-1]:.2f}s)")
+    # Ordem fixa (configuração, semente), independentemente de qual processo terminou antes
+    order = {name: i for i, name in enumerate(args.configs)}
+    runs.sort(key=lambda run: (order[run["config"]], run["seed"]))
+
+    profiles = aggregate_runs(runs)
+    target = instance.optimum * (1 + args.target_gap) if instance.optimum else None
+    hits = time_to_target(runs, target) if target is not None else {}
+    print_profile_summary(profiles, hits, args.target_gap)
+    if args.output:
+        save_profiles(args.output, profiles)
+    if args.plots:
+        for path in plot_profiles(profiles, args.plots, instance.optimum):
+            print(f"Gráfico salvo em {path}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,177 @@
+# profiling.py
+
+import cProfile
+import json
+import os
+import pstats
+import signal
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+# Fases medidas dentro de uma geração, na ordem em que aparecem na tabela
+PHASES = ("local_search", "selection", "crossover", "mutation", "duplicates", "evaluation", "sorting",
+          "adaptive", "checkpoint", "drawing")
+
+PROFILERS = ("cprofile", "sampling")
+
+def null_clock():
+    """Relógio nulo usado quando o perfil por fase está desligado."""
+    return 0
+
+class PhaseTimer:
+    """
+    Acumula o tempo gasto em cada fase de uma geração e registra um resumo por geração.
+
+    Os trechos são medidos com `time.perf_counter_ns` por quem os executa e
+    somados com `add(fase, ns)`; no laço de reprodução, o AG acumula os
+    tempos em variáveis locais e chama `add` uma vez por geração.
+    `end_generation` fecha o registro da geração; a diferença entre o tempo
+    de parede e a soma das fases entra como "other".
+
+    Args:
+        jsonl_path (str, opcional): Arquivo onde cada geração é gravada como uma linha JSON.
+    """
+
+    def __init__(self, jsonl_path=None):
+        self.totals = Counter()
+        self.maxima = Counter()
+        self.n_generations = 0
+        self._current = Counter()
+        self._last_end = time.perf_counter_ns()
+        self._file = open(jsonl_path, "w") if jsonl_path else None
+
+    def add(self, phase, nanoseconds):
+        self._current[phase] += nanoseconds
+
+    def end_generation(self, generation, **extra):
+        """
+        Fecha a geração `generation` e grava seu registro no JSONL, se houver.
+
+        Returns:
+            dict: Registro com "generation", "wall_ms", "phases_ms" e os campos de `extra`.
+        """
+        now = time.perf_counter_ns()
+        wall = now - self._last_end
+        self._last_end = now
+        phases = dict(self._current)
+        phases["other"] = max(0, wall - sum(phases.values()))
+        for phase, nanoseconds in phases.items():
+            self.totals[phase] += nanoseconds
+            self.maxima[phase] = max(self.maxima[phase], nanoseconds)
+        self.n_generations += 1
+        self._current.clear()
+
+        record = {"generation": generation, "wall_ms": wall / 1e6,
+                  "phases_ms": {phase: phases[phase] / 1e6 for phase in sorted(phases, key=_phase_order)}, **extra}
+        if self._file is not None:
+            self._file.write(json.dumps(record) + "\n")
+            self._file.flush()
+        return record
+
+    def summary(self):
+        """Tempo total, fração, média e máximo por geração de cada fase, da mais cara para a mais barata."""
+        total = sum(self.totals.values())
+        rows = []
+        for phase, nanoseconds in sorted(self.totals.items(), key=lambda item: -item[1]):
+            rows.append({
+                "phase": phase,
+                "total_s": nanoseconds / 1e9,
+                "share": nanoseconds / total if total else 0.0,
+                "mean_ms": nanoseconds / 1e6 / max(self.n_generations, 1),
+                "max_ms": self.maxima[phase] / 1e6,
+            })
+        return rows
+
+    def print_summary(self):
+        """Exibe o resumo por fase como tabela no terminal."""
+        print(f"{'Fase':<14} | {'Total':>9} | {'Fração':>7} | {'Média/ger.':>11} | {'Máx./ger.':>10}")
+        for row in self.summary():
+            print(f"{row['phase']:<14} | {row['total_s']:>8.2f}s | {row['share']:>7.1%} | "
+                  f"{row['mean_ms']:>9.2f}ms | {row['max_ms']:>8.2f}ms")
+        print(f"{self.n_generations} gerações medidas")
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+def _phase_order(phase):
+    return PHASES.index(phase) if phase in PHASES else len(PHASES)
+
+class SamplingProfiler:
+    """
+    Perfil por amostragem: a cada `interval` segundos de CPU, anota a pilha da thread principal.
+
+    Usa `signal.setitimer(ITIMER_PROF)`, então só existe em sistemas Unix.
+    O custo é proporcional ao número de amostras, não ao de chamadas, e o
+    resultado conta, para cada função, as amostras em que ela estava
+    executando ("self") ou em qualquer ponto da pilha ("total").
+    """
+
+    def __init__(self, interval=0.005):
+        if not hasattr(signal, "setitimer"):
+            raise RuntimeError("O perfil por amostragem exige signal.setitimer (Unix)")
+        self.interval = interval
+        self.self_samples = Counter()
+        self.total_samples = Counter()
+        self.n_samples = 0
+
+    def _sample(self, signum, frame):
+        self.n_samples += 1
+        self.self_samples[_frame_label(frame)] += 1
+        seen = set()
+        while frame is not None:
+            label = _frame_label(frame)
+            if label not in seen:
+                seen.add(label)
+                self.total_samples[label] += 1
+            frame = frame.f_back
+
+    def start(self):
+        self._previous_handler = signal.signal(signal.SIGPROF, self._sample)
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+
+    def stop(self):
+        signal.setitimer(signal.ITIMER_PROF, 0, 0)
+        signal.signal(signal.SIGPROF, self._previous_handler)
+
+    def print_top(self, n=20):
+        """Exibe as `n` funções com mais amostras próprias."""
+        print(f"{'Self':>7} | {'Total':>7} | Função ({self.n_samples} amostras)")
+        for label, count in self.self_samples.most_common(n):
+            print(f"{count / self.n_samples:>7.1%} | {self.total_samples[label] / self.n_samples:>7.1%} | {label}")
+
+def _frame_label(frame):
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_firstlineno}({code.co_name})"
+
+@contextmanager
+def profile_block(kind, output_path=None, top=20):
+    """
+    Executa o bloco sob o `cProfile` ou o perfil por amostragem e exibe as funções mais caras.
+
+    Args:
+        kind (str): Um de `PROFILERS`.
+        output_path (str, opcional): Com "cprofile", grava as estatísticas
+            (`pstats`, para abrir no snakeviz etc.).
+        top (int): Funções exibidas ao final.
+    """
+    if kind not in PROFILERS:
+        raise ValueError(f"Perfilador desconhecido: {kind!r}")
+    profiler = cProfile.Profile() if kind == "cprofile" else SamplingProfiler()
+    if kind == "cprofile":
+        profiler.enable()
+    else:
+        profiler.start()
+    try:
+        yield profiler
+    finally:
+        if kind == "cprofile":
+            profiler.disable()
+            if output_path:
+                profiler.dump_stats(output_path)
+            pstats.Stats(profiler).sort_stats("cumulative").print_stats(top)
+        else:
+            profiler.stop()
+            profiler.print_top(top)
@@ -0,0 +1,288 @@
+# seeding.py
+
+import random
+import numpy as np
+
+from ga_logic import POPULATION_DTYPE, create_population_array, get_distance_matrix, reverse_mutation_inplace
+from coordinate_distances import CoordinateDistances
+
+# --- Heurísticas construtivas ---
+
+def nearest_neighbour_tour(distance_matrix, start=0):
+    """Constrói uma rota indo sempre para a cidade não visitada mais próxima."""
+    n_cities = len(distance_matrix)
+    visited = np.zeros(n_cities, dtype=bool)
+    tour = np.empty(n_cities, dtype=POPULATION_DTYPE)
+    current = start
+    for i in range(n_cities):
+        tour[i] = current
+        visited[current] = True
+        if i < n_cities - 1:
+            row = np.where(visited, np.inf, distance_matrix[current])
+            current = int(np.argmin(row))
+    return tour
+
+def greedy_edge_tour(distance_matrix, neighbor_lists=None):
+    """
+    Constrói uma rota pela heurística das arestas gulosas.
+
+    As arestas são percorridas da mais curta para a mais longa e cada uma é
+    aceita se nenhuma das pontas já tiver grau 2 e se não fechar um ciclo
+    antes da hora; ao final, as duas pontas do caminho são ligadas.
+
+    Com `neighbor_lists` (N, k), só as N·k arestas candidatas são ordenadas,
+    em vez das N² arestas; os fragmentos que sobram são unidos pelo mesmo
+    critério guloso, considerando apenas as arestas entre suas pontas.
+    Assim a heurística também funciona com uma `CoordinateDistances`.
+    """
+    n_cities = len(distance_matrix)
+    if n_cities < 3:
+        return np.arange(n_cities, dtype=POPULATION_DTYPE)
+    if not isinstance(distance_matrix, CoordinateDistances):
+        distance_matrix = np.asarray(distance_matrix)
+
+    parent = list(range(n_cities))
+    def find(city):
+        while parent[city] != city:
+            parent[city] = parent[parent[city]]
+            city = parent[city]
+        return city
+
+    degree = [0] * n_cities
+    adjacency = [[] for _ in range(n_cities)]
+    n_edges = 0
+
+    def add_edges(rows, cols):
+        """Percorre as arestas (rows[i], cols[i]) em ordem crescente de comprimento, aceitando as válidas."""
+        nonlocal n_edges
+        order = np.argsort(distance_matrix[rows, cols], kind='stable')
+        for a, b in zip(rows[order].tolist(), cols[order].tolist()):
+            if n_edges == n_cities - 1:
+                break
+            if degree[a] == 2 or degree[b] == 2:
+                continue
+            root_a, root_b = find(a), find(b)
+            if root_a == root_b:
+                continue
+            parent[root_a] = root_b
+            degree[a] += 1
+            degree[b] += 1
+            adjacency[a].append(b)
+            adjacency[b].append(a)
+            n_edges += 1
+
+    if neighbor_lists is None:
+        add_edges(*np.triu_indices(n_cities, k=1))
+    else:
+        neighbor_lists = np.asarray(neighbor_lists, dtype=np.intp)
+        rows = np.repeat(np.arange(n_cities), neighbor_lists.shape[1])
+        cols = neighbor_lists.ravel()
+        # Cada aresta uma única vez, na forma (menor, maior)
+        edges = np.unique(np.column_stack((np.minimum(rows, cols), np.maximum(rows, cols))), axis=0)
+        add_edges(edges[:, 0], edges[:, 1])
+        if n_edges < n_cities - 1:
+            ends = np.flatnonzero(np.array(degree) < 2)
+            end_rows, end_cols = np.triu_indices(len(ends), k=1)
+            add_edges(ends[end_rows], ends[end_cols])
+
+    # Percorre o caminho hamiltoniano a partir de uma das pontas (grau 1)
+    start = degree.index(1)
+    tour = [start]
+    previous, current = -1, start
+    while len(tour) < n_cities:
+        following = adjacency[current][0] if adjacency[current][0] != previous else adjacency[current][-1]
+        tour.append(following)
+        previous, current = current, following
+    return np.array(tour, dtype=POPULATION_DTYPE)
+
+def mst_double_tree_tour(distance_matrix, root=0):
+    """
+    Constrói uma rota pela heurística da árvore dupla.
+
+    Calcula a árvore geradora mínima (Prim) e visita as cidades na ordem de
+    uma busca em profundidade, pulando as já visitadas (atalhos).
+    """
+    distance_matrix = np.asarray(distance_matrix)
+    n_cities = len(distance_matrix)
+    in_tree = np.zeros(n_cities, dtype=bool)
+    best_cost = np.full(n_cities, np.inf)
+    best_parent = np.full(n_cities, -1)
+    children = [[] for _ in range(n_cities)]
+
+    best_cost[root] = 0.0
+    for _ in range(n_cities):
+        city = int(np.argmin(np.where(in_tree, np.inf, best_cost)))
+        in_tree[city] = True
+        if best_parent[city] >= 0:
+            children[best_parent[city]].append(city)
+        closer = ~in_tree & (distance_matrix[city] < best_cost)
+        best_cost[closer] = distance_matrix[city][closer]
+        best_parent[closer] = city
+
+    tour = []
+    stack = [root]
+    while stack:
+        city = stack.pop()
+        tour.append(city)
+        # Visita primeiro o filho mais próximo
+        stack.extend(sorted(children[city], key=lambda child: -distance_matrix[city, child]))
+    return np.array(tour, dtype=POPULATION_DTYPE)
+
+def convex_hull(cities):
+    """Retorna os índices das cidades no fecho convexo (cadeia monótona de Andrew)."""
+    coords = np.asarray(cities, dtype=np.float64)
+    order = np.lexsort((coords[:, 1], coords[:, 0])).tolist()
+
+    def cross(o, a, b):
+        return ((coords[a, 0] - coords[o, 0]) * (coords[b, 1] - coords[o, 1])
+                - (coords[a, 1] - coords[o, 1]) * (coords[b, 0] - coords[o, 0]))
+
+    lower, upper = [], []
+    for city in order:
+        while len(lower) >= 2 and cross(lower[-2], lower[-1], city) <= 0:
+            lower.pop()
+        lower.append(city)
+    for city in reversed(order):
+        while len(upper) >= 2 and cross(upper[-2], upper[-1], city) <= 0:
+            upper.pop()
+        upper.append(city)
+    return lower[:-1] + upper[:-1]
+
+def convex_hull_insertion_tour(cities, distance_matrix):
+    """
+    Constrói uma rota partindo do fecho convexo e inserindo as demais cidades.
+
+    A cada passo, entre todas as cidades restantes, insere aquela de menor
+    custo de inserção (d(i,k) + d(k,j) - d(i,j)) na aresta onde esse custo
+    é mínimo. O melhor custo de cada cidade é mantido incrementalmente; só é
+    recalculado por completo quando a aresta escolhida por ela é quebrada.
+    """
+    distance_matrix = np.asarray(distance_matrix)
+    n_cities = len(distance_matrix)
+    hull = convex_hull(cities)
+    if len(hull) < 3:
+        hull = [0, 1, 2][:n_cities]
+    succ = np.full(n_cities, -1)
+    for i, city in enumerate(hull):
+        succ[city] = hull[(i + 1) % len(hull)]
+
+    remaining = np.setdiff1d(np.arange(n_cities), hull)
+    in_tour = np.zeros(n_cities, dtype=bool)
+    in_tour[hull] = True
+
+    def insertion_costs(edge_starts, cities_to_insert):
+        edge_ends = succ[edge_starts]
+        return (distance_matrix[np.ix_(cities_to_insert, edge_starts)]
+                + distance_matrix[np.ix_(cities_to_insert, edge_ends)]
+                - distance_matrix[edge_starts, edge_ends])
+
+    # Para cada cidade: menor custo de inserção e a aresta (identificada pela origem)
+    best_cost = np.full(n_cities, np.inf)
+    best_edge = np.full(n_cities, -1)
+    if len(remaining):
+        edge_starts = np.array(hull)
+        costs = insertion_costs(edge_starts, remaining)
+        best_edge[remaining] = edge_starts[np.argmin(costs, axis=1)]
+        best_cost[remaining] = costs.min(axis=1)
+
+    for _ in range(len(remaining)):
+        candidates = np.flatnonzero(~in_tour)
+        city = candidates[np.argmin(best_cost[candidates])]
+        start = best_edge[city]
+        end = succ[start]
+        succ[start] = city
+        succ[city] = end
+        in_tour[city] = True
+
+        candidates = np.flatnonzero(~in_tour)
+        if not len(candidates):
+            break
+        # Cidades que apontavam para a aresta quebrada são recalculadas do zero
+        broken = candidates[best_edge[candidates] == start]
+        if len(broken):
+            edge_starts = np.flatnonzero(in_tour)
+            costs = insertion_costs(edge_starts, broken)
+            best_edge[broken] = edge_starts[np.argmin(costs, axis=1)]
+            best_cost[broken] = costs.min(axis=1)
+        # As demais só precisam comparar com as duas arestas novas
+        others = candidates[best_edge[candidates] != start]
+        if len(others):
+            new_edges = np.array([start, city])
+            costs = insertion_costs(new_edges, others)
+            better = costs.min(axis=1) < best_cost[others]
+            best_cost[others[better]] = costs.min(axis=1)[better]
+            best_edge[others[better]] = new_edges[np.argmin(costs, axis=1)][better]
+
+    tour = np.empty(n_cities, dtype=POPULATION_DTYPE)
+    city = hull[0]
+    for i in range(n_cities):
+        tour[i] = city
+        city = succ[city]
+    return tour
+
+# --- População inicial semeada ---
+
+SEEDING_METHODS = ("nearest_neighbour", "greedy_edge", "mst", "convex_hull")
+
+# Vizinhos por cidade nas arestas candidatas das arestas gulosas sem matriz
+GREEDY_CANDIDATES = 10
+
+def create_seeded_population(cities_locations, pop_size, seed_fraction=0.1, methods=SEEDING_METHODS,
+                             distance_matrix=None):
+    """
+    Cria a população inicial misturando rotas heurísticas e rotas aleatórias.
+
+    Cada heurística determinística (arestas gulosas, árvore dupla, fecho
+    convexo) contribui com uma rota; o vizinho mais próximo é repetido a
+    partir de cidades iniciais sorteadas. Se ainda faltarem sementes, cópias
+    das rotas heurísticas recebem uma inversão aleatória para manter a
+    diversidade. O restante da população é aleatório.
+
+    Com uma `CoordinateDistances` em `distance_matrix` (instâncias grandes),
+    só as arestas gulosas são usadas, restritas às listas de vizinhos; as
+    demais heurísticas percorrem a matriz (N, N) e são ignoradas.
+
+    Args:
+        cities_locations: Coordenadas das cidades.
+        pop_size (int): Tamanho da população.
+        seed_fraction (float): Fração da população (0 a 1) criada por heurísticas.
+        methods: Heurísticas a usar, entre `SEEDING_METHODS`.
+        distance_matrix (opcional): Distâncias a usar no lugar da matriz euclidiana.
+
+    Returns:
+        np.ndarray: Matriz (pop_size, N) com a população inicial.
+    """
+    unknown = set(methods) - set(SEEDING_METHODS)
+    if unknown:
+        raise ValueError(f"Heurísticas desconhecidas: {sorted(unknown)}")
+    n_cities = len(cities_locations)
+    population = create_population_array(n_cities, pop_size)
+    n_seeded = min(pop_size, int(round(pop_size * seed_fraction)))
+    if n_seeded == 0 or not methods:
+        return population
+
+    seeds = []
+    if isinstance(distance_matrix, CoordinateDistances):
+        if "greedy_edge" not in methods:
+            raise ValueError("Sem matriz de distâncias, só a heurística greedy_edge é suportada")
+        seeds.append(greedy_edge_tour(distance_matrix, distance_matrix.nearest_neighbors(GREEDY_CANDIDATES)))
+        methods = ()
+    elif distance_matrix is None:
+        distance_matrix = get_distance_matrix(cities_locations)
+    if "greedy_edge" in methods:
+        seeds.append(greedy_edge_tour(distance_matrix))
+    if "mst" in methods:
+        seeds.append(mst_double_tree_tour(distance_matrix))
+    if "convex_hull" in methods:
+        seeds.append(convex_hull_insertion_tour(cities_locations, distance_matrix))
+    if "nearest_neighbour" in methods:
+        n_starts = min(n_cities, max(0, n_seeded - len(seeds)))
+        for start in random.sample(range(n_cities), n_starts):
+            seeds.append(nearest_neighbour_tour(distance_matrix, start))
+
+    n_unique = min(len(seeds), n_seeded)
+    for i in range(n_seeded):
+        population[i] = seeds[i % len(seeds)]
+        if i >= n_unique:
+            reverse_mutation_inplace(population[i], 1.0)
+    return population
@@ -0,0 +1,130 @@
+# spatial_index.py
+
+import heapq
+import numpy as np
+
+from ga_logic import POPULATION_DTYPE
+
+class KDTree:
+    """
+    Árvore k-d com folhas de até `leaf_size` cidades sobre as coordenadas.
+
+    Cada nó divide suas cidades ao meio pela mediana do eixo mais largo da
+    sua caixa, então a profundidade é O(log N) e as folhas têm o mesmo número
+    de cidades seja qual for a distribuição (aglomerados, pontos repetidos,
+    pontos colineares). As cidades de cada nó ocupam um trecho contíguo de
+    `order`, sem listas por nó.
+
+    Construir a árvore custa O(N log N) e não usa nenhuma matriz (N, N).
+
+    Args:
+        coords: Coordenadas (N, 2) das cidades.
+        leaf_size (int): Número máximo de cidades por folha.
+    """
+
+    def __init__(self, coords, leaf_size=16):
+        self.coords = np.ascontiguousarray(coords, dtype=np.float64)
+        self.leaf_size = max(1, int(leaf_size))
+        self.order = np.arange(len(self.coords))
+        # Por nó: trecho [start, end) de `order`, caixa (x0, y0, x1, y1) e filhos (None nas folhas).
+        # As caixas ficam em tuplas porque as distâncias entre elas são contas escalares.
+        self.start, self.end, self.boxes, self.children = [], [], [], []
+        if len(self.coords):
+            self._build(0, len(self.coords))
+
+    def _build(self, start, end):
+        """Cria o nó das cidades order[start:end] e, se preciso, seus filhos; retorna o índice do nó."""
+        node = len(self.start)
+        points = self.coords[self.order[start:end]]
+        lower, upper = points.min(axis=0), points.max(axis=0)
+        self.start.append(start)
+        self.end.append(end)
+        self.boxes.append((*lower.tolist(), *upper.tolist()))
+        self.children.append(None)
+        if end - start > self.leaf_size:
+            axis = int(np.argmax(upper - lower))
+            middle = (end - start) // 2
+            split = np.argpartition(points[:, axis], middle)
+            self.order[start:end] = self.order[start:end][split]
+            self.children[node] = (self._build(start, start + middle), self._build(start + middle, end))
+        return node
+
+    def _leaves_by_distance(self, box):
+        """Gera (distância² até `box`, folha) em ordem crescente de distância à caixa `box`."""
+        qx0, qy0, qx1, qy1 = box
+        heap = [(0.0, 0)]
+        while heap:
+            distance, node = heapq.heappop(heap)
+            children = self.children[node]
+            if children is None:
+                yield distance, node
+                continue
+            for child in children:
+                x0, y0, x1, y1 = self.boxes[child]
+                dx = max(x0 - qx1, qx0 - x1, 0.0)
+                dy = max(y0 - qy1, qy0 - y1, 0.0)
+                heapq.heappush(heap, (dx * dx + dy * dy, child))
+
+    def nearest_neighbors(self, k):
+        """
+        Retorna, para cada cidade, as `k` cidades mais próximas em ordem crescente de distância.
+
+        As cidades de uma folha são resolvidas juntas. As folhas são
+        visitadas em ordem de distância até a caixa da folha de consulta: as
+        primeiras, até somar k + 1 cidades, dão para cada cidade um limite
+        superior da distância ao k-ésimo vizinho; continuam sendo visitadas
+        as folhas mais próximas que o maior desses limites, e as distâncias
+        até todas as cidades visitadas saem de uma só operação vetorizada. O
+        resultado é exato; como as folhas acompanham a densidade das cidades,
+        cada consulta visita poucas folhas também em instâncias aglomeradas,
+        e o custo total fica em torno de O(N·(k + log N)).
+
+        Returns:
+            np.ndarray: Matriz (N, k) de índices, com o mesmo formato de
+            `local_search.build_neighbor_lists`.
+        """
+        n_cities = len(self.coords)
+        k = min(k, n_cities - 1)
+        neighbors = np.empty((n_cities, k), dtype=POPULATION_DTYPE)
+        if k <= 0:
+            return neighbors
+        for leaf, children in enumerate(self.children):
+            if children is not None:
+                continue
+            members = self.order[self.start[leaf]:self.end[leaf]]
+            leaves, n_candidates, bound = [], 0, None
+            for distance, candidate_leaf in self._leaves_by_distance(self.boxes[leaf]):
+                if bound is not None and distance >= bound:
+                    break
+                leaves.append(candidate_leaf)
+                n_candidates += self.end[candidate_leaf] - self.start[candidate_leaf]
+                if bound is None and n_candidates > k:
+                    # Limite: o k-ésimo vizinho de cada cidade entre os candidatos já vistos
+                    bound = float(self._nearest(members, leaves, k)[1][:, -1].max())
+            neighbors[members] = self._nearest(members, leaves, k)[0]
+        return neighbors
+
+    def _nearest(self, members, leaves, k):
+        """Os k candidatos mais próximos de cada cidade de `members` entre as cidades de `leaves`."""
+        candidates = np.concatenate([self.order[self.start[leaf]:self.end[leaf]] for leaf in leaves])
+        diff = self.coords[members, np.newaxis, :] - self.coords[np.newaxis, candidates, :]
+        distances = (diff ** 2).sum(axis=-1)
+        distances[members[:, np.newaxis] == candidates[np.newaxis, :]] = np.inf
+        nearest = np.argpartition(distances, k - 1, axis=1)[:, :k]
+        nearest_distances = np.take_along_axis(distances, nearest, axis=1)
+        sorting = np.argsort(nearest_distances, axis=1, kind='stable')
+        return (candidates[np.take_along_axis(nearest, sorting, axis=1)],
+                np.take_along_axis(nearest_distances, sorting, axis=1))
+
+def knn_neighbor_lists(coords, k, leaf_size=None):
+    """
+    Listas (N, k) dos vizinhos mais próximos de cada cidade, calculadas pela árvore k-d.
+
+    Equivalente a `local_search.build_neighbor_lists` com a matriz euclidiana,
+    mas sem montar a matriz (N, N): serve para instâncias com dezenas de
+    milhares de cidades. O tamanho padrão das folhas (2k cidades) faz as
+    primeiras folhas visitadas já conterem os k vizinhos da maioria das cidades.
+    """
+    if leaf_size is None:
+        leaf_size = max(8, 2 * k)
+    return KDTree(coords, leaf_size).nearest_neighbors(k)
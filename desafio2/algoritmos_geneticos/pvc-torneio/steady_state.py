@@ -0,0 +1,313 @@
+# steady_state.py
+
+import argparse
+import heapq
+import random
+import time
+import numpy as np
+
+from ga_engine import GeneticAlgorithm
+from ga_logic import (crossover_into, order_crossover_batch, select_parent_indices, register_child,
+                      population_tour_keys)
+from config import create_cities
+
+# Quem o filho substitui: a pior rota da população ou a pior de um torneio aleatório
+REPLACEMENT_POLICIES = ("worst", "tournament")
+
+# Tamanho padrão do bloco de filhos de cada passo, como fração de P
+OFFSPRING_FRACTION = 0.125
+
+# Filhos gerados por época, em múltiplos de P, antes de desistir
+# (ex.: população convergida em que quase todo filho é duplicata rejeitada)
+MAX_BREEDING_ATTEMPTS = 10
+
+class SteadyStateGA(GeneticAlgorithm):
+    """
+    Variante estacionária (steady-state) do AG: cada passo gera um bloco de filhos e os insere na população.
+
+    Cada filho substitui a pior rota da população (`replacement="worst"`, via
+    heap) ou a pior de um torneio (`"tournament"`), se for melhor que ela; a
+    melhor rota nunca sai. `step()` executa uma época de P filhos aceitos, contada
+    como uma geração. Não suporta seleção adaptativa de operadores.
+
+    Args:
+        cities_locations: Coordenadas das cidades.
+        offspring_per_step (int, opcional): Filhos gerados por passo de reprodução
+            (padrão: `OFFSPRING_FRACTION` de P).
+        replacement (str): Uma de `REPLACEMENT_POLICIES`.
+        replacement_tournament_size (int): Rotas sorteadas no torneio de substituição.
+        **kwargs: Demais parâmetros de `GeneticAlgorithm`.
+    """
+
+    def __init__(self, cities_locations, offspring_per_step=None, replacement="worst", replacement_tournament_size=3,
+                 **kwargs):
+        if replacement not in REPLACEMENT_POLICIES:
+            raise ValueError(f"Política de substituição desconhecida: {replacement!r}")
+        if kwargs.get("adaptive") is not None:
+            raise ValueError("O AG estacionário não suporta seleção adaptativa de operadores")
+        self.offspring_per_step = offspring_per_step
+        self.replacement = replacement
+        self.replacement_tournament_size = replacement_tournament_size
+        self._sorted_indices = None
+        self._improve_remaining = 0
+        super().__init__(cities_locations, **kwargs)
+        if offspring_per_step is None:
+            self.offspring_per_step = offspring_per_step = max(1, int(self.population_size * OFFSPRING_FRACTION))
+        self._children = np.empty((offspring_per_step, self.population.shape[1]), dtype=self.population.dtype)
+        self._children_distances = np.empty(offspring_per_step)
+
+    @property
+    def sorted_indices(self):
+        """Índices da população da melhor para a pior rota, calculados só quando pedidos."""
+        if self._sorted_indices is None:
+            self._sorted_indices = np.argsort(-self.population_fitness, kind='stable')
+        return self._sorted_indices
+
+    @sorted_indices.setter
+    def sorted_indices(self, value):
+        # Atribuído quando a população inteira muda (avaliação inicial, 2-opt da elite, checkpoint)
+        self._sorted_indices = value
+        self._rebuild_order()
+
+    @property
+    def best_individual(self):
+        return self.population[self._best].copy()
+
+    def _rebuild_order(self):
+        """Recria o heap das piores rotas, a melhor rota e as contagens de chaves a partir da população."""
+        self._rebuild_heap()
+        self._best = int(np.argmin(self.population_distances))
+        self._keys = population_tour_keys(self.population)
+        self._tour_counts = {}
+        for key in self._keys:
+            self._tour_counts[key] = self._tour_counts.get(key, 0) + 1
+
+    def _rebuild_heap(self):
+        # Entradas (-distância, índice, versão); a versão invalida entradas de rotas já substituídas
+        self._heap = [(-distance, index, 0) for index, distance in enumerate(self.population_distances.tolist())]
+        self._versions = [0] * len(self.population)
+        heapq.heapify(self._heap)
+
+    def _replacement_target(self):
+        """Índice da rota a ser substituída, ou None se só restar a melhor."""
+        if self.replacement == "tournament":
+            candidates = random.sample(range(len(self.population)),
+                                       min(self.replacement_tournament_size, len(self.population)))
+            candidates = [index for index in candidates if index != self._best]
+            if not candidates:
+                return None
+            return max(candidates, key=lambda index: self.population_distances[index])
+        heap, versions = self._heap, self._versions
+        while heap[0][2] != versions[heap[0][1]]:
+            heapq.heappop(heap)
+        target = heap[0][1]
+        return None if target == self._best else target
+
+    def _replace(self, index, child, distance, key):
+        """Coloca `child` na posição `index` e atualiza o heap, a melhor rota e as chaves."""
+        old_key = self._keys[index]
+        copies = self._tour_counts[old_key] - 1
+        if copies:
+            self._tour_counts[old_key] = copies
+        else:
+            del self._tour_counts[old_key]
+        self._keys[index] = key
+
+        self.population[index] = child
+        self.population_distances[index] = distance
+        self.population_fitness[index] = 1 / (distance + 1e-10)
+        self._sorted_indices = None
+        self._versions[index] += 1
+        heapq.heappush(self._heap, (-distance, index, self._versions[index]))
+        if len(self._heap) > 2 * len(self.population):
+            # Descarta as entradas inválidas acumuladas
+            self._rebuild_heap()
+        if distance < self.population_distances[self._best]:
+            self._best = index
+
+    def _discard(self, key):
+        """Desfaz o registro de um filho aceito pela política de duplicatas mas não inserido."""
+        copies = self._tour_counts[key] - 1
+        if copies:
+            self._tour_counts[key] = copies
+        else:
+            del self._tour_counts[key]
+
+    def breed(self, n_offspring=None):
+        """
+        Um passo de reprodução: gera um bloco de filhos, avalia-os juntos e os insere um a um.
+
+        Seleção, OX, chaves canônicas e avaliação são feitos uma vez para o
+        bloco inteiro (operações vetorizadas); só a mutação por delta, a busca
+        local e a inserção no heap são feitas filho a filho.
+
+        Args:
+            n_offspring (int, opcional): Filhos do bloco (no máximo `offspring_per_step`).
+
+        Returns:
+            int: Número de filhos aceitos (os rejeitados como duplicatas não contam).
+        """
+        clock = self._clock
+        start = clock()
+        n_pairs = min(n_offspring or self.offspring_per_step, self.offspring_per_step)
+        population, population_distances = self.population, self.population_distances
+        parent_pairs = select_parent_indices(self.population_fitness, 2 * n_pairs, self.selection,
+                                             self.tournament_size, self.selection_pressure,
+                                             self.tournament_replacement).reshape(n_pairs, 2)
+        children, distances = self._children[:n_pairs], self._children_distances[:n_pairs]
+        crossing = np.random.random(n_pairs) < self.crossover_probability
+        selected = clock()
+        if self.crossover == "ox" and crossing.any():
+            # O OX em bloco só nos pares que vão de fato cruzar
+            ox_parents = parent_pairs[crossing]
+            children[crossing] = order_crossover_batch(population[ox_parents[:, 0]], population[ox_parents[:, 1]])
+        batched = clock()
+        crossover_time = mutation_time = search_time = 0
+        for row, ((parent1, parent2), is_crossed) in enumerate(zip(parent_pairs.tolist(), crossing.tolist())):
+            child = children[row]
+            started = clock()
+            if is_crossed:
+                if self.crossover != "ox":
+                    crossover_into(self.crossover, population[parent1], population[parent2], child,
+                                   self._crossover_distances, self._neighbors)
+                child_distance = np.nan
+            else:
+                parent = parent1 if random.random() < 0.5 else parent2
+                child[:] = population[parent]
+                child_distance = population_distances[parent]
+            crossed = clock()
+            child_distance += self._mutate(child, self.mutation, self.mutation_probability)
+            mutated = clock()
+            if self._improve_remaining > 0:
+                child_distance -= self.local_searcher.improve(child)
+                self._improve_remaining -= 1
+            distances[row] = child_distance
+            crossover_time += crossed - started
+            mutation_time += mutated - crossed
+            search_time += clock() - mutated
+
+        # Duplicatas são checadas contra a população inteira e os outros filhos do bloco
+        checking = clock()
+        accepted, accepted_keys = [], []
+        for row, key in enumerate(population_tour_keys(children)):
+            self._child_distance = distances[row]
+            key = register_child(children[row], self._tour_counts, self.duplicate_policy,
+                                 self.max_duplicate_copies, mutate=self._mutate_duplicate, key=key)
+            if key is not None:
+                distances[row] = self._child_distance
+                accepted.append(row)
+                accepted_keys.append(key)
+        checked = clock()
+
+        children, distances = children[accepted], distances[accepted]
+        missing = np.isnan(distances)
+        if missing.any():
+            distances[missing] = self._score(
+                children[missing], keys=[key for key, is_missing in zip(accepted_keys, missing.tolist()) if is_missing])
+        evaluated = clock()
+
+        for child, distance, key in zip(children, distances.tolist(), accepted_keys):
+            target = self._replacement_target()
+            if target is None or distance >= population_distances[target]:
+                self._discard(key)
+            else:
+                self._replace(target, child, distance, key)
+
+        self.record_time("selection", selected - start)
+        self.record_time("crossover", crossover_time + batched - selected)
+        self.record_time("mutation", mutation_time)
+        self.record_time("local_search", search_time)
+        self.record_time("duplicates", checked - checking)
+        self.record_time("evaluation", evaluated - checked)
+        self.record_time("sorting", clock() - evaluated)
+        return len(accepted)
+
+    def step(self):
+        """Executa uma época (passos de reprodução até somar P filhos aceitos) e registra as estatísticas."""
+        clock = self._clock
+        if self.local_search == "elite":
+            start = clock()
+            self._improve_elite()
+            self.record_time("local_search", clock() - start)
+        self._improve_remaining = self.local_search_budget if self.local_search == "offspring" else 0
+
+        n_children = 0
+        n_blocks = -(-MAX_BREEDING_ATTEMPTS * self.population_size // self.offspring_per_step)
+        for _ in range(n_blocks):
+            if n_children >= self.population_size:
+                break
+            # O último bloco da época é encurtado para não passar de P filhos
+            n_children += self.breed(self.population_size - n_children)
+
+        self.generation += 1
+        best = self._best
+        self.best_fitness_history.append(self.population_fitness[best])
+        self.best_distance_history.append(self.population_distances[best])
+        self.avg_distance_history.append(np.mean(self.population_distances))
+        if self.population_distances[best] < self.incumbent_distance:
+            self.incumbent = self.population[best].copy()
+            self.incumbent_distance = float(self.population_distances[best])
+
+def create_genetic_algorithm(cities_locations, replacement=None, **kwargs):
+    """
+    Cria o AG geracional ou, com uma política em `replacement`, o estacionário.
+
+    Args:
+        cities_locations: Coordenadas das cidades.
+        replacement (str, opcional): None para `GeneticAlgorithm`; uma de
+            `REPLACEMENT_POLICIES` para `SteadyStateGA`.
+        **kwargs: Parâmetros repassados ao construtor.
+    """
+    if replacement is None:
+        kwargs.pop("offspring_per_step", None)
+        kwargs.pop("replacement_tournament_size", None)
+        return GeneticAlgorithm(cities_locations, **kwargs)
+    return SteadyStateGA(cities_locations, replacement=replacement, **kwargs)
+
+def compare_throughput(cities_locations, population_size, n_generations, seed=0, **kwargs):
+    """
+    Executa o AG geracional e o estacionário com a mesma semente e mede avaliações por segundo.
+
+    Returns:
+        list[dict]: Uma linha por variante, com "engine", "evaluations",
+        "elapsed", "evaluations_per_second" e "best_distance".
+    """
+    rows = []
+    for engine, replacement in (("geracional", None), ("estacionário", "worst")):
+        random.seed(seed)
+        np.random.seed(seed)
+        ga = create_genetic_algorithm(cities_locations, replacement=replacement, population_size=population_size,
+                                      **kwargs)
+        start = time.perf_counter()
+        ga.run(n_generations)
+        elapsed = time.perf_counter() - start
+        rows.append({"engine": engine, "evaluations": ga.evaluations, "elapsed": elapsed,
+                     "evaluations_per_second": ga.evaluations / max(elapsed, 1e-9),
+                     "best_distance": ga.incumbent_distance})
+    return rows
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Compara a vazão (avaliações/s) do AG geracional e do estacionário.")
+    parser.add_argument("--cities", type=int, default=80, help="número de cidades (padrão: %(default)s)")
+    parser.add_argument("--population", type=int, default=1000, help="tamanho da população (padrão: %(default)s)")
+    parser.add_argument("--generations", type=int, default=60,
+                        help="gerações (épocas de P avaliações no estacionário) (padrão: %(default)s)")
+    parser.add_argument("--offspring-per-step", type=int, default=None,
+                        help="filhos por bloco no AG estacionário (padrão: P/8)")
+    parser.add_argument("--seed", type=int, default=0, help="semente dos geradores aleatórios (padrão: %(default)s)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    random.seed(args.seed)
+    cities_locations = create_cities(args.cities)
+    rows = compare_throughput(cities_locations, args.population, args.generations, args.seed,
+                              offspring_per_step=args.offspring_per_step)
+    print(f"{'AG':<13} | {'Avaliações':>10} | {'Tempo':>8} | {'Aval./s':>9} | {'Melhor':>9}")
+    for row in rows:
+        print(f"{row['engine']:<13} | {row['evaluations']:>10} | {row['elapsed']:>7.2f}s | "
+              f"{row['evaluations_per_second']:>9.0f} | {row['best_distance']:>9.1f}")
+
+if __name__ == '__main__':
+    main()
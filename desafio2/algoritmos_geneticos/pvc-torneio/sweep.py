@@ -0,0 +1,354 @@
+# sweep.py
+
+import argparse
+import csv
+import itertools
+import json
+import math
+import multiprocessing
+import random
+import sqlite3
+import time
+import numpy as np
+
+from steady_state import create_genetic_algorithm
+from tsplib import bundled_instances, load_instance
+from budget import Budget
+from benchmark import BASE_PARAMS
+
+# --- Parâmetros da Varredura ---
+SWEEP_INSTANCES = ("berlin52",)
+SWEEP_GENERATIONS = 500  # Gerações de cada execução (na última rodada, com successive halving)
+SWEEP_SEEDS = 3
+RANDOM_SAMPLES = 20  # Configurações sorteadas na busca aleatória
+HALVING_ETA = 3  # Fração (1/eta) das configurações mantidas a cada rodada do successive halving
+MIN_GENERATIONS = 20  # Menor orçamento de gerações de uma rodada do successive halving
+
+# Espaço de busca: lista = valores possíveis; tupla (mín, máx) = intervalo (só na busca aleatória).
+# "convergence_generations" vai para o critério de parada; os demais, para `create_genetic_algorithm`.
+SEARCH_SPACE = {
+    "population_size": [100, 200, 400],
+    "mutation_probability": [0.05, 0.1, 0.2],
+    "crossover_probability": [0.8, 0.95],
+    "tournament_size": [3, 5, 10],
+    "convergence_generations": [50, 100, 200],
+}
+
+SEARCH_METHODS = ("grid", "random")
+
+SWEEP_FIELDS = ("config_id", "rung", "params", "instance", "seed", "max_generations", "best_distance", "gap",
+                "generations", "evaluations", "elapsed", "stop_reason")
+
+def grid_configurations(space):
+    """Todas as combinações dos valores de `space` (cada valor deve ser uma lista)."""
+    ranges = [name for name, values in space.items() if not isinstance(values, list)]
+    if ranges:
+        raise ValueError(f"A busca em grade exige listas de valores: {ranges}")
+    names = list(space)
+    return [dict(zip(names, values)) for values in itertools.product(*(space[name] for name in names))]
+
+def random_configurations(space, n_samples, rng=random):
+    """
+    Sorteia `n_samples` configurações distintas de `space`.
+
+    Listas são sorteadas entre seus valores e tuplas (mín, máx) uniformemente
+    no intervalo (inteiro se os dois limites forem inteiros).
+    """
+    def sample(values):
+        if isinstance(values, list):
+            return rng.choice(values)
+        low, high = values
+        if isinstance(low, int) and isinstance(high, int):
+            return rng.randint(low, high)
+        return rng.uniform(low, high)
+
+    configurations, seen = [], set()
+    for _ in range(100 * n_samples):
+        if len(configurations) == n_samples:
+            break
+        config = {name: sample(values) for name, values in space.items()}
+        key = json.dumps(config, sort_keys=True)
+        if key not in seen:
+            seen.add(key)
+            configurations.append(config)
+    return configurations
+
+def parse_param(text):
+    """
+    Lê um parâmetro do espaço de busca na forma "nome=v1,v2,..." ou "nome=mín:máx".
+
+    Returns:
+        tuple: (nome, lista de valores ou tupla (mín, máx)).
+    """
+    def number(value):
+        try:
+            return int(value)
+        except ValueError:
+            return float(value)
+
+    name, _, values = text.partition("=")
+    if not values:
+        raise ValueError(f"Parâmetro sem valores: {text!r}")
+    if ":" in values:
+        low, high = values.split(":")
+        return name, (number(low), number(high))
+    return name, [number(value) for value in values.split(",")]
+
+# Instâncias já carregadas em cada processo do pool
+_worker_instances = {}
+
+def run_sweep_trial(task):
+    """
+    Executa uma configuração numa instância e semente, dentro de um processo do pool.
+
+    Returns:
+        dict: Uma linha do resultado, com as chaves de `SWEEP_FIELDS`.
+    """
+    config_id, rung, params, instance_name, seed, max_generations, time_limit = task
+    if instance_name not in _worker_instances:
+        _worker_instances[instance_name] = load_instance(instance_name)
+    instance = _worker_instances[instance_name]
+    random.seed(seed)
+    np.random.seed(seed)
+
+    ga_params = {**BASE_PARAMS, **params}
+    convergence_generations = ga_params.pop("convergence_generations", None)
+    start = time.perf_counter()
+    ga = create_genetic_algorithm(instance.coords, distance_matrix=instance.distance_matrix, **ga_params)
+    ga.run(budget=Budget(max_generations, time_limit, convergence_generations=convergence_generations))
+    elapsed = time.perf_counter() - start
+    return {
+        "config_id": config_id,
+        "rung": rung,
+        "params": json.dumps(params, sort_keys=True),
+        "instance": instance_name,
+        "seed": seed,
+        "max_generations": max_generations,
+        "best_distance": ga.incumbent_distance,
+        "gap": instance.gap(ga.incumbent_distance),
+        "generations": ga.generation,
+        "evaluations": ga.evaluations,
+        "elapsed": elapsed,
+        "stop_reason": ga.stop_reason,
+    }
+
+class ResultsStore:
+    """
+    Tabela local com uma linha por execução, em SQLite e/ou CSV.
+
+    As linhas são gravadas assim que cada execução termina, então uma
+    varredura interrompida mantém os resultados já obtidos.
+
+    Args:
+        db_path (str, opcional): Banco SQLite (tabela `trials`, criada se não existir).
+        csv_path (str, opcional): Arquivo CSV com as colunas de `SWEEP_FIELDS`.
+    """
+
+    def __init__(self, db_path=None, csv_path=None):
+        self._db = self._csv_file = self._csv = None
+        if db_path:
+            self._db = sqlite3.connect(db_path)
+            self._db.execute(f"CREATE TABLE IF NOT EXISTS trials ({', '.join(SWEEP_FIELDS)})")
+        if csv_path:
+            self._csv_file = open(csv_path, "w", newline="")
+            self._csv = csv.DictWriter(self._csv_file, fieldnames=SWEEP_FIELDS)
+            self._csv.writeheader()
+
+    def add(self, row):
+        if self._db is not None:
+            placeholders = ", ".join("?" for _ in SWEEP_FIELDS)
+            self._db.execute(f"INSERT INTO trials VALUES ({placeholders})", [row[field] for field in SWEEP_FIELDS])
+            self._db.commit()
+        if self._csv is not None:
+            self._csv.writerow(row)
+            self._csv_file.flush()
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+        if self._csv_file is not None:
+            self._csv_file.close()
+            self._csv_file = None
+
+def _rung_budgets(n_configurations, max_generations, eta, min_generations):
+    """Gerações de cada rodada do successive halving, da primeira (menor) até `max_generations`."""
+    n_rungs = 1 + int(math.log(max(n_configurations, 1), eta) + 1e-9)
+    budgets = [max(min_generations, int(max_generations / eta ** (n_rungs - 1 - rung))) for rung in range(n_rungs)]
+    # Rodadas que acabariam com o mesmo orçamento são fundidas
+    return sorted(set(min(budget, max_generations) for budget in budgets))
+
+def run_sweep(configurations, instance_names=SWEEP_INSTANCES, seeds=range(SWEEP_SEEDS),
+              max_generations=SWEEP_GENERATIONS, time_limit=None, n_workers=None, halving=False,
+              eta=HALVING_ETA, min_generations=MIN_GENERATIONS, store=None, on_trial=None):
+    """
+    Executa cada configuração em todas as instâncias e sementes, num pool de processos.
+
+    Sem `halving`, todas as configurações rodam `max_generations` gerações.
+    Com `halving` (successive halving), a varredura é feita em rodadas de
+    orçamento crescente (× `eta` por rodada, terminando em `max_generations`):
+    ao fim de cada rodada só o melhor 1/`eta` das configurações, pelo gap
+    médio, segue para a próxima, e as ruins deixam de ocupar os núcleos cedo.
+    Todas as configurações usam as mesmas sementes, o que reduz o ruído das
+    comparações.
+
+    Args:
+        configurations (list[dict]): Parâmetros de cada configuração (veja `SEARCH_SPACE`).
+        instance_names: Instâncias incluídas em `instances/`.
+        seeds: Sementes; cada uma gera uma execução por configuração e instância.
+        max_generations (int): Gerações de cada execução (da última rodada).
+        time_limit (float, opcional): Segundos por execução.
+        n_workers (int, opcional): Processos do pool (padrão: núcleos).
+        halving (bool): Usa successive halving.
+        eta (int): Fator de redução por rodada.
+        min_generations (int): Orçamento mínimo da primeira rodada.
+        store (ResultsStore, opcional): Onde gravar cada execução.
+        on_trial (callable, opcional): Chamado como `on_trial(row)` após cada execução.
+
+    Returns:
+        list[dict]: Uma linha por execução, de todas as rodadas.
+    """
+    n_workers = n_workers or multiprocessing.cpu_count()
+    budgets = _rung_budgets(len(configurations), max_generations, eta, min_generations) if halving \
+        else [max_generations]
+    survivors = list(range(len(configurations)))
+    rows = []
+    with multiprocessing.Pool(n_workers) as pool:
+        for rung, generations in enumerate(budgets):
+            tasks = [(config_id, rung, configurations[config_id], instance_name, seed, generations, time_limit)
+                     for config_id in survivors for instance_name in instance_names for seed in seeds]
+            rung_rows = []
+            for row in pool.imap_unordered(run_sweep_trial, tasks):
+                rung_rows.append(row)
+                if store is not None:
+                    store.add(row)
+                if on_trial is not None:
+                    on_trial(row)
+            rows.extend(rung_rows)
+            if rung < len(budgets) - 1:
+                ranking = summarize_sweep(rung_rows)
+                survivors = [line["config_id"] for line in ranking[:max(1, math.ceil(len(survivors) / eta))]]
+    return rows
+
+def _relative_gaps(rows):
+    """Gap de cada linha: até o ótimo conhecido ou, sem ele, até a melhor distância da instância na rodada."""
+    best_found = {}
+    for row in rows:
+        key = (row["rung"], row["instance"])
+        best_found[key] = min(best_found.get(key, np.inf), row["best_distance"])
+    gaps = []
+    for row in rows:
+        if row["gap"] is not None:
+            gaps.append(row["gap"])
+        else:
+            best = best_found[(row["rung"], row["instance"])]
+            gaps.append((row["best_distance"] - best) / best)
+    return gaps
+
+def _dominates(a, b):
+    """Se a configuração `a` é tão boa e tão rápida quanto `b` e estritamente melhor em um dos dois."""
+    return (a["mean_gap"] <= b["mean_gap"] and a["mean_elapsed"] <= b["mean_elapsed"]
+            and (a["mean_gap"] < b["mean_gap"] or a["mean_elapsed"] < b["mean_elapsed"]))
+
+def summarize_sweep(rows):
+    """
+    Agrupa as execuções por configuração, na rodada mais alta que cada uma atingiu, e as ordena.
+
+    As configurações que chegaram mais longe vêm primeiro e, dentro de cada
+    rodada, as de menor gap médio. `pareto` marca as configurações não
+    dominadas em (gap médio, tempo médio) na mesma rodada: nenhuma outra é ao
+    mesmo tempo melhor e mais rápida.
+
+    Returns:
+        list[dict]: Uma linha por configuração, da melhor para a pior.
+    """
+    top_rung = {}
+    for row in rows:
+        top_rung[row["config_id"]] = max(top_rung.get(row["config_id"], 0), row["rung"])
+    groups = {}
+    for row, gap in zip(rows, _relative_gaps(rows)):
+        if row["rung"] == top_rung[row["config_id"]]:
+            groups.setdefault(row["config_id"], []).append((row, gap))
+
+    summary = []
+    for config_id, group in groups.items():
+        summary.append({
+            "config_id": config_id,
+            "rung": group[0][0]["rung"],
+            "params": json.loads(group[0][0]["params"]),
+            "runs": len(group),
+            "mean_gap": float(np.mean([gap for _, gap in group])),
+            "best_gap": float(min(gap for _, gap in group)),
+            "mean_elapsed": float(np.mean([row["elapsed"] for row, _ in group])),
+            "mean_generations": float(np.mean([row["generations"] for row, _ in group])),
+        })
+    for line in summary:
+        line["pareto"] = not any(other["rung"] == line["rung"] and _dominates(other, line) for other in summary)
+    summary.sort(key=lambda line: (-line["rung"], line["mean_gap"], line["mean_elapsed"]))
+    return summary
+
+def print_ranking(summary, top=10):
+    """Exibe as `top` melhores configurações como tabela no terminal (* = fronteira de Pareto)."""
+    print(f"{'#':>3} | {'Rodada':>6} | {'Gap médio':>10} | {'Melhor gap':>10} | {'Tempo':>8} | {'Gerações':>8} | "
+          f"Parâmetros")
+    for position, line in enumerate(summary[:top], start=1):
+        params = ", ".join(f"{name}={value}" for name, value in line["params"].items())
+        marker = "*" if line["pareto"] else " "
+        print(f"{position:>3} | {line['rung']:>6} | {line['mean_gap']:>10.2%} | {line['best_gap']:>10.2%} | "
+              f"{line['mean_elapsed']:>7.2f}s | {line['mean_generations']:>8.0f} | {marker} {params}")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Varredura de hiperparâmetros do AG em paralelo (grade ou "
+                                                 "aleatória, com successive halving opcional).")
+    parser.add_argument("--search", choices=SEARCH_METHODS, default="random",
+                        help="busca em grade ou aleatória (padrão: %(default)s)")
+    parser.add_argument("--samples", type=int, default=RANDOM_SAMPLES,
+                        help="configurações sorteadas na busca aleatória (padrão: %(default)s)")
+    parser.add_argument("--param", action="append", default=[], metavar="NOME=V1,V2|MÍN:MÁX",
+                        help="substitui ou acrescenta um parâmetro ao espaço de busca (pode ser repetido)")
+    parser.add_argument("--instances", nargs="+", choices=bundled_instances(), default=list(SWEEP_INSTANCES),
+                        help="instâncias avaliadas (padrão: %(default)s)")
+    parser.add_argument("--seeds", type=int, default=SWEEP_SEEDS,
+                        help="execuções (sementes 0..N-1) por configuração e instância (padrão: %(default)s)")
+    parser.add_argument("--generations", type=int, default=SWEEP_GENERATIONS,
+                        help="gerações de cada execução (padrão: %(default)s)")
+    parser.add_argument("--time-limit", type=float, default=None, help="segundos por execução")
+    parser.add_argument("--halving", action="store_true", help="descarta as piores configurações em rodadas "
+                                                               "de orçamento crescente (successive halving)")
+    parser.add_argument("--eta", type=int, default=HALVING_ETA,
+                        help="fator de redução do successive halving (padrão: %(default)s)")
+    parser.add_argument("--workers", type=int, default=None, help="processos do pool (padrão: núcleos)")
+    parser.add_argument("--db", default=None, help="grava cada execução neste banco SQLite")
+    parser.add_argument("--csv", default=None, help="grava cada execução neste arquivo CSV")
+    parser.add_argument("--top", type=int, default=10,
+                        help="configurações exibidas no ranking (padrão: %(default)s)")
+    parser.add_argument("--seed", type=int, default=None, help="semente do sorteio das configurações")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    space = dict(SEARCH_SPACE)
+    for text in args.param:
+        name, values = parse_param(text)
+        space[name] = values
+    if args.search == "grid":
+        configurations = grid_configurations(space)
+    else:
+        configurations = random_configurations(space, args.samples, random.Random(args.seed))
+    print(f"{len(configurations)} configurações × {len(args.instances)} instâncias × {args.seeds} sementes")
+
+    def log_trial(row):
+        gap = f"{row['gap']:.2%}" if row["gap"] is not None else "-"
+        print(f"config {row['config_id']} (rodada {row['rung']}) / {row['instance']} / semente {row['seed']}: "
+              f"{row['best_distance']:.0f} (gap {gap}, {row['elapsed']:.2f}s)")
+
+    store = ResultsStore(args.db, args.csv)
+    try:
+        rows = run_sweep(configurations, args.instances, range(args.seeds), args.generations, args.time_limit,
+                         args.workers, args.halving, args.eta, store=store, on_trial=log_trial)
+    finally:
+        store.close()
+    print_ranking(summarize_sweep(rows), args.top)
+
+if __name__ == '__main__':
+    main()
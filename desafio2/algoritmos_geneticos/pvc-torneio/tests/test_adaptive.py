@@ -0,0 +1,60 @@
+# test_adaptive.py
+
+import random
+
+import numpy as np
+import pytest
+
+from adaptive import ADAPTATION_SCHEMES, AdaptiveOperatorSelector
+from ga_engine import MUTATION_OPERATORS, GeneticAlgorithm
+from ga_logic import calculate_population_distances
+
+
+@pytest.mark.parametrize("scheme", ADAPTATION_SCHEMES)
+def test_rewarded_operator_gains_probability(scheme):
+    np.random.seed(0)
+    selector = AdaptiveOperatorSelector(["a", "b", "c"], scheme, p_min=0.05)
+    for _ in range(30):
+        indices = selector.select(300)
+        selector.update(indices, np.where(indices == 1, 1.0, 0.01))
+    probabilities = selector.as_dict()
+    assert probabilities["b"] > 0.6
+    assert min(probabilities.values()) >= 0.05 - 1e-12
+    assert sum(probabilities.values()) == pytest.approx(1.0)
+
+
+def test_adaptive_pursuit_converges_to_p_max():
+    selector = AdaptiveOperatorSelector(["a", "b"], "adaptive_pursuit", p_min=0.1)
+    for _ in range(60):
+        selector.update(np.array([0, 1]), np.array([0.0, 1.0]))
+    np.testing.assert_allclose(selector.probabilities, [0.1, 0.9])
+
+
+def test_zero_rewards_keep_probabilities_valid():
+    np.random.seed(1)
+    # Com alpha = 1, uma recompensa nula zera a qualidade na hora
+    selector = AdaptiveOperatorSelector(["a", "b", "c"], "probability_matching", alpha=1.0)
+    for _ in range(5):
+        selector.update(np.array([0, 1, 2]), np.zeros(3))
+    assert np.all(np.isfinite(selector.probabilities))
+    assert selector.probabilities.sum() == pytest.approx(1.0)
+    selector.select(10)
+
+
+def test_selector_rejects_invalid_settings():
+    with pytest.raises(ValueError):
+        AdaptiveOperatorSelector(["a", "b"], "greedy")
+    with pytest.raises(ValueError):
+        AdaptiveOperatorSelector(["a", "b"], p_min=0.6)
+
+
+def test_adaptive_ga_records_operator_probabilities():
+    rng = np.random.default_rng(1)
+    cities = [tuple(city) for city in rng.uniform(0, 1000, size=(20, 2)).tolist()]
+    random.seed(2)
+    np.random.seed(2)
+    ga = GeneticAlgorithm(cities, population_size=30, adaptive="adaptive_pursuit",
+                          adaptive_crossovers=["ox", "pmx"]).run(6)
+    assert len(ga.operator_history) == 5
+    assert set(ga.operator_history[-1]) == {"ox", "pmx", "clone", *MUTATION_OPERATORS}
+    np.testing.assert_allclose(ga.population_distances, calculate_population_distances(ga.population, cities))
@@ -0,0 +1,70 @@
+# test_budget.py
+
+import random
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from budget import Budget
+from ga_engine import GeneticAlgorithm
+
+
+def fake_ga(generation=1, evaluations=0, best_distance=100.0, population_size=10, converged=False):
+    return SimpleNamespace(generation=generation, evaluations=evaluations, best_distance=best_distance,
+                           population_size=population_size, has_converged=lambda window: converged)
+
+
+def test_unlimited_budget_never_stops():
+    assert Budget().exhausted(fake_ga(generation=10 ** 6, evaluations=10 ** 9)) is None
+
+
+def test_target_is_reached_on_equality_and_takes_precedence():
+    budget = Budget(max_generations=5, target_distance=100.0)
+    assert budget.exhausted(fake_ga(generation=5, best_distance=100.0)) == "target"
+    assert budget.exhausted(fake_ga(generation=5, best_distance=100.5)) == "generations"
+    assert budget.exhausted(fake_ga(generation=4, best_distance=100.5)) is None
+
+
+def test_evaluation_limit_stops_before_the_next_generation_would_exceed_it():
+    budget = Budget(max_evaluations=100)
+    assert budget.exhausted(fake_ga(evaluations=90, population_size=10)) is None
+    assert budget.exhausted(fake_ga(evaluations=91, population_size=10)) == "evaluations"
+
+
+def test_time_limit_accounts_for_the_last_generation_duration():
+    budget = Budget(time_limit=10.0)
+    assert budget.exhausted(fake_ga()) is None
+    # Simula uma geração de 8 s: a próxima passaria dos 10 s
+    budget.start_time -= 8.0
+    budget._last_check -= 8.0
+    assert budget.exhausted(fake_ga()) == "time_limit"
+
+
+def test_convergence_is_checked_last():
+    assert Budget(convergence_generations=3).exhausted(fake_ga(converged=True)) == "convergence"
+    assert Budget(max_generations=1).exhausted(fake_ga(converged=True)) == "generations"
+
+
+@pytest.fixture
+def cities():
+    rng = np.random.default_rng(0)
+    return [tuple(city) for city in rng.uniform(0, 1000, size=(20, 2)).tolist()]
+
+
+@pytest.mark.parametrize("budget, reason", [
+    (Budget(max_generations=7), "generations"),
+    (Budget(max_evaluations=100), "evaluations"),
+    (Budget(target_distance=np.inf), "target"),
+])
+def test_run_records_stop_reason_and_incumbent(cities, budget, reason):
+    random.seed(1)
+    np.random.seed(1)
+    ga = GeneticAlgorithm(cities, population_size=30).run(budget=budget)
+    assert ga.stop_reason == reason
+    assert ga.incumbent_distance == min(ga.best_distance_history)
+    assert sorted(ga.incumbent.tolist()) == list(range(20))
+    if reason == "generations":
+        assert ga.generation == 7
+    if reason == "evaluations":
+        assert ga.evaluations <= 100
@@ -0,0 +1,77 @@
+# test_checkpoint.py
+
+import random
+
+import numpy as np
+import pytest
+
+from steady_state import create_genetic_algorithm
+from checkpoint import save_checkpoint, load_checkpoint, restore_checkpoint
+
+CONFIGURATIONS = {
+    "generational": {},
+    "memetic": {"local_search": "offspring", "local_search_budget": 3},
+    "adaptive": {"adaptive": "probability_matching", "adaptive_crossovers": ["ox", "pmx"]},
+    "steady-state": {"replacement": "worst"},
+}
+
+
+def build(cities, params, initial_population=None):
+    return create_genetic_algorithm(cities, population_size=60, initial_population=initial_population, **params)
+
+
+@pytest.mark.parametrize("name", list(CONFIGURATIONS))
+def test_resumed_run_is_identical_to_uninterrupted_run(tmp_path, name):
+    params = CONFIGURATIONS[name]
+    random.seed(7)
+    np.random.seed(7)
+    cities = [(random.randint(0, 800), random.randint(0, 600)) for _ in range(25)]
+
+    random.seed(8)
+    np.random.seed(8)
+    uninterrupted = build(cities, params)
+    for _ in range(20):
+        uninterrupted.step()
+
+    random.seed(8)
+    np.random.seed(8)
+    interrupted = build(cities, params)
+    for _ in range(10):
+        interrupted.step()
+    path = str(tmp_path / "run.npz")
+    save_checkpoint(path, interrupted)
+    # Gera números aleatórios antes de retomar: o checkpoint precisa restaurar o estado dos geradores
+    random.random()
+    np.random.random()
+
+    checkpoint = load_checkpoint(path)
+    resumed = restore_checkpoint(build(checkpoint["cities"], params, checkpoint["population"]), checkpoint)
+    for _ in range(10):
+        resumed.step()
+
+    assert resumed.generation == uninterrupted.generation
+    assert resumed.evaluations == uninterrupted.evaluations
+    assert resumed.best_distance_history == uninterrupted.best_distance_history
+    assert resumed.avg_distance_history == uninterrupted.avg_distance_history
+    np.testing.assert_array_equal(resumed.population, uninterrupted.population)
+    np.testing.assert_array_equal(resumed.population_distances, uninterrupted.population_distances)
+    assert resumed.incumbent_distance == uninterrupted.incumbent_distance
+    if name == "adaptive":
+        assert resumed.operator_history == uninterrupted.operator_history
+
+
+def test_checkpoint_keeps_run_parameters(tmp_path):
+    random.seed(1)
+    cities = [(random.randint(0, 800), random.randint(0, 600)) for _ in range(10)]
+    ga = build(cities, {"local_search": "elite", "local_search_budget": 4,
+                        "replacement": "tournament", "offspring_per_step": 4})
+    path = str(tmp_path / "params.npz")
+    save_checkpoint(path, ga, metadata={"seed": 1})
+    checkpoint = load_checkpoint(path)
+    assert checkpoint["params"]["local_search"] == "elite"
+    assert checkpoint["params"]["local_search_budget"] == 4
+    assert checkpoint["params"]["replacement"] == "tournament"
+    assert checkpoint["params"]["offspring_per_step"] == 4
+    assert checkpoint["params"]["population_size"] == 60
+    assert checkpoint["metadata"] == {"seed": 1}
+    assert checkpoint["cities"] == cities
@@ -0,0 +1,57 @@
+# test_coordinate_distances.py
+
+import random
+
+import numpy as np
+import pytest
+
+from coordinate_distances import CoordinateDistances
+from ga_engine import GeneticAlgorithm
+from ga_logic import POPULATION_DTYPE, build_distance_matrix, score_paths
+from tsplib import euc_2d_matrix, ceil_2d_matrix, att_matrix
+
+MATRICES = {
+    "euclidean": lambda coords: build_distance_matrix(coords.tolist()),
+    "EUC_2D": euc_2d_matrix,
+    "CEIL_2D": ceil_2d_matrix,
+    "ATT": att_matrix,
+}
+
+
+@pytest.fixture
+def coords():
+    return np.random.default_rng(0).integers(0, 5000, size=(40, 2)).astype(np.float64)
+
+
+@pytest.mark.parametrize("metric", list(MATRICES))
+def test_coordinate_distances_match_dense_matrix(coords, metric):
+    matrix = MATRICES[metric](coords)
+    distances = CoordinateDistances(coords, metric)
+    rng = np.random.default_rng(1)
+    for a, b in rng.integers(0, 40, size=(50, 2)).tolist():
+        assert distances[a, b] == pytest.approx(matrix[a, b])
+        assert distances[a][b] == distances[a, b]
+    paths = np.array([rng.permutation(40) for _ in range(70)], dtype=POPULATION_DTYPE)
+    np.testing.assert_allclose(distances.tour_lengths(paths), score_paths(paths, matrix))
+    np.testing.assert_allclose(score_paths(paths, distances), score_paths(paths, matrix))
+
+
+def test_nearest_neighbors_are_cached_with_their_distances(coords):
+    distances = CoordinateDistances(coords)
+    neighbors = distances.nearest_neighbors(5)
+    assert distances.nearest_neighbors(5) is neighbors
+    matrix = build_distance_matrix(coords.tolist())
+    np.testing.assert_allclose(distances.neighbor_distances, np.take_along_axis(matrix, neighbors.astype(np.intp), 1))
+    with pytest.raises(ValueError):
+        CoordinateDistances(coords, "GEO")
+
+
+def test_matrix_free_ga_matches_matrix_run(coords):
+    cities = [tuple(city) for city in coords.tolist()]
+    histories = []
+    for matrix_free in (False, True):
+        random.seed(2)
+        np.random.seed(2)
+        ga = GeneticAlgorithm(cities, population_size=30, matrix_free=matrix_free).run(8)
+        histories.append(ga.best_distance_history)
+    np.testing.assert_allclose(histories[0], histories[1])
@@ -0,0 +1,84 @@
+# test_crossover.py
+
+import random
+
+import numpy as np
+import pytest
+
+from ga_logic import (POPULATION_DTYPE, CROSSOVER_OPERATORS, build_distance_matrix, crossover_into, order_crossover,
+                      order_crossover_into, order_crossover_batch)
+from local_search import build_neighbor_lists
+
+
+def random_instance(n_cities, seed):
+    rng = np.random.default_rng(seed)
+    distance_matrix = build_distance_matrix(rng.uniform(0, 1000, size=(n_cities, 2)).tolist())
+    return distance_matrix, build_neighbor_lists(distance_matrix, min(5, n_cities - 1))
+
+
+def random_parents(n_cities, rng):
+    return (rng.permutation(n_cities).astype(POPULATION_DTYPE),
+            rng.permutation(n_cities).astype(POPULATION_DTYPE))
+
+
+@pytest.mark.parametrize("operator", CROSSOVER_OPERATORS)
+@pytest.mark.parametrize("n_cities", [2, 3, 4, 5, 6, 8, 13, 40])
+def test_crossover_returns_valid_permutation(operator, n_cities):
+    random.seed(n_cities)
+    rng = np.random.default_rng(n_cities)
+    distance_matrix, neighbor_lists = random_instance(n_cities, n_cities)
+    for _ in range(50):
+        parent1, parent2 = random_parents(n_cities, rng)
+        out = np.empty(n_cities, dtype=POPULATION_DTYPE)
+        child = crossover_into(operator, parent1, parent2, out, distance_matrix.tolist(), neighbor_lists)
+        assert child is out
+        assert sorted(out.tolist()) == list(range(n_cities))
+
+
+@pytest.mark.parametrize("operator", CROSSOVER_OPERATORS)
+def test_crossover_of_identical_parents_keeps_the_tour(operator):
+    random.seed(0)
+    distance_matrix, neighbor_lists = random_instance(20, 0)
+    parent = np.random.default_rng(0).permutation(20).astype(POPULATION_DTYPE)
+    out = np.empty_like(parent)
+    crossover_into(operator, parent, parent.copy(), out, distance_matrix.tolist(), neighbor_lists)
+    # O filho tem exatamente as arestas do pai (pode vir girado ou invertido)
+    edges = lambda tour: {frozenset(edge) for edge in zip(tour.tolist(), np.roll(tour, -1).tolist())}
+    assert edges(out) == edges(parent)
+
+
+def test_unknown_crossover_is_rejected():
+    parent = np.arange(5, dtype=POPULATION_DTYPE)
+    with pytest.raises(ValueError):
+        crossover_into("cx", parent, parent, np.empty_like(parent))
+
+
+@pytest.mark.parametrize("n_cities", [2, 3, 5, 40])
+def test_order_crossover_batch_returns_valid_permutations(n_cities):
+    np.random.seed(n_cities)
+    rng = np.random.default_rng(n_cities)
+    parents1 = np.array([rng.permutation(n_cities) for _ in range(64)], dtype=POPULATION_DTYPE)
+    parents2 = np.array([rng.permutation(n_cities) for _ in range(64)], dtype=POPULATION_DTYPE)
+    out = np.empty_like(parents1)
+    children = order_crossover_batch(parents1, parents2, out=out)
+    assert children is out
+    np.testing.assert_array_equal(np.sort(children, axis=1), np.tile(np.arange(n_cities), (64, 1)))
+    # O trecho herdado do pai 1 está entre a primeira e a última posição iguais
+    # às dele; fora desse intervalo, os genes seguem a ordem do pai 2
+    for parent1, parent2, child in zip(parents1, parents2, children):
+        inherited = np.flatnonzero(child == parent1)
+        outside = np.r_[0:inherited.min(), inherited.max() + 1:n_cities]
+        order_in_parent2 = np.argsort(parent2)
+        positions = order_in_parent2[child[outside]]
+        assert np.all(np.diff(positions) > 0)
+
+
+def test_order_crossover_list_and_array_versions_agree():
+    rng = np.random.default_rng(3)
+    for _ in range(20):
+        parent1, parent2 = random_parents(15, rng)
+        random.seed(5)
+        expected = order_crossover(parent1.tolist(), parent2.tolist())
+        random.seed(5)
+        child = order_crossover_into(parent1, parent2, np.empty_like(parent1))
+        assert child.tolist() == expected
@@ -0,0 +1,42 @@
+# test_fitness_cache.py
+
+import numpy as np
+
+from ga_logic import FitnessCache, calculate_population_distances, tour_key
+
+
+def random_cities(n_cities, seed):
+    rng = np.random.default_rng(seed)
+    return [tuple(city) for city in rng.integers(0, 1000, size=(n_cities, 2)).tolist()]
+
+
+def test_cache_evicts_least_recently_used_entry():
+    cache = FitnessCache(maxsize=2)
+    cache.put(b"a", 1.0)
+    cache.put(b"b", 2.0)
+    assert cache.get(b"a") == 1.0
+    cache.put(b"c", 3.0)
+    assert len(cache) == 2
+    assert cache.get(b"b") is None
+    assert cache.get(b"a") == 1.0
+    assert cache.get(b"c") == 3.0
+    assert (cache.hits, cache.misses) == (3, 1)
+    assert cache.hit_rate == 0.75
+
+
+def test_cached_distances_match_uncached_and_share_rotations():
+    cities = random_cities(15, 0)
+    rng = np.random.default_rng(1)
+    population = np.array([rng.permutation(15) for _ in range(20)])
+    population[1] = np.roll(population[0], 4)[::-1]
+    cache = FitnessCache()
+
+    expected = calculate_population_distances(population, cities)
+    np.testing.assert_allclose(calculate_population_distances(population, cities, cache), expected)
+    # A rota 1 é a rota 0 girada e invertida: mesma entrada do cache
+    assert len(cache) == 19
+    assert (cache.hits, cache.misses) == (0, 20)
+
+    np.testing.assert_allclose(calculate_population_distances(population, cities, cache), expected)
+    assert (cache.hits, cache.misses) == (20, 20)
+    assert cache.get(tour_key(population[5])) == expected[5]
@@ -0,0 +1,110 @@
+# test_ga_engine.py
+
+import os
+import random
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+import ga_engine
+import steady_state
+from ga_engine import GeneticAlgorithm
+from ga_logic import calculate_population_distances, population_tour_keys, order_crossover_batch
+
+
+def random_cities(n_cities, seed):
+    rng = np.random.default_rng(seed)
+    return [tuple(city) for city in rng.integers(0, 1000, size=(n_cities, 2)).tolist()]
+
+
+def test_engine_does_not_need_pygame():
+    # Processo separado: outros testes podem já ter importado pygame
+    code = "import sys, ga_engine; assert 'pygame' not in sys.modules and 'matplotlib' not in sys.modules"
+    project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    subprocess.run([sys.executable, "-c", code], cwd=project_dir, check=True)
+
+
+def test_step_keeps_a_consistent_population():
+    random.seed(0)
+    np.random.seed(0)
+    cities = random_cities(20, 0)
+    ga = GeneticAlgorithm(cities, population_size=50)
+    for _ in range(15):
+        previous_best = ga.best_distance
+        ga.step()
+        np.testing.assert_array_equal(np.sort(ga.population, axis=1), np.tile(np.arange(20), (50, 1)))
+        np.testing.assert_allclose(ga.population_distances, calculate_population_distances(ga.population, cities))
+        # Elitismo: a melhor rota nunca piora
+        assert ga.best_distance <= previous_best + 1e-9
+        assert ga.best_distance == ga.population_distances.min()
+        # Com a política "reject" não há rotas repetidas
+        assert len(set(population_tour_keys(ga.population))) == 50
+    assert ga.generation == 16
+    assert len(ga.best_distance_history) == len(ga.avg_distance_history) == 16
+
+
+def test_run_stops_at_generation_limit_or_callback():
+    random.seed(1)
+    np.random.seed(1)
+    cities = random_cities(12, 1)
+    assert GeneticAlgorithm(cities, population_size=20).run(8).generation == 8
+
+    ga = GeneticAlgorithm(cities, population_size=20)
+    ga.run(100, on_generation=lambda ga: ga.generation >= 5)
+    assert ga.generation == 5
+
+
+@pytest.mark.parametrize("factory", [GeneticAlgorithm, steady_state.SteadyStateGA])
+@pytest.mark.parametrize("crossover_probability", [0.0, 0.3, 1.0])
+def test_order_crossover_is_batched_only_for_crossing_pairs(monkeypatch, factory, crossover_probability):
+    batched_rows = []
+
+    def counting_batch(parents1, parents2, out=None):
+        batched_rows.append(len(parents1))
+        return order_crossover_batch(parents1, parents2, out)
+
+    monkeypatch.setattr(ga_engine, "order_crossover_batch", counting_batch)
+    monkeypatch.setattr(steady_state, "order_crossover_batch", counting_batch)
+    random.seed(2)
+    np.random.seed(2)
+    cities = random_cities(15, 2)
+    ga = factory(cities, population_size=200, crossover_probability=crossover_probability,
+                 duplicate_policy="allow", max_duplicate_copies=200)
+    ga.step()
+    # Uma geração tem P - 1 filhos (P no estacionário), e cada um cruza com a probabilidade dada
+    n_children = 199 if factory is GeneticAlgorithm else 200
+    assert sum(batched_rows) == pytest.approx(crossover_probability * n_children, abs=40)
+    if crossover_probability == 0.0:
+        assert batched_rows == []
+
+
+@pytest.mark.parametrize("factory", [GeneticAlgorithm, steady_state.SteadyStateGA])
+def test_evaluations_skip_delta_scored_children(factory):
+    random.seed(3)
+    np.random.seed(3)
+    cities = random_cities(15, 3)
+    # Sem crossover todo filho é uma cópia mutada, avaliada por delta
+    ga = factory(cities, population_size=40, crossover_probability=0.0)
+    assert ga.evaluations == 40
+    for _ in range(3):
+        ga.step()
+    assert ga.generation == 4
+    assert ga.evaluations == 40
+
+
+def test_evaluations_skip_cache_hits():
+    random.seed(4)
+    np.random.seed(4)
+    cities = random_cities(15, 4)
+    first = GeneticAlgorithm(cities, population_size=30)
+    # A mesma população inicial, com o cache já preenchido, não é avaliada de novo
+    second = GeneticAlgorithm(cities, population_size=30, initial_population=first.population.copy(),
+                              fitness_cache=first.fitness_cache)
+    assert first.evaluations == 30
+    assert second.evaluations == 0
+
+    uncached = GeneticAlgorithm(cities, population_size=30, fitness_cache_size=0)
+    uncached.step()
+    assert 30 < uncached.evaluations < 60
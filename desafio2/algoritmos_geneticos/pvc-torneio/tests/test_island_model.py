@@ -0,0 +1,75 @@
+# test_island_model.py
+
+import random
+
+import numpy as np
+import pytest
+
+from ga_logic import calculate_population_distances
+import island_model
+from island_model import migrate, migration_targets, run_islands
+
+
+def test_migrate_copies_best_over_worst_of_target():
+    populations = [np.full((4, 3), island) for island in range(3)]
+    for population in populations:
+        population[:, 1] = np.arange(4)  # linha 0 = melhor, linha 3 = pior
+    migrate(populations, 2, [1, 2, 0])
+    for source, target in enumerate([1, 2, 0]):
+        np.testing.assert_array_equal(populations[target][2:, 0], [source, source])
+        np.testing.assert_array_equal(populations[target][2:, 1], [0, 1])
+        # Os melhores da ilha de destino continuam lá
+        np.testing.assert_array_equal(populations[target][:2, 0], [target, target])
+
+
+def test_migrants_carry_their_distances():
+    populations = [np.full((4, 3), island) for island in range(3)]
+    distances = [island * 10.0 + np.arange(4.0) for island in range(3)]
+    migrate(populations, 1, [2, 0, 1], distances)
+    for source, target in enumerate([2, 0, 1]):
+        assert populations[target][3, 0] == source
+        assert distances[target][3] == source * 10.0
+        np.testing.assert_array_equal(distances[target][:3], target * 10.0 + np.arange(3.0))
+
+
+def test_worker_keeps_one_fitness_cache_across_epochs(monkeypatch):
+    rng = np.random.default_rng(1)
+    cities = [tuple(city) for city in rng.integers(0, 1000, size=(12, 2)).tolist()]
+    monkeypatch.setattr(island_model, "_worker_state", {"fitness_cache": None, "neighbor_lists": None})
+    island_model._init_worker(cities, 500)
+    cache = island_model._worker_state["fitness_cache"]
+    assert cache.maxsize == 500
+    population = np.array([rng.permutation(12) for _ in range(10)])
+    params = {"population_size": 10, "local_search": "elite", "local_search_budget": 2}
+    _, population, distances, _ = island_model._evolve_island((0, population, None, 3, 1, params))
+    neighbor_lists = island_model._worker_state["neighbor_lists"]
+    lookups = cache.hits + cache.misses
+    assert lookups > 0
+    island_model._evolve_island((1, population, distances, 3, 2, params))
+    assert island_model._worker_state["fitness_cache"] is cache
+    assert island_model._worker_state["neighbor_lists"] is neighbor_lists
+    assert cache.hits + cache.misses > lookups
+
+
+def test_migration_targets():
+    assert migration_targets(4, "ring", random.Random(0)) == [1, 2, 3, 0]
+    targets = migration_targets(5, "random", random.Random(0))
+    assert all(target != source and 0 <= target < 5 for source, target in enumerate(targets))
+    with pytest.raises(ValueError):
+        migration_targets(3, "star", random.Random(0))
+
+
+def test_run_islands_is_reproducible_and_reports_real_tours():
+    rng = np.random.default_rng(0)
+    cities = [tuple(city) for city in rng.integers(0, 1000, size=(15, 2)).tolist()]
+    kwargs = dict(n_islands=3, island_population=20, n_generations=12, migration_interval=5, n_migrants=2,
+                  n_workers=2, seed=3)
+    result = run_islands(cities, **kwargs)
+    assert sorted(result["best_individual"].tolist()) == list(range(15))
+    assert result["best_distance"] == pytest.approx(
+        calculate_population_distances(result["best_individual"][np.newaxis, :], cities)[0])
+    assert result["generation"] == 12
+    assert len(result["global_best_history"]) == 3
+    assert result["global_best_history"] == sorted(result["global_best_history"], reverse=True)
+    assert all(len(stats["history"]) == 12 for stats in result["islands"])
+    assert run_islands(cities, **kwargs)["best_distance"] == result["best_distance"]
@@ -0,0 +1,66 @@
+# test_local_search.py
+
+import random
+
+import numpy as np
+import pytest
+
+from ga_engine import GeneticAlgorithm
+from ga_logic import POPULATION_DTYPE, build_distance_matrix, calculate_population_distances
+from local_search import TwoOptLocalSearch, build_neighbor_lists
+
+
+def tour_length(tour, distance_matrix):
+    tour = np.asarray(tour, dtype=np.intp)
+    return float(distance_matrix[tour, np.roll(tour, -1)].sum())
+
+
+@pytest.fixture
+def instance():
+    rng = np.random.default_rng(0)
+    cities = [tuple(city) for city in rng.uniform(0, 1000, size=(40, 2)).tolist()]
+    return cities, build_distance_matrix(cities)
+
+
+def test_neighbor_lists_are_sorted_nearest_cities(instance):
+    _, distance_matrix = instance
+    neighbors = build_neighbor_lists(distance_matrix, 6)
+    distances = distance_matrix.copy()
+    np.fill_diagonal(distances, np.inf)
+    np.testing.assert_array_equal(neighbors, np.argsort(distances, axis=1)[:, :6])
+
+
+def test_two_opt_reaches_a_local_optimum(instance):
+    _, distance_matrix = instance
+    # Com todos os vizinhos como candidatos, o resultado é um ótimo local 2-opt completo
+    searcher = TwoOptLocalSearch(distance_matrix, n_neighbors=39)
+    tour = np.random.default_rng(1).permutation(40).astype(POPULATION_DTYPE)
+    before = tour_length(tour, distance_matrix)
+    gain = searcher.improve(tour)
+    after = tour_length(tour, distance_matrix)
+    assert sorted(tour.tolist()) == list(range(40))
+    assert gain == pytest.approx(before - after)
+    assert gain > 0
+    for i in range(39):
+        for j in range(i + 2, 40 if i else 39):
+            a, b, c, d = tour[i], tour[i + 1], tour[j], tour[(j + 1) % 40]
+            assert distance_matrix[a, c] + distance_matrix[b, d] >= distance_matrix[a, b] + distance_matrix[c, d] - 1e-9
+
+
+def test_two_opt_respects_move_limit(instance):
+    _, distance_matrix = instance
+    searcher = TwoOptLocalSearch(distance_matrix, n_neighbors=8)
+    tour = np.random.default_rng(2).permutation(40).astype(POPULATION_DTYPE)
+    before = tour_length(tour, distance_matrix)
+    assert searcher.improve(tour, max_moves=0) == 0.0
+    assert tour_length(tour, distance_matrix) == before
+
+
+@pytest.mark.parametrize("mode", ["elite", "offspring"])
+def test_memetic_ga_keeps_distances_consistent(instance, mode):
+    cities, _ = instance
+    random.seed(3)
+    np.random.seed(3)
+    ga = GeneticAlgorithm(cities, population_size=30, local_search=mode, local_search_budget=3).run(5)
+    np.testing.assert_allclose(ga.population_distances, calculate_population_distances(ga.population, cities))
+    np.testing.assert_array_equal(np.sort(ga.population, axis=1), np.tile(np.arange(40), (30, 1)))
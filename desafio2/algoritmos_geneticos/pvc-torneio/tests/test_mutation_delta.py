@@ -0,0 +1,59 @@
+# test_mutation_delta.py
+
+import random
+
+import numpy as np
+import pytest
+
+from ga_logic import (POPULATION_DTYPE, build_distance_matrix, score_paths, swap_delta, reverse_delta,
+                      swap_mutation_delta, reverse_mutation_delta, neighbor_reverse_mutation_delta)
+from local_search import build_neighbor_lists
+
+
+def tour_length(tour, distance_matrix):
+    return float(score_paths(np.asarray(tour, dtype=np.intp)[np.newaxis, :], distance_matrix)[0])
+
+
+@pytest.fixture
+def distance_matrix():
+    rng = np.random.default_rng(1)
+    return build_distance_matrix(rng.uniform(0, 1000, size=(9, 2)).tolist())
+
+
+def test_swap_delta_matches_full_distance_for_every_pair(distance_matrix):
+    tour = np.random.default_rng(2).permutation(9).astype(POPULATION_DTYPE)
+    before = tour_length(tour, distance_matrix)
+    for i in range(9):
+        for j in range(9):
+            swapped = tour.copy()
+            swapped[i], swapped[j] = swapped[j], swapped[i]
+            delta = swap_delta(tour, i, j, distance_matrix)
+            assert before + delta == pytest.approx(tour_length(swapped, distance_matrix))
+
+
+def test_reverse_delta_matches_full_distance_for_every_segment(distance_matrix):
+    tour = np.random.default_rng(3).permutation(9).astype(POPULATION_DTYPE)
+    before = tour_length(tour, distance_matrix)
+    for start in range(9):
+        for end in range(start, 9):
+            reversed_tour = tour.copy()
+            reversed_tour[start:end + 1] = reversed_tour[start:end + 1][::-1]
+            delta = reverse_delta(tour, start, end, distance_matrix)
+            assert before + delta == pytest.approx(tour_length(reversed_tour, distance_matrix))
+
+
+@pytest.mark.parametrize("mutation", ["swap", "reverse", "neighbor"])
+def test_mutation_delta_tracks_tour_length(distance_matrix, mutation):
+    random.seed(4)
+    neighbor_lists = build_neighbor_lists(distance_matrix, 4)
+    tour = np.random.default_rng(4).permutation(9).astype(POPULATION_DTYPE)
+    length = tour_length(tour, distance_matrix)
+    for _ in range(200):
+        if mutation == "swap":
+            length += swap_mutation_delta(tour, 1.0, distance_matrix)
+        elif mutation == "reverse":
+            length += reverse_mutation_delta(tour, 1.0, distance_matrix)
+        else:
+            length += neighbor_reverse_mutation_delta(tour, 1.0, distance_matrix, neighbor_lists)
+        assert sorted(tour) == list(range(9))
+    assert length == pytest.approx(tour_length(tour, distance_matrix))
@@ -0,0 +1,58 @@
+# test_parallel_eval.py
+
+import random
+
+import numpy as np
+import pytest
+
+from ga_engine import GeneticAlgorithm
+from ga_logic import POPULATION_DTYPE, calculate_population_distances
+from parallel_eval import SharedMemoryEvaluator
+from tsplib import load_instance
+
+
+@pytest.fixture
+def cities():
+    rng = np.random.default_rng(0)
+    return [tuple(city) for city in rng.integers(0, 1000, size=(30, 2)).tolist()]
+
+
+@pytest.mark.parametrize("use_distance_matrix", [True, False])
+def test_shared_memory_evaluator_matches_local_scoring(cities, use_distance_matrix):
+    rng = np.random.default_rng(1)
+    population = np.array([rng.permutation(30) for _ in range(50)], dtype=POPULATION_DTYPE)
+    expected = calculate_population_distances(population, cities)
+    with SharedMemoryEvaluator(cities, 50, n_workers=2, chunk_size=7,
+                               use_distance_matrix=use_distance_matrix) as evaluator:
+        np.testing.assert_allclose(evaluator(population), expected)
+        # Chamadas com menos rotas que `max_population` usam só o início do buffer
+        np.testing.assert_allclose(evaluator(population[:3]), expected[:3])
+        with pytest.raises(ValueError):
+            evaluator(np.vstack([population, population]))
+
+
+@pytest.mark.parametrize("matrix_free", [False, True])
+def test_shared_memory_evaluator_uses_the_instance_distances(matrix_free):
+    # att48 usa a métrica ATT, diferente da euclidiana das coordenadas
+    instance = load_instance("att48", matrix_free=matrix_free)
+    rng = np.random.default_rng(3)
+    population = np.array([rng.permutation(48) for _ in range(20)], dtype=POPULATION_DTYPE)
+    expected = [instance.tour_length(tour) for tour in population]
+    with SharedMemoryEvaluator(instance.coords, 20, n_workers=2,
+                               distance_matrix=instance.distance_matrix) as evaluator:
+        np.testing.assert_allclose(evaluator(population), expected)
+
+
+def test_ga_with_shared_memory_evaluator_matches_local_run(cities):
+    results = []
+    for workers in (0, 2):
+        random.seed(2)
+        np.random.seed(2)
+        evaluator = SharedMemoryEvaluator(cities, 40, n_workers=workers) if workers else None
+        try:
+            ga = GeneticAlgorithm(cities, population_size=40, evaluator=evaluator).run(10)
+        finally:
+            if evaluator is not None:
+                evaluator.close()
+        results.append(ga.best_distance_history)
+    np.testing.assert_allclose(results[0], results[1])
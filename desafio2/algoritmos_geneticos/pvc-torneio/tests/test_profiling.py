@@ -0,0 +1,43 @@
+# test_profiling.py
+
+import json
+import random
+
+import numpy as np
+
+from ga_engine import GeneticAlgorithm
+from profiling import PhaseTimer
+
+
+def test_phase_timer_accumulates_phases_and_writes_jsonl(tmp_path):
+    path = tmp_path / "phases.jsonl"
+    timer = PhaseTimer(str(path))
+    timer.add("selection", 2_000_000)
+    timer.add("selection", 1_000_000)
+    timer.add("evaluation", 4_000_000)
+    first = timer.end_generation(1, best_distance=10.0)
+    timer.add("selection", 5_000_000)
+    timer.end_generation(2)
+    timer.close()
+
+    assert first["phases_ms"]["selection"] == 3.0
+    assert first["phases_ms"]["evaluation"] == 4.0
+    assert first["best_distance"] == 10.0
+    assert list(first["phases_ms"])[-1] == "other"
+    assert timer.totals["selection"] == 8_000_000
+    assert timer.maxima["selection"] == 5_000_000
+    rows = {row["phase"]: row for row in timer.summary()}
+    assert rows["selection"]["mean_ms"] == 4.0
+    assert abs(sum(row["share"] for row in rows.values()) - 1) < 1e-9
+    assert [json.loads(line)["generation"] for line in path.read_text().splitlines()] == [1, 2]
+
+
+def test_ga_records_one_entry_per_generation():
+    rng = np.random.default_rng(0)
+    cities = [tuple(city) for city in rng.uniform(0, 1000, size=(20, 2)).tolist()]
+    random.seed(1)
+    np.random.seed(1)
+    timer = PhaseTimer()
+    ga = GeneticAlgorithm(cities, population_size=30, phase_timer=timer).run(6)
+    assert timer.n_generations == ga.generation
+    assert {"selection", "crossover", "mutation", "evaluation"} <= set(timer.totals)
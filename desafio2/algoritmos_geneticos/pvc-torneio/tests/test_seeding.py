@@ -0,0 +1,76 @@
+# test_seeding.py
+
+import itertools
+import random
+
+import numpy as np
+import pytest
+
+from ga_logic import build_distance_matrix
+from seeding import (SEEDING_METHODS, nearest_neighbour_tour, greedy_edge_tour, mst_double_tree_tour,
+                     convex_hull_insertion_tour, create_seeded_population)
+
+
+def random_instance(n_cities, seed):
+    rng = np.random.default_rng(seed)
+    cities = [tuple(city) for city in rng.uniform(0, 1000, size=(n_cities, 2)).tolist()]
+    return cities, build_distance_matrix(cities)
+
+
+def tour_length(tour, distance_matrix):
+    tour = np.asarray(tour, dtype=np.intp)
+    return float(distance_matrix[tour, np.roll(tour, -1)].sum())
+
+
+def heuristic_tours(cities, distance_matrix):
+    return {
+        "nearest_neighbour": nearest_neighbour_tour(distance_matrix, start=len(cities) // 2),
+        "greedy_edge": greedy_edge_tour(distance_matrix),
+        "mst": mst_double_tree_tour(distance_matrix),
+        "convex_hull": convex_hull_insertion_tour(cities, distance_matrix),
+    }
+
+
+@pytest.mark.parametrize("n_cities", [3, 4, 5, 12, 60])
+def test_heuristics_return_valid_tours(n_cities):
+    cities, distance_matrix = random_instance(n_cities, n_cities)
+    for name, tour in heuristic_tours(cities, distance_matrix).items():
+        assert sorted(np.asarray(tour).tolist()) == list(range(n_cities)), name
+
+
+def test_nearest_neighbour_always_moves_to_closest_unvisited_city():
+    _, distance_matrix = random_instance(25, 1)
+    tour = np.asarray(nearest_neighbour_tour(distance_matrix, start=3)).tolist()
+    assert tour[0] == 3
+    for i in range(len(tour) - 1):
+        unvisited = tour[i + 1:]
+        assert distance_matrix[tour[i], tour[i + 1]] == min(distance_matrix[tour[i], city] for city in unvisited)
+
+
+def test_heuristics_stay_within_known_bounds_of_the_optimum():
+    cities, distance_matrix = random_instance(8, 2)
+    optimum = min(tour_length((0,) + permutation, distance_matrix)
+                  for permutation in itertools.permutations(range(1, 8)))
+    tours = heuristic_tours(cities, distance_matrix)
+    # Árvore dupla e inserção no fecho convexo (métrica euclidiana) ficam a no máximo 2x do ótimo
+    assert tour_length(tours["mst"], distance_matrix) <= 2 * optimum + 1e-9
+    assert tour_length(tours["convex_hull"], distance_matrix) <= 2 * optimum + 1e-9
+    for tour in tours.values():
+        assert tour_length(tour, distance_matrix) >= optimum - 1e-9
+
+
+def test_seeded_population_mixes_heuristic_and_random_tours():
+    random.seed(3)
+    np.random.seed(3)
+    cities, distance_matrix = random_instance(40, 3)
+    population = create_seeded_population(cities, 50, seed_fraction=0.2)
+    assert population.shape == (50, 40)
+    np.testing.assert_array_equal(np.sort(population, axis=1), np.tile(np.arange(40), (50, 1)))
+    lengths = [tour_length(tour, distance_matrix) for tour in population]
+    assert max(lengths[:10]) < min(lengths[10:])
+
+    unseeded = create_seeded_population(cities, 50, seed_fraction=0.0)
+    assert unseeded.shape == (50, 40)
+    with pytest.raises(ValueError):
+        create_seeded_population(cities, 50, methods=["christofides"])
+    assert set(SEEDING_METHODS) == set(heuristic_tours(cities, distance_matrix))
@@ -0,0 +1,103 @@
+# test_selection.py
+
+from math import comb
+
+import numpy as np
+import pytest
+
+from ga_logic import (select_parent_indices_by_tournament, select_parent_indices_by_roulette,
+                      select_parent_indices_by_sus, select_parent_indices, build_alias_table, rank_weights)
+
+N_DRAWS = 200_000
+
+
+def winner_frequencies(indices, pop_size):
+    return np.bincount(indices, minlength=pop_size) / len(indices)
+
+
+@pytest.fixture
+def fitness():
+    # Índice 0 é o melhor, índice 9 o pior
+    return np.linspace(1.0, 0.1, 10)
+
+
+@pytest.mark.parametrize("k", [1, 3])
+def test_tournament_with_replacement_matches_analytic_distribution(fitness, k):
+    np.random.seed(0)
+    frequencies = winner_frequencies(select_parent_indices_by_tournament(fitness, N_DRAWS, k), 10)
+    # O i-ésimo melhor vence se todos os k sorteados forem dele para baixo, e ele estiver entre eles
+    expected = np.array([((10 - i) ** k - (9 - i) ** k) / 10 ** k for i in range(10)])
+    np.testing.assert_allclose(frequencies, expected, atol=0.005)
+
+
+@pytest.mark.parametrize("k", [2, 5, 7])
+def test_tournament_without_replacement_matches_analytic_distribution(fitness, k):
+    # k <= P/2 sorteia de novo as posições repetidas; k = 7 (> P/2) usa chaves aleatórias
+    np.random.seed(1)
+    frequencies = winner_frequencies(select_parent_indices_by_tournament(fitness, N_DRAWS, k, replace=False), 10)
+    expected = np.array([comb(9 - i, k - 1) / comb(10, k) for i in range(10)])
+    np.testing.assert_allclose(frequencies, expected, atol=0.005)
+
+
+def test_tournament_of_whole_population_without_replacement_picks_best(fitness):
+    np.random.seed(2)
+    assert np.all(select_parent_indices_by_tournament(fitness, 1000, 10, replace=False) == 0)
+    with pytest.raises(ValueError):
+        select_parent_indices_by_tournament(fitness, 10, 11, replace=False)
+
+
+def test_tournament_without_replacement_does_not_scale_with_population():
+    # Com chaves aleatórias por linha, seriam 10^3 x 10^6 floats (8 GB)
+    np.random.seed(7)
+    fitness = np.random.random(1_000_000)
+    winners = select_parent_indices_by_tournament(fitness, 1000, 2000, replace=False)
+    assert winners.shape == (1000,)
+    assert np.all(fitness[winners] > 0.99)
+
+
+def test_probabilistic_tournament_lets_the_best_win_with_given_pressure(fitness):
+    np.random.seed(3)
+    winners = select_parent_indices_by_tournament(fitness, N_DRAWS, 10, pressure=0.7, replace=False)
+    frequencies = winner_frequencies(winners, 10)
+    assert frequencies[0] == pytest.approx(0.7, abs=0.005)
+    assert frequencies[1] == pytest.approx(0.7 * 0.3, abs=0.005)
+
+
+@pytest.mark.parametrize("method", ["cumsum", "alias"])
+def test_roulette_is_proportional_to_weights(fitness, method):
+    np.random.seed(4)
+    frequencies = winner_frequencies(select_parent_indices_by_roulette(fitness, N_DRAWS, method), 10)
+    np.testing.assert_allclose(frequencies, fitness / fitness.sum(), atol=0.005)
+
+
+def test_alias_table_reproduces_the_weights():
+    weights = np.array([5.0, 1.0, 0.0, 2.0, 2.0])
+    prob, alias = build_alias_table(weights)
+    # Cada coluna tem massa 1/n: fica com prob[i] e cede 1 - prob[i] ao seu alias
+    mass = prob.copy()
+    np.add.at(mass, alias, 1.0 - prob)
+    np.testing.assert_allclose(mass / len(weights), weights / weights.sum())
+
+
+def test_sus_gives_each_individual_floor_or_ceil_of_expected_copies(fitness):
+    np.random.seed(5)
+    for _ in range(50):
+        counts = np.bincount(select_parent_indices_by_sus(fitness, 40), minlength=10)
+        expected = 40 * fitness / fitness.sum()
+        assert counts.sum() == 40
+        assert np.all(counts >= np.floor(expected)) and np.all(counts <= np.ceil(expected))
+
+
+def test_rank_weights_are_linear_in_rank_and_ignore_scale():
+    weights = rank_weights(np.array([10.0, 0.001, 3.0, 1000.0]), pressure=1.8)
+    np.testing.assert_allclose(weights, [0.2 + 3.2 / 3, 0.2, 0.2 + 1.6 / 3, 1.8])
+    assert weights.sum() == pytest.approx(4.0)
+
+
+def test_select_parent_indices_dispatches_and_rejects_unknown_method(fitness):
+    np.random.seed(6)
+    for method in ("tournament", "roulette", "sus", "rank"):
+        indices = select_parent_indices(fitness, 100, method, k=3, pressure=1.0 if method == "tournament" else 1.5)
+        assert indices.shape == (100,) and indices.min() >= 0 and indices.max() < 10
+    with pytest.raises(ValueError):
+        select_parent_indices(fitness, 10, "boltzmann")
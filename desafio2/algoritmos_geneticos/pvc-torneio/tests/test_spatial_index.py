@@ -0,0 +1,70 @@
+# test_spatial_index.py
+
+import numpy as np
+import pytest
+
+from spatial_index import KDTree, knn_neighbor_lists
+
+
+def brute_force_distances(coords):
+    diff = coords[:, np.newaxis, :] - coords[np.newaxis, :, :]
+    distances = np.sqrt((diff ** 2).sum(axis=-1))
+    np.fill_diagonal(distances, np.inf)
+    return distances
+
+
+def assert_matches_brute_force(coords, neighbors, k):
+    distances = brute_force_distances(coords)
+    expected = np.sort(distances, axis=1)[:, :k]
+    # Empates podem trocar os índices, mas não as distâncias dos k vizinhos
+    found = np.take_along_axis(distances, neighbors.astype(np.intp), axis=1)
+    np.testing.assert_allclose(found, expected)
+    assert not np.any(neighbors == np.arange(len(coords))[:, np.newaxis])
+
+
+@pytest.mark.parametrize("layout", ["uniform", "clustered", "line"])
+@pytest.mark.parametrize("k", [1, 5, 10])
+def test_kdtree_knn_matches_brute_force(layout, k):
+    rng = np.random.default_rng(k)
+    if layout == "uniform":
+        coords = rng.uniform(0, 1000, size=(300, 2))
+    elif layout == "clustered":
+        centers = rng.uniform(0, 1000, size=(5, 2))
+        coords = centers[rng.integers(0, 5, 300)] + rng.normal(0, 10, size=(300, 2))
+    else:
+        coords = np.column_stack((rng.uniform(0, 1000, 300), np.zeros(300)))
+    neighbors = KDTree(coords).nearest_neighbors(k)
+    assert neighbors.shape == (300, k)
+    assert_matches_brute_force(coords, neighbors, k)
+
+
+@pytest.mark.parametrize("leaf_size", [1, 4, 16, 500])
+def test_kdtree_knn_does_not_depend_on_leaf_size(leaf_size):
+    # Coordenadas inteiras num quadrado pequeno: muitos empates e pontos repetidos
+    coords = np.random.default_rng(0).integers(0, 100, size=(200, 2)).astype(np.float64)
+    assert_matches_brute_force(coords, knn_neighbor_lists(coords, 8, leaf_size), 8)
+
+
+def test_kdtree_knn_on_dense_clusters_far_apart():
+    # Aglomerados minúsculos e muito distantes entre si: uma grade uniforme
+    # poria cada aglomerado inteiro numa só célula
+    rng = np.random.default_rng(4)
+    centers = rng.uniform(0, 1e6, size=(4, 2))
+    coords = centers[rng.integers(0, 4, 20_000)] + rng.normal(0, 1.0, size=(20_000, 2))
+    tree = KDTree(coords)
+    leaves = [node for node, children in enumerate(tree.children) if children is None]
+    assert max(tree.end[leaf] - tree.start[leaf] for leaf in leaves) <= tree.leaf_size
+    neighbors = knn_neighbor_lists(coords, 5)
+    sample = rng.choice(20_000, size=300, replace=False)
+    diff = coords[sample, np.newaxis, :] - coords[np.newaxis, :, :]
+    distances = np.sqrt((diff ** 2).sum(axis=-1))
+    distances[np.arange(300), sample] = np.inf
+    found = np.take_along_axis(distances, neighbors[sample].astype(np.intp), axis=1)
+    np.testing.assert_allclose(found, np.sort(distances, axis=1)[:, :5])
+
+
+def test_kdtree_knn_with_k_larger_than_instance():
+    coords = np.array([[0.0, 0.0], [1.0, 0.0], [5.0, 5.0]])
+    neighbors = KDTree(coords).nearest_neighbors(10)
+    assert neighbors.shape == (3, 2)
+    assert_matches_brute_force(coords, neighbors, 2)
@@ -0,0 +1,68 @@
+# test_steady_state.py
+
+import random
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from ga_engine import GeneticAlgorithm
+from ga_logic import calculate_population_distances, population_tour_keys
+from steady_state import SteadyStateGA, create_genetic_algorithm
+
+
+@pytest.fixture
+def cities():
+    rng = np.random.default_rng(0)
+    return [tuple(city) for city in rng.uniform(0, 1000, size=(25, 2)).tolist()]
+
+
+def check_invariants(ga, cities):
+    n_cities = len(cities)
+    np.testing.assert_array_equal(np.sort(ga.population, axis=1), np.tile(np.arange(n_cities), (len(ga.population), 1)))
+    np.testing.assert_allclose(ga.population_distances, calculate_population_distances(ga.population, cities))
+    np.testing.assert_allclose(ga.population_fitness, 1 / (ga.population_distances + 1e-10))
+    # O heap e a melhor rota mantidos incrementalmente batem com a busca completa
+    assert ga.population_distances[ga._best] == ga.population_distances.min()
+    if ga.replacement == "worst":
+        target = ga._replacement_target()
+        others = np.delete(ga.population_distances, ga._best)
+        assert target is None or ga.population_distances[target] == others.max()
+    assert ga._keys == population_tour_keys(ga.population)
+    assert ga._tour_counts == dict(Counter(ga._keys))
+
+
+@pytest.mark.parametrize("replacement", ["worst", "tournament"])
+@pytest.mark.parametrize("crossover", ["ox", "pmx"])
+def test_incremental_state_matches_full_recount(cities, replacement, crossover):
+    random.seed(1)
+    np.random.seed(1)
+    ga = SteadyStateGA(cities, population_size=30, offspring_per_step=4, replacement=replacement, crossover=crossover)
+    best = ga.population_distances.min()
+    for _ in range(40):
+        ga.breed()
+        check_invariants(ga, cities)
+        # A melhor rota nunca é substituída
+        assert ga.population_distances.min() <= best
+        best = ga.population_distances.min()
+    assert len(set(ga._keys)) == len(ga._keys)
+
+
+def test_epoch_counts_as_generation(cities):
+    random.seed(2)
+    np.random.seed(2)
+    ga = SteadyStateGA(cities, population_size=30, local_search="offspring", local_search_budget=2).run(6)
+    check_invariants(ga, cities)
+    assert ga.generation == 6
+    assert len(ga.best_distance_history) == 6
+    assert ga.best_distance_history == sorted(ga.best_distance_history, reverse=True)
+    np.testing.assert_array_equal(ga.sorted_indices, np.argsort(ga.population_distances, kind="stable"))
+
+
+def test_factory_and_rejected_settings(cities):
+    assert type(create_genetic_algorithm(cities, population_size=10, offspring_per_step=3)) is GeneticAlgorithm
+    assert isinstance(create_genetic_algorithm(cities, replacement="worst", population_size=10), SteadyStateGA)
+    with pytest.raises(ValueError):
+        SteadyStateGA(cities, population_size=10, replacement="oldest")
+    with pytest.raises(ValueError):
+        SteadyStateGA(cities, population_size=10, adaptive="adaptive_pursuit")
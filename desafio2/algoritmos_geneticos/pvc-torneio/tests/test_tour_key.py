@@ -0,0 +1,64 @@
+# test_tour_key.py
+
+import numpy as np
+import pytest
+
+from ga_logic import canonical_tour, tour_key, population_tour_keys, register_child
+
+
+@pytest.mark.parametrize("n_cities", [2, 3, 4, 7, 50])
+def test_tour_key_is_invariant_to_rotation_and_reversal(n_cities):
+    rng = np.random.default_rng(n_cities)
+    tour = rng.permutation(n_cities)
+    key = tour_key(tour)
+    for shift in range(n_cities):
+        rotated = np.roll(tour, shift)
+        assert tour_key(rotated) == key
+        assert tour_key(rotated[::-1]) == key
+
+
+def test_tour_key_differs_for_different_tours():
+    assert tour_key([0, 1, 2, 3, 4]) != tour_key([0, 2, 1, 3, 4])
+
+
+def test_canonical_tour_starts_at_zero_with_smaller_second_city():
+    canonical = canonical_tour([3, 1, 0, 4, 2])
+    assert canonical[0] == 0
+    assert canonical[1] < canonical[-1]
+    assert sorted(canonical) == [0, 1, 2, 3, 4]
+
+
+def test_population_tour_keys_matches_tour_key():
+    rng = np.random.default_rng(0)
+    population = np.array([rng.permutation(12) for _ in range(30)])
+    population[1] = np.roll(population[0], 5)[::-1]
+    keys = population_tour_keys(population)
+    assert keys == [tour_key(row) for row in population]
+    assert keys[0] == keys[1]
+
+
+def test_register_child_rejects_rotated_duplicate():
+    seen_tours = {}
+    assert register_child(np.array([0, 1, 2, 3, 4]), seen_tours)
+    assert not register_child(np.array([2, 1, 0, 4, 3]), seen_tours)
+
+
+def test_register_child_mutate_policy_changes_the_duplicate():
+    seen_tours = {}
+    register_child(np.array([0, 1, 2, 3, 4]), seen_tours)
+    child = np.array([0, 1, 2, 3, 4])
+
+    def swap_second_and_third(individual):
+        individual[1], individual[2] = individual[2], individual[1]
+
+    assert register_child(child, seen_tours, policy="mutate", mutate=swap_second_and_third)
+    assert tour_key(child) != tour_key([0, 1, 2, 3, 4])
+    assert sum(seen_tours.values()) == 2
+
+
+def test_register_child_allow_policy_caps_copies():
+    seen_tours = {}
+    tour = np.array([0, 1, 2, 3, 4])
+    assert register_child(tour, seen_tours, policy="allow", max_copies=2)
+    assert register_child(tour, seen_tours, policy="allow", max_copies=2)
+    assert not register_child(tour, seen_tours, policy="allow", max_copies=2)
@@ -0,0 +1,71 @@
+# test_tsplib.py
+
+import os
+
+import numpy as np
+import pytest
+
+from tsplib import INSTANCES_DIR, BEST_KNOWN, parse_tsplib, load_tsplib, load_tour, load_instance
+
+# Matriz simétrica 4 × 4 usada nas instâncias EXPLICIT abaixo
+MATRIX = np.array([[0, 3, 5, 9],
+                   [3, 0, 4, 7],
+                   [5, 4, 0, 2],
+                   [9, 7, 2, 0]], dtype=np.float64)
+
+EXPLICIT_SECTIONS = {
+    "FULL_MATRIX": MATRIX.ravel(),
+    "UPPER_ROW": MATRIX[np.triu_indices(4, k=1)],
+    "LOWER_ROW": MATRIX[np.tril_indices(4, k=-1)],
+    "UPPER_DIAG_ROW": MATRIX[np.triu_indices(4)],
+    "LOWER_DIAG_ROW": MATRIX[np.tril_indices(4)],
+}
+
+
+def explicit_instance(edge_weight_format, weights):
+    # Pesos quebrados em linhas de tamanho irregular, como nos arquivos da TSPLIB
+    values = [str(int(weight)) for weight in weights]
+    lines = [" ".join(values[i:i + 3]) for i in range(0, len(values), 3)]
+    return "\n".join(["NAME : tiny4", "TYPE : TSP", "DIMENSION : 4", "EDGE_WEIGHT_TYPE : EXPLICIT",
+                      f"EDGE_WEIGHT_FORMAT : {edge_weight_format}", "EDGE_WEIGHT_SECTION", *lines, "EOF"])
+
+
+@pytest.mark.parametrize("edge_weight_format", list(EXPLICIT_SECTIONS))
+def test_explicit_formats_build_the_same_matrix(edge_weight_format):
+    instance = parse_tsplib(explicit_instance(edge_weight_format, EXPLICIT_SECTIONS[edge_weight_format]))
+    assert instance.dimension == 4
+    assert instance.edge_weight_type == "EXPLICIT"
+    assert instance.coords is None
+    np.testing.assert_array_equal(instance.distance_matrix, MATRIX)
+    assert instance.tour_length([0, 1, 2, 3]) == 3 + 4 + 2 + 9
+
+
+def test_lower_diag_row_with_wrong_weight_count_is_rejected():
+    with pytest.raises(ValueError):
+        parse_tsplib(explicit_instance("LOWER_DIAG_ROW", EXPLICIT_SECTIONS["LOWER_DIAG_ROW"][:-1]))
+
+
+def test_att48_optimal_tour_has_known_length():
+    instance = load_instance("att48")
+    tour = load_tour(os.path.join(INSTANCES_DIR, "att48.opt.tour"))
+    assert sorted(tour) == list(range(48))
+    assert instance.optimum == BEST_KNOWN["att48"] == 10628
+    assert instance.tour_length(tour) == 10628
+    assert instance.gap(10628) == 0.0
+
+
+def test_att48_matrix_free_matches_matrix():
+    instance = load_instance("att48")
+    matrix_free = load_instance("att48", matrix_free=True)
+    tour = load_tour(os.path.join(INSTANCES_DIR, "att48.opt.tour"))
+    assert matrix_free.distance_matrix.tour_lengths(tour[np.newaxis, :])[0] == instance.tour_length(tour)
+
+
+def test_euc_2d_rounds_to_nearest_integer(tmp_path):
+    path = tmp_path / "tri.tsp"
+    path.write_text("NAME : tri\nDIMENSION : 3\nEDGE_WEIGHT_TYPE : EUC_2D\nNODE_COORD_SECTION\n"
+                    "1 0 0\n2 3 4\n3 0 1.4\nEOF\n")
+    instance = load_tsplib(str(path))
+    assert instance.distance_matrix[0, 1] == 5
+    assert instance.distance_matrix[0, 2] == 1
+    assert instance.optimum is None
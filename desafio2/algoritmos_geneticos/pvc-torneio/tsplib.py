@@ -0,0 +1,220 @@
+# tsplib.py
+
+import os
+import numpy as np
+
+from ga_logic import POPULATION_DTYPE
+from coordinate_distances import DISTANCE_METRICS, CoordinateDistances
+
+INSTANCES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "instances")
+
+# Comprimento ótimo conhecido das instâncias incluídas em `instances/`
+BEST_KNOWN = {
+    "att48": 10628,
+    "berlin52": 7542,
+    "eil51": 426,
+    "eil76": 538,
+    "kroA100": 21282,
+}
+
+EDGE_WEIGHT_TYPES = ("EUC_2D", "CEIL_2D", "ATT", "GEO", "EXPLICIT")
+EDGE_WEIGHT_FORMATS = ("FULL_MATRIX", "UPPER_ROW", "LOWER_ROW", "UPPER_DIAG_ROW", "LOWER_DIAG_ROW")
+
+class TSPInstance:
+    """
+    Instância do PCV lida de um arquivo TSPLIB.
+
+    Attributes:
+        name (str): Nome da instância.
+        dimension (int): Número de cidades.
+        edge_weight_type (str): Tipo de distância (EUC_2D, ATT, GEO, ...).
+        coords (np.ndarray | None): Coordenadas (N, 2), se o arquivo tiver.
+        distance_matrix (np.ndarray | CoordinateDistances): Distâncias inteiras
+            (N, N) segundo a TSPLIB, ou calculadas sob demanda no modo sem matriz.
+        optimum (float | None): Comprimento ótimo conhecido, se houver.
+    """
+
+    def __init__(self, name, dimension, edge_weight_type, coords, distance_matrix, optimum=None, comment=""):
+        self.name = name
+        self.dimension = dimension
+        self.edge_weight_type = edge_weight_type
+        self.coords = coords
+        self.distance_matrix = distance_matrix
+        self.optimum = optimum
+        self.comment = comment
+
+    def __repr__(self):
+        return f"TSPInstance({self.name!r}, dimension={self.dimension}, type={self.edge_weight_type})"
+
+    def tour_length(self, tour):
+        """Comprimento de uma rota (índices a partir de 0) com as distâncias da instância."""
+        tour = np.asarray(tour, dtype=np.intp)
+        return float(self.distance_matrix[tour, np.roll(tour, -1)].sum())
+
+    def gap(self, length):
+        """Distância relativa ao ótimo conhecido (0.01 = 1% acima do ótimo)."""
+        if not self.optimum:
+            return None
+        return (length - self.optimum) / self.optimum
+
+    def display_coords(self):
+        """Coordenadas para desenhar a instância (ou um círculo, se não houver nenhuma)."""
+        if self.coords is not None:
+            return self.coords
+        angles = np.linspace(0, 2 * np.pi, self.dimension, endpoint=False)
+        return np.column_stack((np.cos(angles), np.sin(angles)))
+
+# --- Funções de distância da TSPLIB ---
+
+def _nint(values):
+    return np.floor(values + 0.5)
+
+def euc_2d_matrix(coords):
+    diff = coords[:, np.newaxis, :] - coords[np.newaxis, :, :]
+    return _nint(np.sqrt((diff ** 2).sum(axis=-1)))
+
+def ceil_2d_matrix(coords):
+    diff = coords[:, np.newaxis, :] - coords[np.newaxis, :, :]
+    return np.ceil(np.sqrt((diff ** 2).sum(axis=-1)))
+
+def att_matrix(coords):
+    """Distância pseudo-euclidiana das instâncias att (arredondada para cima)."""
+    diff = coords[:, np.newaxis, :] - coords[np.newaxis, :, :]
+    r = np.sqrt((diff ** 2).sum(axis=-1) / 10.0)
+    t = _nint(r)
+    return np.where(t < r, t + 1, t)
+
+def geo_matrix(coords):
+    """Distância geográfica da TSPLIB (coordenadas em graus.minutos, Terra idealizada)."""
+    pi, rrr = 3.141592, 6378.388
+    degrees = np.trunc(coords)
+    radians = pi * (degrees + 5.0 * (coords - degrees) / 3.0) / 180.0
+    latitude, longitude = radians[:, 0], radians[:, 1]
+    q1 = np.cos(longitude[:, np.newaxis] - longitude[np.newaxis, :])
+    q2 = np.cos(latitude[:, np.newaxis] - latitude[np.newaxis, :])
+    q3 = np.cos(latitude[:, np.newaxis] + latitude[np.newaxis, :])
+    argument = np.clip(0.5 * ((1.0 + q1) * q2 - (1.0 - q1) * q3), -1.0, 1.0)
+    distances = np.trunc(rrr * np.arccos(argument) + 1.0)
+    np.fill_diagonal(distances, 0.0)
+    return distances
+
+_COORD_DISTANCES = {
+    "EUC_2D": euc_2d_matrix,
+    "CEIL_2D": ceil_2d_matrix,
+    "ATT": att_matrix,
+    "GEO": geo_matrix,
+}
+
+def explicit_matrix(weights, dimension, edge_weight_format):
+    """Monta a matriz (N, N) a partir da lista de pesos de uma EDGE_WEIGHT_SECTION."""
+    weights = np.asarray(weights, dtype=np.float64)
+    if edge_weight_format == "FULL_MATRIX":
+        return weights.reshape(dimension, dimension)
+
+    matrix = np.zeros((dimension, dimension))
+    if edge_weight_format == "UPPER_ROW":
+        rows, cols = np.triu_indices(dimension, k=1)
+    elif edge_weight_format == "LOWER_ROW":
+        rows, cols = np.tril_indices(dimension, k=-1)
+    elif edge_weight_format == "UPPER_DIAG_ROW":
+        rows, cols = np.triu_indices(dimension)
+    elif edge_weight_format == "LOWER_DIAG_ROW":
+        rows, cols = np.tril_indices(dimension)
+    else:
+        raise ValueError(f"EDGE_WEIGHT_FORMAT não suportado: {edge_weight_format!r}")
+    if len(weights) != len(rows):
+        raise ValueError(f"Esperados {len(rows)} pesos para {edge_weight_format}, encontrados {len(weights)}")
+    # As seções *_ROW são lidas linha a linha, que é a ordem de np.triu/tril_indices
+    matrix[rows, cols] = weights
+    matrix[cols, rows] = weights
+    return matrix
+
+# --- Leitura de arquivos ---
+
+def _parse_sections(text):
+    """Separa o arquivo em especificações (CHAVE : valor) e seções de dados."""
+    specification = {}
+    sections = {}
+    current = None
+    for raw_line in text.splitlines():
+        line = raw_line.strip()
+        if not line:
+            continue
+        if line == "EOF":
+            break
+        key = line.split(":", 1)[0].strip().upper()
+        if ":" in line and not key[0].isdigit() and not key.startswith("-"):
+            specification[key] = line.split(":", 1)[1].strip()
+            current = None
+        elif line.upper().endswith("_SECTION"):
+            current = line.upper()
+            sections[current] = []
+        elif current is not None:
+            sections[current].extend(line.split())
+    return specification, sections
+
+def parse_tsplib(text, optimum=None, matrix_free=False):
+    """
+    Lê o conteúdo de um arquivo .tsp da TSPLIB.
+
+    Suporta EDGE_WEIGHT_TYPE EUC_2D, CEIL_2D, ATT, GEO e EXPLICIT (com os
+    formatos FULL_MATRIX, UPPER_ROW, LOWER_ROW, UPPER_DIAG_ROW e LOWER_DIAG_ROW).
+    Com `matrix_free=True`, as instâncias EUC_2D, CEIL_2D e ATT não montam
+    a matriz (N, N): as distâncias vêm de uma `CoordinateDistances`.
+
+    Returns:
+        TSPInstance: A instância, com a matriz de distâncias inteiras da TSPLIB.
+    """
+    specification, sections = _parse_sections(text)
+    name = specification.get("NAME", "")
+    dimension = int(specification["DIMENSION"])
+    edge_weight_type = specification.get("EDGE_WEIGHT_TYPE", "EUC_2D").upper()
+    if edge_weight_type not in EDGE_WEIGHT_TYPES:
+        raise ValueError(f"EDGE_WEIGHT_TYPE não suportado: {edge_weight_type!r}")
+
+    coords = None
+    for section in ("NODE_COORD_SECTION", "DISPLAY_DATA_SECTION"):
+        if section in sections:
+            values = np.array(sections[section], dtype=np.float64).reshape(dimension, -1)
+            coords = values[:, 1:3]
+            break
+
+    if edge_weight_type == "EXPLICIT":
+        edge_weight_format = specification.get("EDGE_WEIGHT_FORMAT", "FULL_MATRIX").upper()
+        distance_matrix = explicit_matrix(sections["EDGE_WEIGHT_SECTION"], dimension, edge_weight_format)
+    else:
+        if "NODE_COORD_SECTION" not in sections:
+            raise ValueError(f"{edge_weight_type} exige NODE_COORD_SECTION")
+        if matrix_free:
+            if edge_weight_type not in DISTANCE_METRICS:
+                raise ValueError(f"{edge_weight_type} não é suportado sem matriz de distâncias")
+            distance_matrix = CoordinateDistances(coords, edge_weight_type)
+        else:
+            distance_matrix = _COORD_DISTANCES[edge_weight_type](coords)
+
+    if optimum is None:
+        optimum = BEST_KNOWN.get(name)
+    return TSPInstance(name, dimension, edge_weight_type, coords, distance_matrix, optimum,
+                       specification.get("COMMENT", ""))
+
+def load_tsplib(path, optimum=None, matrix_free=False):
+    """Lê um arquivo .tsp da TSPLIB (veja `parse_tsplib`)."""
+    with open(path) as f:
+        return parse_tsplib(f.read(), optimum, matrix_free)
+
+def load_tour(path):
+    """Lê um arquivo .tour da TSPLIB e retorna a rota com índices a partir de 0."""
+    with open(path) as f:
+        _, sections = _parse_sections(f.read())
+    tour = [int(value) for value in sections["TOUR_SECTION"]]
+    if -1 in tour:
+        tour = tour[:tour.index(-1)]
+    return np.array(tour, dtype=POPULATION_DTYPE) - 1
+
+def bundled_instances():
+    """Nomes das instâncias incluídas no diretório `instances/`."""
+    return sorted(os.path.splitext(name)[0] for name in os.listdir(INSTANCES_DIR) if name.endswith(".tsp"))
+
+def load_instance(name, matrix_free=False):
+    """Carrega uma instância incluída no repositório pelo nome (ex.: "att48")."""
+    return load_tsplib(os.path.join(INSTANCES_DIR, f"{name}.tsp"), matrix_free=matrix_free)